@@ -0,0 +1,113 @@
+"""
+Benchmark of CompressionPolicy: memory held by captured responses against
+the CPU spent compressing them and decompressing on first access.
+
+For every corpus (JSON catalogue, HTML page, minified-looking JS) and every
+codec/level, N responses are captured and compressed the way execute()
+stores them, then read back once.
+
+Reported per row:
+    ratio         plain size / compressed size
+    held (MB)     traced memory of the N held responses (the plain row is the baseline)
+    compress      ms per response, paid once when it is captured
+    first read    ms per response, paid on the first access to content
+
+Usage:
+    python benchmarks/bench_compression.py [--size-kb 256] [--responses 50]
+        [--zlib-levels 1 6 9] [--lzma-levels 0 1 6]
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright_interceptor import CompressionPolicy, Response  # noqa: E402
+
+
+def _catalogue(size_bytes: int) -> bytes:
+    item = {"id": 0, "name": "Product name", "price": 199.99, "tags": ["a", "b"], "stock": {"store": 3}}
+    chunk = len(json.dumps(item)) + 1
+    items = [dict(item, id=i, price=round(i * 1.37, 2)) for i in range(max(1, size_bytes // chunk))]
+    return json.dumps({"items": items}).encode()
+
+
+def _html(size_bytes: int) -> bytes:
+    row = '<li class="card" data-id="{i}"><a href="/product/{i}">Product {i}</a><span class="price">{p}</span></li>'
+    rows, size, i = [], 0, 0
+    while size < size_bytes:
+        rows.append(row.format(i=i, p=i * 3 % 1000))
+        size += len(rows[-1])
+        i += 1
+    return f"<!doctype html><html><body><ul>{''.join(rows)}</ul></body></html>".encode()
+
+
+def _script(size_bytes: int) -> bytes:
+    line = "function f{i}(a,b){{return a.map(function(x){{return x*{i}+b[{j}]}}).filter(Boolean)}};"
+    lines, size, i = [], 0, 0
+    while size < size_bytes:
+        lines.append(line.format(i=i, j=i % 7))
+        size += len(lines[-1])
+        i += 1
+    return "".join(lines).encode()
+
+
+CORPORA = {"json": _catalogue, "html": _html, "js": _script}
+
+
+def _held(body: bytes, count: int, policy) -> tuple:
+    """Traced bytes held by count responses over copies of body, plus compress and first-read times"""
+    gc.collect()
+    tracemalloc.start()
+    # Distinct bytes objects, as every captured response owns its body
+    responses = [
+        Response(status=200, request_headers={}, response_headers={"Content-Type": "application/json"}, content=body[:-1] + body[-1:])
+        for _ in range(count)
+    ]
+    started = time.perf_counter()
+    if policy is not None:
+        for response in responses:
+            response.compress(policy)
+    compress = time.perf_counter() - started
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for response in responses:
+        response.content
+    first_read = time.perf_counter() - started
+    return held, compress, first_read
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=int, default=256)
+    parser.add_argument("--responses", type=int, default=50)
+    parser.add_argument("--zlib-levels", nargs="+", type=int, default=[1, 6, 9])
+    parser.add_argument("--lzma-levels", nargs="+", type=int, default=[0, 1, 6])
+    args = parser.parse_args()
+
+    policies = [("plain", None)]
+    policies += [(f"zlib-{level}", CompressionPolicy.ZLIB(level)) for level in args.zlib_levels]
+    policies += [(f"lzma-{level}", CompressionPolicy.LZMA(level)) for level in args.lzma_levels]
+    count = args.responses
+
+    print(f"{'corpus':<8}{'codec':<10}{'ratio':>8}{'held (MB)':>12}{'compress (ms)':>16}{'first read (ms)':>18}")
+    for corpus, build in CORPORA.items():
+        body = build(args.size_kb * 1024)
+        for name, policy in policies:
+            held, compress, first_read = _held(body, count, policy)
+            ratio = len(body) / len(policy.compress(body)) if policy is not None else 1.0
+            print(
+                f"{corpus:<8}{name:<10}{ratio:>8.1f}{held / (1024 * 1024):>12.2f}"
+                f"{compress * 1000 / count:>16.3f}{first_read * 1000 / count:>18.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark for CSRF prefix detection and JSON parsing in content_loader.
+
+Covers the prefix cases from tests/parsers_test.py and synthetic large
+payloads (plain, known prefix, unknown prefix, many false candidates).
+
+Usage:
+    python benchmarks/bench_csrf.py [--size-mb 10] [--repeat 5]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright_interceptor.content_loader import parse_response_data, _remove_csrf_prefixes  # noqa: E402
+
+
+SMALL_CASES = {
+    "google": ")]}'\n{\"data\": \"test\"}",
+    "google_short": ")]}{\"data\": \"test\"}",
+    "while": "while(1);{\"data\": \"test\"}",
+    "for": "for(;;);{\"data\": \"test\"}",
+    "unknown_prefix": 'SECURITY_PREFIX_123{"data": "test"}',
+    "comment": '/*some comment*/{"data": "test"}',
+    "digits": '12345{"data": "test"}',
+    "emoji": '🔒SECURITY🔒{"data": "test"}',
+    "array": 'prefix[{"a":1},{"b":2}]',
+    "nested": ')]}\'\n{"nested": {"data": [1,2,3]}}',
+    "no_prefix": '{"data": "test"}',
+    "multiple": 'prefix{"first": 1}{"second": 2}',
+    "malformed": 'prefix{invalid json}',
+    "no_json": 'just some text without json',
+}
+
+
+def _catalogue(size_bytes: int) -> str:
+    item = {"id": 0, "name": "Product name", "price": 199.99, "tags": ["a", "b"], "stock": {"store": 3}}
+    chunk = len(json.dumps(item)) + 1
+    items = [dict(item, id=i) for i in range(max(1, size_bytes // chunk))]
+    return json.dumps({"items": items})
+
+
+def large_cases(size_mb: float) -> dict:
+    body = _catalogue(int(size_mb * 1024 * 1024))
+    return {
+        "plain": body,
+        "known_prefix": ")]}'\n" + body,
+        "unknown_prefix": "SECURITY_PREFIX_123" + body,
+        # Every "{" before the payload is a failing candidate
+        "false_candidates": "{x" * 10_000 + body,
+    }
+
+
+def bench(func, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'case':<28}{'size':>12}{'strip (ms)':>14}{'parse (ms)':>14}")
+    rows = [(f"small/{name}", text, max(args.repeat, 1000)) for name, text in SMALL_CASES.items()]
+    rows += [(f"large/{name}", text, args.repeat) for name, text in large_cases(args.size_mb).items()]
+    for name, text, repeat in rows:
+        strip = bench(_remove_csrf_prefixes, text, repeat)
+        parse = bench(lambda t: parse_response_data(t, "application/json"), text, repeat)
+        print(f"{name:<28}{len(text):>12}{strip * 1000:>14.3f}{parse * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+End-to-end benchmark of NetworkInterceptor.execute against a local HTTP server.
+
+Starts an asyncio HTTP server serving a synthetic page (N static assets, K
+JSON API calls of configurable size, optionally CSRF-prefixed) and loads it
+in headless browsers, first without interception and then under execute()
+for every combination of handler count, execute mode and session route:
+"api" routes only the API calls to Python, "all" routes every request
+(assets included), as a cache, an archive or a handler without
+startswith_url would.
+
+Reported per browser and scenario:
+    load_ms           page load until every API call finished (p50/p99/mean)
+    overhead_ms/pct   p50 load time over the no-interception baseline
+    request_ms        per-request duration from Resource Timing (p50/p99)
+    added_request_ms  request_ms minus the baseline's
+    cumulative_peak_rss_mb
+                      RSS high-water mark of this Python process (the interceptor
+                      side) since it started; it never goes down, so it covers
+                      every scenario run before this one as well
+
+Output is JSON, so results can be diffed between releases.
+
+Usage:
+    python benchmarks/bench_e2e.py [--browsers chromium firefox] [--handlers 1 8 32]
+        [--modes return modify all] [--routes api all] [--assets 50] [--apis 10] [--api-kb 64]
+        [--csrf] [--repeat 10] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright.async_api import async_playwright  # noqa: E402
+from playwright_interceptor import (  # noqa: E402
+    __version__, Execute, ExpectedContentType, Handler, NetworkInterceptor,
+)
+from playwright_interceptor.config import parameters as PARAMS  # noqa: E402
+
+
+HOST = "127.0.0.1"
+MODES = ("return", "modify", "all")
+ROUTES = ("api", "all")
+
+
+# Local stand-in server
+
+def _page_html(assets: int, apis: int, api_kb: int, csrf: bool) -> bytes:
+    tags = []
+    for i in range(assets):
+        if i % 2:
+            tags.append(f'<link rel="stylesheet" href="/asset/{i}.css">')
+        else:
+            tags.append(f'<script src="/asset/{i}.js"></script>')
+    query = f"size={api_kb}&csrf={int(csrf)}"
+    script = (
+        "<script>"
+        f"Promise.all(Array.from({{length: {apis}}}, (_, i) => fetch('/api/' + i + '?{query}').then(r => r.text())))"
+        ".then(() => { window.__done = true; });"
+        "</script>"
+    )
+    return f"<!doctype html><html><head>{''.join(tags)}</head><body>{script}</body></html>".encode()
+
+
+def _api_body(size_kb: int, csrf: bool) -> bytes:
+    item = '{"id": 0, "name": "Product name", "price": 199.99, "tags": ["a", "b"]}'
+    count = max(1, size_kb * 1024 // (len(item) + 1))
+    body = '{"items": [' + ",".join([item] * count) + "]}"
+    return ((")]}'\n" if csrf else "") + body).encode()
+
+
+def _route(target: str):
+    parts = urlsplit(target)
+    query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+    path = parts.path
+    if path == "/page":
+        body = _page_html(
+            int(query.get("assets", 0)), int(query.get("apis", 0)),
+            int(query.get("size", 1)), query.get("csrf") == "1",
+        )
+        return 200, "text/html; charset=utf-8", body
+    if path.startswith("/asset/"):
+        if path.endswith(".css"):
+            return 200, "text/css", b"body { margin: 0; }\n" * 20
+        return 200, "application/javascript", b"window.__assets = (window.__assets || 0) + 1;\n"
+    if path.startswith("/api/"):
+        return 200, "application/json", _api_body(int(query.get("size", 1)), query.get("csrf") == "1")
+    return 404, "text/plain", b"not found"
+
+
+async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            _method, target, _version = request_line.decode("latin-1").split(" ", 2)
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            status, content_type, body = _route(target)
+            writer.write(
+                f"HTTP/1.1 {status} OK\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Cache-Control: no-store\r\n"
+                "Connection: keep-alive\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+    except (ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+# Measurements
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _stats(values) -> dict:
+    return {
+        "p50": round(_percentile(values, 0.50), 3),
+        "p99": round(_percentile(values, 0.99), 3),
+        "mean": round(sum(values) / len(values), 3) if values else 0.0,
+    }
+
+
+def _cumulative_peak_rss_mb() -> float:
+    # ru_maxrss is the high-water mark since process start, it cannot be reset per scenario
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _handlers(count: int, mode: str, base: str, apis: int):
+    def keep(response):
+        return response
+
+    if mode == "return":
+        execute = Execute.RETURN(apis)
+    elif mode == "modify":
+        execute = Execute.MODIFY(response_modify=keep, max_modifications=apis)
+    else:
+        execute = Execute.ALL(response_modify=keep, max_modifications=apis, max_responses=apis)
+
+    return [
+        Handler.ALL(
+            expected_content=ExpectedContentType.JSON,
+            startswith_url=f"{base}/api/",
+            execute=execute,
+            slug=f"h{i}",
+        )
+        for i in range(count)
+    ]
+
+
+async def _load(page, url: str, timeout: float):
+    start = time.perf_counter()
+    await page.goto(url, wait_until="load")
+    await page.wait_for_function("window.__done === true", timeout=timeout * 1000)
+    load_ms = (time.perf_counter() - start) * 1000
+    durations = await page.evaluate("performance.getEntriesByType('resource').map(e => e.duration)")
+    return load_ms, durations
+
+
+async def _run_scenario(page, base: str, url: str, repeat: int, timeout: float, make_handlers=None, route: str = "api"):
+    loads, requests = [], []
+    if make_handlers is None:
+        for _ in range(repeat):
+            load_ms, durations = await _load(page, url, timeout)
+            loads.append(load_ms)
+            requests.extend(durations)
+        return loads, requests
+
+    interceptor = NetworkInterceptor(page)
+    # The session route is installed once, so every execute() is armed before navigation starts
+    pattern = f"{base}/api/**" if route == "api" else PARAMS.ROUTE_ALL
+    async with interceptor.session(pattern):
+        for _ in range(repeat):
+            capture = asyncio.create_task(interceptor.execute(make_handlers(), timeout=timeout))
+            await asyncio.sleep(0)
+            load_ms, durations = await _load(page, url, timeout)
+            await capture
+            loads.append(load_ms)
+            requests.extend(durations)
+    return loads, requests
+
+
+async def bench_browser(playwright, name: str, args, base: str) -> list:
+    url = f"{base}/page?assets={args.assets}&apis={args.apis}&size={args.api_kb}&csrf={int(args.csrf)}"
+    try:
+        browser = await getattr(playwright, name).launch(headless=True)
+    except Exception as e:
+        return [{"browser": name, "error": str(e).splitlines()[0]}]
+
+    results = []
+    try:
+        page = await browser.new_page()
+        # Warm-up: connection setup and browser caches are not part of the measurement
+        await _run_scenario(page, base, url, 2, args.timeout)
+
+        base_loads, base_requests = await _run_scenario(page, base, url, args.repeat, args.timeout)
+        baseline = {"load": _stats(base_loads), "request": _stats(base_requests)}
+        results.append({
+            "browser": name, "scenario": "baseline", "handlers": 0, "mode": None, "route": None,
+            "load_ms": baseline["load"], "request_ms": baseline["request"],
+            "cumulative_peak_rss_mb": _cumulative_peak_rss_mb(),
+        })
+
+        for route in args.routes:
+            for count in args.handlers:
+                for mode in args.modes:
+                    loads, requests = await _run_scenario(
+                        page, base, url, args.repeat, args.timeout,
+                        lambda: _handlers(count, mode, base, args.apis), route,
+                    )
+                    load, request = _stats(loads), _stats(requests)
+                    overhead = load["p50"] - baseline["load"]["p50"]
+                    results.append({
+                        "browser": name, "scenario": "execute", "handlers": count, "mode": mode, "route": route,
+                        "load_ms": load,
+                        "overhead_ms": round(overhead, 3),
+                        "overhead_pct": round(100 * overhead / baseline["load"]["p50"], 2) if baseline["load"]["p50"] else None,
+                        "request_ms": request,
+                        "added_request_ms": {
+                            q: round(request[q] - baseline["request"][q], 3) for q in ("p50", "p99")
+                        },
+                        "cumulative_peak_rss_mb": _cumulative_peak_rss_mb(),
+                    })
+    finally:
+        await browser.close()
+    return results
+
+
+async def run(args) -> dict:
+    server = await asyncio.start_server(_serve, HOST, 0)
+    base = f"http://{HOST}:{server.sockets[0].getsockname()[1]}"
+    results = []
+    try:
+        async with async_playwright() as playwright:
+            for name in args.browsers:
+                results.extend(await bench_browser(playwright, name, args, base))
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    return {
+        "meta": {
+            "playwright_interceptor": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                key: getattr(args, key)
+                for key in ("browsers", "handlers", "modes", "routes", "assets", "apis", "api_kb", "csrf", "repeat")
+            },
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browsers", nargs="+", default=["chromium", "firefox"], choices=["chromium", "firefox", "webkit"])
+    parser.add_argument("--handlers", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--routes", nargs="+", default=list(ROUTES), choices=ROUTES,
+                        help="session route: API calls only, or every request")
+    parser.add_argument("--assets", type=int, default=50)
+    parser.add_argument("--apis", type=int, default=10)
+    parser.add_argument("--api-kb", type=int, default=64)
+    parser.add_argument("--csrf", action="store_true", help="prefix API bodies with )]}'")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output is not None:
+        args.output.write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
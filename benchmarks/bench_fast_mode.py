@@ -0,0 +1,129 @@
+"""
+Micro-benchmark of fast mode (PLAYWRIGHT_INTERCEPTOR_FAST=1).
+
+Every measurement runs in a fresh interpreter per mode, since the mode is
+fixed when the package is imported:
+    import_ms     time to import playwright_interceptor (median of --imports runs)
+    <operation>   microseconds per call of a per-request primitive
+    per_request   the synchronous work of one captured JSON response under
+                  --handlers handlers: block/route/capture masks, Response
+                  construction and content_parse()
+
+Usage:
+    python benchmarks/bench_fast_mode.py [--handlers 8] [--number 20000] [--imports 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FAST_ENV = "PLAYWRIGHT_INTERCEPTOR_FAST"
+
+IMPORT_PROBE = """
+import time
+started = time.perf_counter()
+import playwright_interceptor
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def _operations(handlers: int):
+    from playwright_interceptor import ExpectedContentType, Handler, Execute, Request, Response
+    from playwright_interceptor.content_loader import parse_response_data
+    from playwright_interceptor.handler_index import HandlerIndex
+    from playwright_interceptor.tools import parse_content_type, predict_content
+
+    kinds = [ExpectedContentType.JSON, ExpectedContentType.IMAGE, ExpectedContentType.JS, ExpectedContentType.ANY]
+    handler_list = [
+        Handler.ALL(
+            expected_content=kinds[i % len(kinds)],
+            startswith_url=f"https://api.example.com/v{i}" if i % 2 else None,
+            execute=Execute.RETURN(None),
+            slug=f"h{i}",
+        )
+        for i in range(handlers)
+    ]
+    handler_list.append(Handler.ALL(expected_content=ExpectedContentType.IMAGE, execute=Execute.BLOCK(), slug="block"))
+    index = HandlerIndex(handler_list, "https://example.com/")
+    url = "https://api.example.com/v1/items?page=2"
+    content_type = "application/json; charset=utf-8"
+    body = json.dumps({"items": [{"id": i, "price": i * 1.5} for i in range(20)]}).encode()
+    headers = {"content-type": content_type, "content-length": str(len(body))}
+
+    def per_request():
+        index.block_mask(url, "GET", "fetch", None)
+        candidates = index.route_mask(url, "GET", "fetch", None)
+        selected = index.select(candidates)
+        index.capture_mask(url, "GET", content_type, within=candidates, base_url=None)
+        response = Response(status=200, request_headers={}, response_headers=headers, content=body, url=url)
+        response.content_parse()
+        return selected
+
+    return {
+        "Request": lambda: Request(url=url, headers={"accept": "*/*"}),
+        "Response": lambda: Response(status=200, request_headers={}, response_headers=headers, content=body, url=url),
+        "parse_content_type": lambda: parse_content_type(content_type),
+        "predict_content": lambda: predict_content(url, "fetch"),
+        "parse_response_data": lambda: parse_response_data(body, content_type),
+        "match_url": lambda: handler_list[0]._match_url(url, "https://example.com/"),
+        "per_request": per_request,
+    }
+
+
+def _worker(args) -> dict:
+    results = {}
+    for name, operation in _operations(args.handlers).items():
+        operation()
+        best = float("inf")
+        for _ in range(5):
+            started = time.perf_counter()
+            for _ in range(args.number):
+                operation()
+            best = min(best, time.perf_counter() - started)
+        results[name] = best / args.number * 1e6
+    return results
+
+
+def _run(fast: bool, args) -> dict:
+    env = dict(os.environ)
+    env.pop(FAST_ENV, None)
+    if fast:
+        env[FAST_ENV] = "1"
+    run = lambda argv: subprocess.run(  # noqa: E731
+        [sys.executable, "-W", "ignore", *argv], cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    imports = [float(run(["-c", IMPORT_PROBE])) for _ in range(args.imports)]
+    worker = [str(Path(__file__).resolve()), "--worker", "--handlers", str(args.handlers), "--number", str(args.number)]
+    results = json.loads(run(worker))
+    results["import_ms"] = statistics.median(imports)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--handlers", type=int, default=8)
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--imports", type=int, default=10)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        sys.path.insert(0, str(ROOT))
+        print(json.dumps(_worker(args)))
+        return
+
+    checked, fast = _run(False, args), _run(True, args)
+    print(f"{'operation':<22}{'checked':>12}{'fast':>12}{'saved':>10}")
+    for name in checked:
+        unit = "ms" if name == "import_ms" else "us"
+        saved = 1 - fast[name] / checked[name] if checked[name] else 0.0
+        print(f"{name:<22}{checked[name]:>10.2f}{unit}{fast[name]:>10.2f}{unit}{saved:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,28 @@ Provides advanced request interception and modification utilities.
 """
 
 from .models import HttpMethod, Response, Request, ExpectedContentType
+from .headers import Headers
 from .execute import Execute, ExecuteAction
+from .extract import Extract
 from .handler import (
     Handler,
     HandlerSearchSuccess,
     HandlerSearchFailed,
 )
-from .network_interceptor import NetworkInterceptor
+from .retention import RejectedRetention, RejectedResponse, RejectedSummary, RetentionMode
+from .storage import ResponseCache, CacheStats
+from .archive import TrafficArchive, ArchiveMode
+from .metrics import InterceptorMetrics, RequestTimings, Histogram
+from .coalesce import CoalescePolicy
+from .spool import SpoolPolicy
+from .compression import CompressionPolicy
+from .network_interceptor import NetworkInterceptor, ContextInterceptor
 
 __version__ = "0.1.1"
 
 __all__ = [
     "NetworkInterceptor",
+    "ContextInterceptor",
     "Handler",
     "ExpectedContentType",
     "HandlerSearchSuccess",
@@ -24,6 +34,22 @@ __all__ = [
     "Request",
     "Response",
     "HttpMethod",
+    "Headers",
     "Execute",
     "ExecuteAction",
+    "Extract",
+    "RejectedRetention",
+    "RejectedResponse",
+    "RejectedSummary",
+    "RetentionMode",
+    "ResponseCache",
+    "CacheStats",
+    "TrafficArchive",
+    "ArchiveMode",
+    "InterceptorMetrics",
+    "RequestTimings",
+    "Histogram",
+    "CoalescePolicy",
+    "SpoolPolicy",
+    "CompressionPolicy",
 ]
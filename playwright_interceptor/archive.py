@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum, auto
+from pathlib import Path
+from beartype import beartype
+from beartype.typing import Dict, List, Optional, Union
+from . import config as CFG
+from .typecheck import hot_path
+from .storage import StoredResponse, replayable_headers, request_key
+
+
+class ArchiveMode(Enum):
+    """What TrafficArchive does with routed requests."""
+
+    RECORD = auto()
+    REPLAY = auto()
+
+
+@beartype
+class TrafficArchive:
+    """
+    On-disk archive of request/response pairs for offline replay.
+
+    Layout: `index.json` maps a request key (method, URL, body hash) to the
+    list of responses recorded for it, bodies live once per content hash in
+    `blobs/`. The whole index is loaded into a dict, so replay lookup is
+    O(1) per request. Repeated requests replay their recorded responses in
+    order, the last one is served again once they run out.
+
+    NetworkInterceptor runs record/lookup/save on `io_executor`, a single
+    thread, so blob and index I/O stay off the event loop and requests are
+    recorded and replayed in the order they arrived.
+    """
+
+    def __init__(self, path: Union[str, Path], mode: ArchiveMode):
+        self.path = Path(path)
+        self.mode = mode
+        self.blobs_path = self.path / CFG.PARAMETERS.ARCHIVE_BLOBS_DIR
+        self.index_path = self.path / CFG.PARAMETERS.ARCHIVE_INDEX_FILE
+
+        self._entries: Dict[str, List[dict]] = defaultdict(list)
+        self._replayed: Dict[str, int] = defaultdict(int)
+        self._dirty = False
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        self.recorded = 0
+        self.replayed = 0
+        self.missed = 0
+
+        if mode == ArchiveMode.REPLAY:
+            self._load()
+        else:
+            self.blobs_path.mkdir(parents=True, exist_ok=True)
+            if self.index_path.exists():
+                # Appending to an existing archive
+                self._load()
+
+    # Convenient constructors
+    @classmethod
+    def RECORD(cls, path: Union[str, Path]) -> "TrafficArchive":
+        return cls(path, ArchiveMode.RECORD)
+
+    @classmethod
+    def REPLAY(cls, path: Union[str, Path]) -> "TrafficArchive":
+        return cls(path, ArchiveMode.REPLAY)
+
+    @property
+    def io_executor(self) -> ThreadPoolExecutor:
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=CFG.PARAMETERS.ARCHIVE_IO_THREAD)
+        return self._io_executor
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == ArchiveMode.RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == ArchiveMode.REPLAY
+
+    def _load(self) -> None:
+        if not self.index_path.exists():
+            raise FileNotFoundError(CFG.ERRORS.ARCHIVE_NOT_FOUND.format(path=self.index_path))
+        index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        version = index.get("version")
+        if version != CFG.PARAMETERS.ARCHIVE_VERSION:
+            raise ValueError(CFG.ERRORS.ARCHIVE_VERSION_UNSUPPORTED.format(version=version, path=self.index_path))
+        for key, records in index["entries"].items():
+            self._entries[key] = records
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blobs_path / digest
+
+    @hot_path
+    def record(self, method: str, url: str, body: Union[str, bytes, None], status: int, headers: Dict[str, str], content: bytes) -> None:
+        """Adds a response to the archive, storing its body once per content hash"""
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not blob_path.exists():
+            tmp_path = blob_path.with_suffix(".tmp")
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, blob_path)
+
+        self._entries[request_key(method, url, body)].append({
+            "method": method,
+            "url": url,
+            "status": status,
+            "headers": replayable_headers(headers),
+            "blob": digest,
+        })
+        self.recorded += 1
+        self._dirty = True
+
+    @hot_path
+    def lookup(self, method: str, url: str, body: Union[str, bytes, None] = None) -> Optional[StoredResponse]:
+        """Next archived response for a request, None if it was never recorded"""
+        key = request_key(method, url, body)
+        records = self._entries.get(key)
+        if not records:
+            self.missed += 1
+            return None
+
+        position = self._replayed[key]
+        self._replayed[key] = position + 1
+        record = records[min(position, len(records) - 1)]
+        self.replayed += 1
+        return StoredResponse(
+            record["url"], record["status"], dict(record["headers"]), self._blob_path(record["blob"]).read_bytes()
+        )
+
+    def rewind(self) -> None:
+        """Starts replaying every request from its first recorded response again"""
+        self._replayed.clear()
+
+    def save(self) -> None:
+        """Writes the index, called by NetworkInterceptor after every execute()/stream()"""
+        if not self._dirty:
+            return
+        index = {"version": CFG.PARAMETERS.ARCHIVE_VERSION, "entries": self._entries}
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(index), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,104 @@
+import asyncio
+from dataclasses import dataclass
+from beartype import beartype
+from beartype.typing import Awaitable, Callable, Dict, FrozenSet, Mapping, Optional, Tuple, Union
+from . import config as CFG
+from .typecheck import hot_path
+from .models import HttpMethod
+from .headers import header_value
+from .storage import StoredResponse, read_response, replayable_headers, request_key
+
+
+@beartype
+@dataclass(frozen=True)
+class CoalescePolicy:
+    """
+    Which identical concurrent fetches may share one upstream request.
+
+    Requests are identical when method, URL, body and the `vary_headers`
+    values match. Only `methods` are coalesced; the default keeps to the
+    safe, idempotent GET and HEAD.
+    """
+
+    methods: FrozenSet[HttpMethod] = frozenset({HttpMethod.GET, HttpMethod.HEAD})
+    vary_headers: Tuple[str, ...] = CFG.PARAMETERS.COALESCE_VARY_HEADERS
+
+    # Convenient constructors
+    @classmethod
+    def OFF(cls) -> "CoalescePolicy":
+        return cls(methods=frozenset())
+
+    @classmethod
+    def SAFE(cls) -> "CoalescePolicy":
+        return cls()
+
+    @hot_path
+    def accepts(self, method: str) -> bool:
+        return any(allowed.value == method for allowed in self.methods)
+
+    @hot_path
+    def key(self, method: str, url: str, body: Union[str, bytes, None], headers: Mapping[str, str]) -> str:
+        varying = "\n".join(header_value(headers, name, "") for name in self.vary_headers)
+        return request_key(method, f"{url}\n{varying}", body)
+
+
+class SingleFlight:
+    """
+    In-flight fetch registry: the first caller for a key fetches, callers
+    arriving while it is in flight wait and get a StoredResponse built from
+    the same body. The body is read, with `read`, only when someone is
+    waiting, and the leader gets the read response back so it does not
+    read the body again. If the leader fails, followers get its exception;
+    if it is cancelled, each follower fetches again instead.
+    """
+
+    __slots__ = ("_inflight",)
+
+    def __init__(self) -> None:
+        # key -> [future, number of waiting followers]
+        self._inflight: Dict[str, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def fetch(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable],
+        read: Callable[..., Awaitable[StoredResponse]] = read_response,
+    ) -> tuple:
+        """Returns (response, joined), joined tells whether an in-flight fetch was shared"""
+        flight = self._inflight.get(key)
+        if flight is not None:
+            flight[1] += 1
+            shared = flight[0]
+            # wait() rather than awaiting: a cancelled follower must not cancel the
+            # shared result, and a cancelled leader must not cancel its followers
+            await asyncio.wait((shared,))
+            if shared.cancelled():
+                # The leader was cancelled: fetch on our own (or join whoever does)
+                return await self.fetch(key, fetcher, read)
+            return shared.result(), True
+
+        future = asyncio.get_running_loop().create_future()
+        flight = self._inflight[key] = [future, 0]
+        try:
+            response = await fetcher()
+            if flight[1]:
+                response = await read(response)
+                shared: Optional[StoredResponse] = StoredResponse(
+                    response.url, response.status, replayable_headers(response.headers), await response.body()
+                )
+                future.set_result(shared)
+        except Exception as e:
+            if flight[1]:
+                # Followers get the error and fall back to their own fetch
+                future.set_exception(e)
+                future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                # Cancelled (or no followers): followers fetch on their own
+                future.cancel()
+        return response, False
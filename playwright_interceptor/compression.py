@@ -0,0 +1,66 @@
+import lzma
+import zlib
+from dataclasses import dataclass
+from beartype import beartype
+from beartype.typing import Optional
+from . import config as CFG
+from .typecheck import hot_path
+
+
+# codec -> (compress(data, level), decompress(data))
+CODECS = {
+    "zlib": (lambda data, level: zlib.compress(data, level), zlib.decompress),
+    "lzma": (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+
+
+@beartype
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """
+    Whether captured bodies waiting in execute() results are held compressed.
+
+    Bodies of at least `threshold` bytes are compressed with `codec` at
+    `level` once captured; a Response decompresses its body on first access
+    to `content` or `content_parse()` and keeps the result. Bodies that do not
+    shrink (images, video, already encoded archives) are held as they are.
+    """
+
+    codec: Optional[str] = None
+    level: int = 0
+    threshold: int = CFG.PARAMETERS.COMPRESS_THRESHOLD
+
+    def __post_init__(self) -> None:
+        if self.codec is not None and self.codec not in CODECS:
+            raise ValueError(CFG.ERRORS.COMPRESSION_CODEC_UNKNOWN.format(codec=self.codec, codecs=", ".join(CODECS)))
+        if not 0 <= self.level <= 9:
+            raise ValueError(CFG.ERRORS.COMPRESSION_LEVEL_INVALID.format(level=self.level))
+        if self.threshold < 0:
+            raise ValueError(CFG.ERRORS.COMPRESSION_THRESHOLD_INVALID.format(threshold=self.threshold))
+
+    # Convenient constructors
+    @classmethod
+    def OFF(cls) -> "CompressionPolicy":
+        return cls()
+
+    @classmethod
+    def ZLIB(cls, level: int = CFG.PARAMETERS.COMPRESS_ZLIB_LEVEL, threshold: int = CFG.PARAMETERS.COMPRESS_THRESHOLD) -> "CompressionPolicy":
+        return cls(codec="zlib", level=level, threshold=threshold)
+
+    @classmethod
+    def LZMA(cls, level: int = CFG.PARAMETERS.COMPRESS_LZMA_LEVEL, threshold: int = CFG.PARAMETERS.COMPRESS_THRESHOLD) -> "CompressionPolicy":
+        return cls(codec="lzma", level=level, threshold=threshold)
+
+    @hot_path
+    def accepts(self, size: int) -> bool:
+        return self.codec is not None and size >= self.threshold
+
+    @hot_path
+    def compress(self, data: bytes) -> Optional[bytes]:
+        """Compressed data, or None if it would not be smaller"""
+        blob = CODECS[self.codec][0](data, self.level)
+        return blob if len(blob) < len(data) else None
+
+
+def decompress_body(codec: str, blob: bytes) -> bytes:
+    return CODECS[codec][1](blob)
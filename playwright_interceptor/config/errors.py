@@ -3,3 +3,14 @@
 UNKNOWN = "UnknownError"
 DUPLICATE_HANDLER_SLUGS = "Duplicate handler slugs detected: {duplicate_slugs}"
 FAILED_PROCESS_RESPONSE = "Failed to process response for handlers {handler_list} from {url}: {error}"
+SESSION_ALREADY_OPEN = "Interception session is already open for this interceptor"
+SESSION_BUSY = "Another execute()/stream() is already armed on this interception session"
+ARCHIVE_NOT_FOUND = "Traffic archive index not found: {path}"
+ARCHIVE_VERSION_UNSUPPORTED = "Unsupported traffic archive version {version} in {path}"
+INVALID_JSON_PATH = "Invalid JSON path {path!r} at position {position}: expected $, .key, ['key'], [N], [*] or .*"
+EXTRACT_NO_PATHS = "Extract requires at least one path"
+EXTRACT_NOT_JSON = "Body is not a JSON document"
+SPOOL_THRESHOLD_INVALID = "Spool threshold must be a positive number of bytes, got {threshold}"
+COMPRESSION_CODEC_UNKNOWN = "Unknown compression codec {codec!r}, expected one of: {codecs}"
+COMPRESSION_LEVEL_INVALID = "Compression level must be between 0 and 9, got {level}"
+COMPRESSION_THRESHOLD_INVALID = "Compression threshold must not be negative, got {threshold}"
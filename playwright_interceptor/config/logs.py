@@ -9,8 +9,15 @@ SYSTEM_PROXY = "SYSTEM_PROXY"
 HANDLER_WILL_CAPTURE = "Handler {handler_type} will capture: {url}"
 HANDLER_REJECTED = "Handler {handler_type} rejected: {url} (content-type: {content_type})"
 ALL_HANDLERS_REJECTED = "All handlers rejected: {url}"
+REQUEST_BLOCKED = "Blocked {method} {url} ({resource_type}) by handlers {slugs}"
+PASS_THROUGH = "No live handler can match {method} {url} ({resource_type}), passing through"
 HANDLER_CAPTURED_RESPONSE = "Handler {handler_type} captured response from {url} ({current_count}/{max_responses})"
 ALL_HANDLERS_COMPLETED = "All handlers reached their max_responses limits, completing..."
+MODIFIER_TIMEOUT = "Handler {slug} {kind}_modify exceeded its {budget:.3f}s budget ({count}/{max_timeouts}), serving unmodified"
+HANDLER_TRIPPED = "Handler {slug} tripped after {count} budget breaches, passing through for the rest of the session"
+EXTRACT_FAILED = "JSON extraction failed for {url}, keeping the full body: {error}"
+SPOOL_UNLINK_DEFERRED = "Could not remove spool file {path} ({error}), retrying later"
+ARCHIVE_MISS = "No archived response for {method} {url}, aborting"
 TIMEOUT_REACHED = "Timeout reached for multi-handler request to {base_url}. Duration: {duration:.3f}s"
 
 # Cleanup messages
@@ -114,3 +114,44 @@ CSS_EXTENSIONS = {
     'application/css': '.css',
     'application/x-css': '.css',
 }
+
+# Playwright resource types whose content type is predictable before the response.
+# Maps resource type -> ExpectedContentType names that such a request can still produce.
+# Resource types missing here (document, xhr, fetch, script, other, ...) may carry anything.
+RESOURCE_TYPE_CONTENT = {
+    'image': ('IMAGE', 'APPLICATION'),
+    'font': ('FONT', 'APPLICATION'),
+    'media': ('VIDEO', 'AUDIO', 'APPLICATION'),
+    'stylesheet': ('CSS', 'TEXT'),
+}
+
+# Content a request will almost certainly carry, used by Execute.BLOCK before any fetch.
+# Resource type -> ExpectedContentType names; a known URL extension takes precedence.
+RESOURCE_TYPE_BLOCK_CONTENT = {
+    'image': ('IMAGE',),
+    'font': ('FONT',),
+    'media': ('VIDEO', 'AUDIO'),
+    'stylesheet': ('CSS',),
+    'script': ('JS',),
+}
+
+# URL extensions not listed in the content-type tables above
+URL_EXTENSION_ALIASES = {
+    '.jpeg': 'IMAGE',
+    '.avif': 'IMAGE',
+    '.mjs': 'JS',
+    '.m4v': 'VIDEO',
+    '.opus': 'AUDIO',
+}
+
+# Typical transfer size of a blocked request by ExpectedContentType name, bytes.
+# Blocked requests never reach the network, so bytes saved can only be estimated.
+BLOCKED_BYTES_ESTIMATE = {
+    'IMAGE': 24 * 1024,
+    'FONT': 32 * 1024,
+    'CSS': 16 * 1024,
+    'JS': 24 * 1024,
+    'VIDEO': 1024 * 1024,
+    'AUDIO': 256 * 1024,
+}
+BLOCKED_BYTES_DEFAULT = 8 * 1024
@@ -1,7 +1,64 @@
 
+# Well-known anti-JSON-hijacking prefixes, checked before the generic scan
+CSRF_PREFIXES = (
+    ")]}'",
+    "while(1);",
+    "for(;;);",
+)
+
 # Default values
 DEFAULT_CONTENT_TYPE = "application/json"
 
+# Rejected responses kept by the default RejectedRetention.LAST()
+DEFAULT_REJECTED_LIMIT = 100
+
+# Captured responses buffered by NetworkInterceptor.stream() before backpressure
+DEFAULT_STREAM_QUEUE_SIZE = 16
+
+# Parsed per-page base URLs kept by HandlerIndex in context-wide interception
+BASE_URL_CACHE_SIZE = 256
+
+# ResponseCache defaults
+CACHE_MAX_ENTRIES = 1024
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_MAX_DISK_BYTES = 512 * 1024 * 1024
+# Thread running disk-tier ResponseCache calls
+CACHE_IO_THREAD = "playwright-interceptor-cache"
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 410})
+
+# Headers describing the original transfer, dropped when fulfilling a stored (decoded) body
+DECODED_BODY_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+# TrafficArchive layout
+ARCHIVE_INDEX_FILE = "index.json"
+ARCHIVE_BLOBS_DIR = "blobs"
+ARCHIVE_VERSION = 1
+ARCHIVE_IO_THREAD = "playwright-interceptor-archive"
+
+# Request headers that keep otherwise identical concurrent fetches apart
+COALESCE_VARY_HEADERS = ("range", "authorization", "cookie")
+
+# Modifier budget breaches after which a handler is tripped to pass-through
+DEFAULT_MAX_TIMEOUTS = 3
+
+# InterceptorMetrics histogram bucket bounds, seconds
+METRICS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Captured bodies of at least this many bytes go to disk under SpoolPolicy.ABOVE()
+SPOOL_THRESHOLD = 8 * 1024 * 1024
+SPOOL_PREFIX = "playwright-interceptor-"
+
+# CompressionPolicy defaults: bodies below the threshold are not worth compressing
+COMPRESS_THRESHOLD = 1024
+COMPRESS_ZLIB_LEVEL = 6
+COMPRESS_LZMA_LEVEL = 1
+
+# Error code of route.abort() for requests dropped by Execute.BLOCK
+BLOCK_ERROR_CODE = "blockedbyclient"
+
+# Route pattern matching every request
+ROUTE_ALL = "**/*"
+
 # Unsupported protocols for Route.fetch()
 UNSUPPORTED_PROTOCOLS = (
     'chrome-extension:',
@@ -10,3 +67,10 @@ UNSUPPORTED_PROTOCOLS = (
     'safari-web-extension:',
     'edge-extension:',
 )
+
+# Environment variable enabling fast mode: no runtime type checks on the per-request path
+FAST_MODE_ENV = "PLAYWRIGHT_INTERCEPTOR_FAST"
+FAST_MODE_VALUES = ("1", "true", "yes", "on")
+
+# Headers whose repeated values are joined with newlines, not commas (as Playwright does)
+NEWLINE_JOINED_HEADERS = ("set-cookie",)
@@ -1,12 +1,53 @@
 import json
-from typing import Union
+import re
+from typing import Any, Optional, Tuple, Union
 from io import BytesIO
-from beartype import beartype
+from .typecheck import hot_path
 from . import config as CFG
 from .tools import parse_content_type
+from .spool import MemoryReader
 
 
-@beartype
+_JSON_DECODER = json.JSONDecoder()
+_JSON_START = re.compile(r'[\[{]')
+
+
+def _find_json(text: str) -> Optional[Tuple[int, int, Any]]:
+    """
+    Finds the first valid JSON object/array in text.
+
+    Known CSRF prefixes are recognised directly; otherwise `raw_decode` is
+    tried at every `{`/`[` offset. Each attempt is a single C-level pass that
+    stops at the first syntax error, so a large body behind a prefix is
+    decoded exactly once.
+
+    Returns:
+        (start, end, value) of the JSON found, or None
+    """
+    for prefix in CFG.PARAMETERS.CSRF_PREFIXES:
+        if text.startswith(prefix):
+            pos = len(prefix)
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            if text[pos:pos + 1] in ('{', '['):
+                try:
+                    value, end = _JSON_DECODER.raw_decode(text, pos)
+                    return pos, end, value
+                except (ValueError, RecursionError):
+                    # Invalid or too deeply nested to decode
+                    pass
+            break
+
+    for match in _JSON_START.finditer(text):
+        try:
+            value, end = _JSON_DECODER.raw_decode(text, match.start())
+            return match.start(), end, value
+        except (ValueError, RecursionError):
+            continue
+    return None
+
+
+@hot_path
 def _remove_csrf_prefixes(text: str) -> str:
     """
     Universally removes CSRF prefixes from JSON responses.
@@ -16,63 +57,33 @@ def _remove_csrf_prefixes(text: str) -> str:
     """
     # Remove leading spaces
     text = text.lstrip()
-    
-    # Find beginning of JSON (object or array)
-    json_start_chars = ['{', '[']
-    
-    for i, char in enumerate(text):
-        if char in json_start_chars:
-            # Use stack for tracking brackets
-            stack = []
-            in_string = False
-            escaped = False
-            
-            for j in range(i, len(text)):
-                current = text[j]
-                
-                if escaped:
-                    escaped = False
-                    continue
-                    
-                if current == '\\':
-                    escaped = True
-                    continue
-                    
-                if current == '"' and not escaped:
-                    in_string = not in_string
-                    continue
-                    
-                if in_string:
-                    continue
-                    
-                if current in ['{', '[']:
-                    stack.append(current)
-                elif current in ['}', ']']:
-                    if not stack:
-                        break
-                    expected = '{' if current == '}' else '['
-                    if stack[-1] == expected:
-                        stack.pop()
-                        if not stack:  # Stack is empty - JSON is complete
-                            candidate = text[i:j+1]
-                            try:
-                                json.loads(candidate)
-                                return candidate
-                            except json.JSONDecodeError:
-                                break
-                    else:
-                        break
-    
-    # If no valid JSON found, return original
-    return text
 
-@beartype
-def parse_response_data(data: Union[str, bytes], content_type: str) -> Union[dict, list, str, BytesIO]:
+    found = _find_json(text)
+    if found is None:
+        # If no valid JSON found, return original
+        return text
+    start, end, _value = found
+    return text[start:end]
+
+
+def _load_json(text: str) -> Any:
+    """Loads JSON with universal CSRF prefix handling, decoding the body only once"""
+    text = text.lstrip()
+    found = _find_json(text)
+    if found is None:
+        # Scalars and invalid documents
+        return json.loads(text)
+    return found[2]
+
+@hot_path
+def parse_response_data(
+    data: Union[str, bytes, memoryview], content_type: str
+) -> Union[dict, list, str, BytesIO, MemoryReader]:
     """
     Parses response data based on content-type with universal CSRF prefix handling.
     
     Args:
-        data: Raw data as string or bytes
+        data: Raw data as string, bytes or a memoryview (spooled body)
         content_type: Content-Type from response headers
     
     Returns:
@@ -83,18 +94,17 @@ def parse_response_data(data: Union[str, bytes], content_type: str) -> Union[dic
     if pct['content_type'] in CFG.NETWORK.JSON_EXTENSIONS:
         try:
             # Convert bytes to string if needed
-            if isinstance(data, bytes):
-                text_data = data.decode(pct['charset'], errors='replace')
+            if not isinstance(data, str):
+                text_data = str(data, pct['charset'], 'replace')
             else:
                 text_data = data
             
             # Universal CSRF prefix removal
-            clean_json = _remove_csrf_prefixes(text_data)
-            return json.loads(clean_json)
+            return _load_json(text_data)
             
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            # If JSON parsing fails, return as string
-            return data.decode(pct['charset'], errors='replace') if isinstance(data, bytes) else data
+        except (ValueError, RecursionError):
+            # If JSON parsing fails (or nesting exceeds the recursion limit), return as string
+            return str(data, pct['charset'], 'replace') if not isinstance(data, str) else data
     
     for types in [
         CFG.NETWORK.IMAGE_EXTENSIONS,
@@ -105,8 +115,10 @@ def parse_response_data(data: Union[str, bytes], content_type: str) -> Union[dic
         CFG.NETWORK.ARCHIVE_EXTENSIONS
     ]:
         if pct['content_type'] in types:
-            # Create BytesIO object for files
-            if isinstance(data, bytes):
+            # Create BytesIO object for files; a memoryview is read in place
+            if isinstance(data, memoryview):
+                parsed_data = MemoryReader(data)
+            elif isinstance(data, bytes):
                 parsed_data = BytesIO(data)
             else:
                 # If data came as string (shouldn't happen for binary files, but just in case)
@@ -117,11 +129,11 @@ def parse_response_data(data: Union[str, bytes], content_type: str) -> Union[dic
             return parsed_data
     
     # For all other types return as text
-    if isinstance(data, bytes):
+    if not isinstance(data, str):
         try:
-            return data.decode(pct['charset'])
+            return str(data, pct['charset'])
         except UnicodeDecodeError:
             # If unable to decode, create BytesIO
-            return BytesIO(data)
+            return MemoryReader(data) if isinstance(data, memoryview) else BytesIO(data)
     else:
         return data
@@ -1,8 +1,11 @@
 from __future__ import annotations
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from enum import Enum, auto
 from typing import Callable, Awaitable, Optional, Union
 from beartype import beartype
+from . import config as CFG
+from .extract import Extract
 
 # Forward declaration for type checking without circular import
 from typing import TYPE_CHECKING
@@ -16,6 +19,7 @@ class ExecuteAction(Enum):
     RETURN = auto()
     MODIFY = auto()
     ALL = auto()
+    BLOCK = auto()
 
 
 @beartype
@@ -28,6 +32,15 @@ class Execute:
     request_modify: Optional[Callable[["Request"], Union["Request", Awaitable["Request"]]]] = None
     max_responses: Optional[int] = None
     max_modifications: Optional[int] = None
+    # Pool for synchronous modifiers; None runs them on the event loop
+    # (or in NetworkInterceptor's executor, if one is set)
+    executor: Optional[Executor] = None
+    # Time budget of one modifier call in seconds and the number of breaches
+    # after which the handler is tripped to pass-through
+    modify_timeout: Optional[float] = None
+    max_timeouts: int = CFG.PARAMETERS.DEFAULT_MAX_TIMEOUTS
+    # Partial JSON extraction of captured bodies (RETURN/ALL)
+    extract: Optional[Extract] = None
 
     def __post_init__(self) -> None:
         if self.action == ExecuteAction.RETURN:
@@ -36,6 +49,10 @@ class Execute:
                 raise ValueError("RETURN action should not have response_modify")
             if self.request_modify is not None:
                 raise ValueError("RETURN action should not have request_modify")
+            if self.executor is not None:
+                raise ValueError("RETURN action should not have executor")
+            if self.modify_timeout is not None:
+                raise ValueError("RETURN action should not have modify_timeout")
         elif self.action == ExecuteAction.MODIFY:
             if self.response_modify is None and self.request_modify is None:
                 raise ValueError("MODIFY action requires at least one of response_modify or request_modify")
@@ -48,11 +65,31 @@ class Execute:
                 raise ValueError("ALL action requires max_modifications")
             if self.max_responses is None:
                 raise ValueError("ALL action requires max_responses")
+        elif self.action == ExecuteAction.BLOCK:
+            # BLOCK aborts matching requests before they are sent, nothing else applies
+            if self.response_modify is not None or self.request_modify is not None:
+                raise ValueError("BLOCK action should not have response_modify or request_modify")
+            if self.max_responses is not None or self.max_modifications is not None:
+                raise ValueError("BLOCK action should not have max_responses or max_modifications")
+            if self.executor is not None or self.modify_timeout is not None:
+                raise ValueError("BLOCK action should not have executor or modify_timeout")
+
+        if self.extract is not None and self.action not in (ExecuteAction.RETURN, ExecuteAction.ALL):
+            raise ValueError(f"{self.action.name} action should not have extract, nothing is captured")
+
+        if self.modify_timeout is not None and self.modify_timeout <= 0:
+            raise ValueError("modify_timeout must be positive")
+        if self.max_timeouts < 1:
+            raise ValueError("max_timeouts must be at least 1")
 
     # Convenient constructors
     @classmethod
-    def RETURN(cls, max_responses: Optional[int] = 1) -> "Execute":
-        return cls(action=ExecuteAction.RETURN, max_responses=max_responses)
+    def RETURN(cls, max_responses: Optional[int] = 1, extract: Optional[Extract] = None) -> "Execute":
+        return cls(action=ExecuteAction.RETURN, max_responses=max_responses, extract=extract)
+
+    @classmethod
+    def BLOCK(cls) -> "Execute":
+        return cls(action=ExecuteAction.BLOCK)
 
     @classmethod
     def MODIFY(
@@ -60,6 +97,9 @@ class Execute:
         response_modify: Optional[Callable[["Response"], Union["Response", Awaitable["Response"]]]] = None,
         request_modify: Optional[Callable[["Request"], Union["Request", Awaitable["Request"]]]] = None,
         max_modifications: Optional[int] = 1,
+        executor: Optional[Executor] = None,
+        modify_timeout: Optional[float] = None,
+        max_timeouts: int = CFG.PARAMETERS.DEFAULT_MAX_TIMEOUTS,
     ) -> "Execute":
         if response_modify is None and request_modify is None:
             raise ValueError("MODIFY action requires at least one of response_modify or request_modify")
@@ -69,6 +109,9 @@ class Execute:
             response_modify=response_modify,
             request_modify=request_modify,
             max_modifications=max_modifications,
+            executor=executor,
+            modify_timeout=modify_timeout,
+            max_timeouts=max_timeouts,
         )
 
     @classmethod
@@ -78,6 +121,10 @@ class Execute:
         request_modify: Optional[Callable[["Request"], Union["Request", Awaitable["Request"]]]] = None,
         max_responses: Optional[int] = 1,
         max_modifications: Optional[int] = 1,
+        executor: Optional[Executor] = None,
+        modify_timeout: Optional[float] = None,
+        max_timeouts: int = CFG.PARAMETERS.DEFAULT_MAX_TIMEOUTS,
+        extract: Optional[Extract] = None,
     ) -> "Execute":
         if response_modify is None and request_modify is None:
             raise ValueError("ALL action requires at least one of response_modify or request_modify")
@@ -88,4 +135,8 @@ class Execute:
             request_modify=request_modify,
             max_responses=max_responses,
             max_modifications=max_modifications,
+            executor=executor,
+            modify_timeout=modify_timeout,
+            max_timeouts=max_timeouts,
+            extract=extract,
         )
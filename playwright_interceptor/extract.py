@@ -0,0 +1,205 @@
+import re
+from io import BytesIO
+from dataclasses import dataclass, field
+from beartype import beartype
+from beartype.typing import Any, Dict, List, Tuple, Union
+from . import config as CFG
+from .typecheck import hot_path
+from .spool import MemoryReader
+from .content_loader import _find_json
+
+try:
+    import ijson
+except ImportError:
+    # Optional dependency (pip install playwright_interceptor[extract]);
+    # without it the body is parsed whole and only the selection is kept
+    ijson = None
+
+
+# One step of a compiled path: object key, array index, or None for a wildcard
+Step = Union[str, int, None]
+
+_DOT_STEP = re.compile(r"\*|[^.\[\]]+")
+_BRACKET_STEP = re.compile(r"""\[(?:(\*)|(\d+)|'([^']*)'|"([^"]*)")\]""")
+# Bytes scanned at a time for the start of the document
+_SCAN_CHUNK = 64 * 1024
+
+
+@beartype
+def compile_path(path: str) -> Tuple[Step, ...]:
+    """
+    Compiles a JSONPath-like selector into steps.
+
+    Supported syntax: `$` root, `.key`, `['key']`, `[N]`, `[*]` and `.*`,
+    e.g. `$.items[*].price` or `$['data'].list[0]`.
+    """
+    if not path.startswith("$"):
+        raise ValueError(CFG.ERRORS.INVALID_JSON_PATH.format(path=path, position=0))
+
+    steps: List[Step] = []
+    pos = 1
+    while pos < len(path):
+        if path[pos] == ".":
+            match = _DOT_STEP.match(path, pos + 1)
+            if match is None:
+                raise ValueError(CFG.ERRORS.INVALID_JSON_PATH.format(path=path, position=pos))
+            steps.append(None if match.group() == "*" else match.group())
+        else:
+            match = _BRACKET_STEP.match(path, pos)
+            if match is None:
+                raise ValueError(CFG.ERRORS.INVALID_JSON_PATH.format(path=path, position=pos))
+            wildcard, index, single, double = match.groups()
+            if wildcard:
+                steps.append(None)
+            elif index is not None:
+                steps.append(int(index))
+            else:
+                steps.append(single if single is not None else double)
+        pos = match.end()
+    return tuple(steps)
+
+
+def _matches(steps: Tuple[Step, ...], location: List[Union[str, int]]) -> bool:
+    for step, part in zip(steps, location):
+        if step is not None and (step != part or type(step) is not type(part)):
+            return False
+    return True
+
+
+def _select(value: Any, steps: Tuple[Step, ...], found: List[Any]) -> None:
+    """Appends every value under steps, in document order"""
+    if not steps:
+        found.append(value)
+        return
+    step, rest = steps[0], steps[1:]
+    if isinstance(value, dict):
+        if step is None:
+            for item in value.values():
+                _select(item, rest, found)
+        elif isinstance(step, str) and step in value:
+            _select(value[step], rest, found)
+    elif isinstance(value, list):
+        if step is None:
+            for item in value:
+                _select(item, rest, found)
+        elif isinstance(step, int) and step < len(value):
+            _select(value[step], rest, found)
+
+
+def _json_start(body: Union[bytes, memoryview]) -> int:
+    """Offset of the JSON document, past anti-hijacking prefixes such as )]}'"""
+    for offset in range(0, len(body), _SCAN_CHUNK):
+        chunk = bytes(body[offset:offset + _SCAN_CHUNK])
+        starts = [pos for pos in (chunk.find(b"{"), chunk.find(b"[")) if pos >= 0]
+        if starts:
+            return offset + min(starts)
+    raise ValueError(CFG.ERRORS.EXTRACT_NOT_JSON)
+
+
+@beartype
+@dataclass(frozen=True)
+class Extract:
+    """
+    Partial extraction of captured JSON bodies.
+
+    Each path selects a list of values (every match, in document order); the
+    captured Response carries them in `extracted` keyed by path, and its
+    `content` is dropped unless `keep_body` is set. With `ijson` installed the
+    body is parsed as a stream and only the selected values are built;
+    otherwise it is parsed whole and everything but the selection is freed.
+    """
+
+    paths: Tuple[str, ...]
+    keep_body: bool = False
+    _steps: Tuple[Tuple[Step, ...], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.paths:
+            raise ValueError(CFG.ERRORS.EXTRACT_NO_PATHS)
+        object.__setattr__(self, "_steps", tuple(compile_path(path) for path in self.paths))
+
+    @classmethod
+    def PATHS(cls, *paths: str, keep_body: bool = False) -> "Extract":
+        return cls(paths=paths, keep_body=keep_body)
+
+    @hot_path
+    def apply(self, body: Union[bytes, memoryview]) -> Dict[str, List[Any]]:
+        """Selected values of a JSON body, {path: [values]}"""
+        if ijson is not None:
+            try:
+                return self._stream(body, _json_start(body))
+            except ijson.common.JSONError:
+                # Trailing bytes after the document, or a prefix with a stray { or [
+                # fooled the byte scan; the text scan below handles both
+                pass
+
+        # Offsets are searched in the decoded text: a non-ASCII prefix shifts byte offsets
+        found = _find_json(str(body, "utf-8").lstrip())
+        if found is None:
+            raise ValueError(CFG.ERRORS.EXTRACT_NOT_JSON)
+        document = found[2]
+        extracted = {}
+        for path, steps in zip(self.paths, self._steps):
+            extracted[path] = found = []
+            _select(document, steps, found)
+        return extracted
+
+    def _stream(self, body: Union[bytes, memoryview], start: int) -> Dict[str, List[Any]]:
+        found: List[List[Any]] = [[] for _ in self.paths]
+        depths = {len(steps) for steps in self._steps}
+
+        # Location of the current value: keys of open objects, indexes of open arrays
+        location: List[Union[str, int, None]] = []
+        arrays: List[bool] = []
+        # Values under construction: (builder, depth it started at, path positions)
+        building: List[Tuple[Any, int, List[int]]] = []
+
+        # A spooled body is read straight from its mapping
+        stream = MemoryReader(body) if isinstance(body, memoryview) else BytesIO(body)
+        stream.seek(start)
+        for event, value in ijson.basic_parse(stream, use_float=True):
+            if event == "map_key":
+                location[-1] = value
+                for builder, _depth, _targets in building:
+                    builder.event(event, value)
+                continue
+
+            if event in ("end_map", "end_array"):
+                location.pop()
+                arrays.pop()
+                for builder, _depth, _targets in building:
+                    builder.event(event, value)
+                while building and building[-1][1] == len(location):
+                    builder, _depth, targets = building.pop()
+                    for position in targets:
+                        found[position].append(builder.value)
+                if not location:
+                    break
+                continue
+
+            # A value starts: scalar, object or array
+            if arrays and arrays[-1]:
+                location[-1] += 1
+            for builder, _depth, _targets in building:
+                builder.event(event, value)
+
+            targets = []
+            if len(location) in depths:
+                targets = [
+                    position for position, steps in enumerate(self._steps)
+                    if len(steps) == len(location) and _matches(steps, location)
+                ]
+
+            if event in ("start_map", "start_array"):
+                if targets:
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    building.append((builder, len(location), targets))
+                location.append(None if event == "start_map" else -1)
+                arrays.append(event == "start_array")
+            else:
+                for position in targets:
+                    found[position].append(value)
+                if not location:
+                    break
+        return dict(zip(self.paths, found))
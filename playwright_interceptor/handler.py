@@ -1,14 +1,17 @@
 from .models import Response, HttpMethod
-from .execute import Execute
-from .tools import parse_content_type
+from .execute import Execute, ExecuteAction
+from .tools import parse_content_type, predict_content
 from beartype import beartype
-from beartype.typing import List, Optional
+from beartype.typing import Any, Dict, List, Optional, Pattern, Union
+import re
 import uuid
 from . import config as CFG
+from .typecheck import hot_path
 import urllib.parse
 from urllib.parse import urlparse
 from dataclasses import dataclass
 from .models import WatcherType, ExpectedContentType
+from .retention import RejectedResponse, RejectedSummary
 
 
 @beartype
@@ -74,16 +77,71 @@ class Handler:
     def NONE(cls, slug: str = ""):
         return cls(WatcherType.ALL, startswith_url="!NONE!", execute=Execute.RETURN(), slug=slug)
 
+    @hot_path
+    def _match_url(self, full_url: str, base_url: str) -> bool:
+        """Checks startswith_url and watcher filters against an unquoted URL"""
+        if self.startswith_url is not None and not full_url.startswith(self.startswith_url):
+            return False
+        if self.watcher == WatcherType.ALL:
+            return True
+
+        base_parsed = urlparse(base_url)
+        resp_parsed = urlparse(full_url)
+        is_main = (
+            base_parsed.scheme == resp_parsed.scheme and
+            base_parsed.netloc == resp_parsed.netloc and
+            (resp_parsed.path in ['', '/'] or resp_parsed.path == base_parsed.path)
+        )
+        if self.watcher == WatcherType.MAIN:
+            return is_main
+        return not is_main
+
+    @hot_path
+    def _match_method(self, method: str) -> bool:
+        return self.method == HttpMethod.ANY or method == self.method.value
+
+    @hot_path
+    def should_route(self, request, base_url: str) -> bool:
+        """
+        Pre-response check: can this handler possibly capture the request?
+
+        Uses only what is known before the request is sent (URL, method and
+        Playwright resource type), so a negative answer is final and the request
+        can be left to the browser's own network stack.
+        """
+        if not self._match_method(request.method):
+            return False
+        if self.expected_content != ExpectedContentType.ANY:
+            possible = CFG.NETWORK.RESOURCE_TYPE_CONTENT.get(request.resource_type)
+            if possible is not None and self.expected_content.name not in possible:
+                return False
+        return self._match_url(urllib.parse.unquote(request.url), base_url)
+
+    @hot_path
+    def should_block(self, request, base_url: str) -> bool:
+        """
+        Pre-request check for Execute.BLOCK handlers: should the request be aborted?
+
+        Unlike should_route, the expected content must be certain rather than
+        merely possible, so it is predicted from the URL extension or the
+        resource type; requests of unpredictable content are blocked only by
+        handlers expecting ANY.
+        """
+        if self.execute.action != ExecuteAction.BLOCK or not self._match_method(request.method):
+            return False
+        full_url = urllib.parse.unquote(request.url)
+        if self.expected_content != ExpectedContentType.ANY:
+            if self.expected_content.name not in predict_content(full_url, request.resource_type):
+                return False
+        return self._match_url(full_url, base_url)
+
+    @hot_path
     def should_capture(self, resp, base_url: str) -> bool:
         """Определяет, должен ли handler захватить данный response"""
         full_url = urllib.parse.unquote(resp.url)
         type_data = parse_content_type(resp.headers.get("content-type", ""))
         ctype = type_data["content_type"]
 
-        def match_method() -> bool:
-            # Проверяем метод запроса
-            return self.method == HttpMethod.ANY or resp.request.method == self.method.value
-
         def match_content(ctype: str, expected: ExpectedContentType) -> bool:
             return {
                 ExpectedContentType.JSON: ctype in CFG.NETWORK.JSON_EXTENSIONS,
@@ -98,30 +156,50 @@ class Handler:
                 ExpectedContentType.TEXT: ctype in CFG.NETWORK.TEXT_EXTENSIONS,
                 ExpectedContentType.ANY: True
             }[expected]
-        
-        def match_watcher():
-            if self.watcher == WatcherType.ALL:
-                return True
-            else:
-                is_main = (
-                    base_parsed.scheme == resp_parsed.scheme and
-                    base_parsed.netloc == resp_parsed.netloc and
-                    (resp_parsed.path in ['', '/'] or resp_parsed.path == base_parsed.path)
-                )
-                if self.watcher == WatcherType.MAIN:
-                    return is_main
-                else:
-                    return not is_main
 
-        base_parsed = urlparse(base_url)
-        resp_parsed = urlparse(full_url)
-
-        return (self.startswith_url is None or full_url.startswith(self.startswith_url)) and \
-                match_watcher() and \
-                match_method() and \
+        return self._match_url(full_url, base_url) and \
+                self._match_method(resp.request.method) and \
                 match_content(ctype, self.expected_content)
 
 
+def _prefix_to_regex(prefix: str) -> str:
+    """
+    Regex for raw URLs whose unquoted form starts with prefix.
+
+    Handler.should_capture compares against urllib.parse.unquote(url), so every
+    character may also arrive percent-encoded (as its UTF-8 bytes).
+    """
+    parts = []
+    for char in prefix:
+        encoded = ''.join(
+            '%' + ''.join(f'[{d.lower()}{d.upper()}]' if d.isalpha() else d for d in f'{byte:02X}')
+            for byte in char.encode('utf-8')
+        )
+        parts.append(f'(?:{re.escape(char)}|{encoded})')
+    return ''.join(parts)
+
+
+@beartype
+def compile_route_pattern(handlers: List[Handler]) -> Union[str, Pattern]:
+    """
+    Compiles handler URL filters into the narrowest single Playwright route pattern.
+
+    Returns the global glob when some handler has no startswith_url, otherwise one
+    anchored regex over the distinct prefixes. The regex is evaluated by the
+    Playwright driver, so requests outside every prefix never reach Python.
+    """
+    prefixes = {handler.startswith_url for handler in handlers}
+    if not prefixes or None in prefixes:
+        return CFG.PARAMETERS.ROUTE_ALL
+
+    # Prefixes covered by a shorter one add nothing to the match
+    distinct = []
+    for prefix in sorted(prefixes, key=len):
+        if not any(prefix.startswith(kept) for kept in distinct):
+            distinct.append(prefix)
+
+    return re.compile('^(?:' + '|'.join(_prefix_to_regex(prefix) for prefix in distinct) + ')')
+
 
 @beartype
 @dataclass(frozen=True)
@@ -130,8 +208,22 @@ class HandlerSearchSuccess:
     responses: List[Response]
     duration: float = 0.0
     handler_slug: str = 'unknown'
+    # Modifier budget breaches and whether they tripped the handler to pass-through
+    modify_timeouts: int = 0
+    tripped: bool = False
+    # Requests aborted by an Execute.BLOCK handler
+    blocked: int = 0
     
+    def by_page(self) -> Dict[Any, List[Response]]:
+        """Groups captured responses by the page they came from"""
+        grouped: Dict[Any, List[Response]] = {}
+        for response in self.responses:
+            grouped.setdefault(response.page, []).append(response)
+        return grouped
+
     def __str__(self):
+        if self.blocked:
+            return f"HandlerSearchSuccess: Blocked {self.blocked} requests for `{self.handler_slug}` handler."
         return f"HandlerSearchSuccess: Found {len(self.responses)} responses for `{self.handler_slug}` handler."
     
     def __repr__(self):
@@ -141,12 +233,16 @@ class HandlerSearchSuccess:
 @dataclass(frozen=True)
 class HandlerSearchFailed:
     """Class for representing error when handler didn't find suitable response"""
-    rejected_responses: List['Response']
+    rejected_responses: List[RejectedResponse]
     duration: float = 0.0
     handler_slug: str = 'unknown'
+    rejected_count: int = 0
+    rejected_summary: Optional[RejectedSummary] = None
+    modify_timeouts: int = 0
+    tripped: bool = False
     
     def __str__(self):
-        return f"HandlerSearchFailedError: Not found suitable response for `{self.handler_slug}` handler. Rejected {len(self.rejected_responses)} responses."
+        return f"HandlerSearchFailedError: Not found suitable response for `{self.handler_slug}` handler. Rejected {self.rejected_count} responses."
 
     def __repr__(self):
-        return f"HandlerSearchFailedError(duration={self.duration:.1f}, rejected_count={len(self.rejected_responses)})"
+        return f"HandlerSearchFailedError(duration={self.duration:.1f}, rejected_count={self.rejected_count})"
@@ -0,0 +1,221 @@
+from urllib.parse import urlparse
+from .typecheck import hot_path
+from beartype.typing import Dict, List, Optional
+from . import config as CFG
+from .execute import ExecuteAction
+from .handler import Handler
+from .models import HttpMethod, WatcherType, ExpectedContentType
+from .tools import parse_content_type, predict_content
+
+
+# Content-type tables for every concrete ExpectedContentType
+_CONTENT_TABLES = {
+    ExpectedContentType.JSON: CFG.NETWORK.JSON_EXTENSIONS,
+    ExpectedContentType.JS: CFG.NETWORK.JS_EXTENSIONS,
+    ExpectedContentType.CSS: CFG.NETWORK.CSS_EXTENSIONS,
+    ExpectedContentType.IMAGE: CFG.NETWORK.IMAGE_EXTENSIONS,
+    ExpectedContentType.VIDEO: CFG.NETWORK.VIDEO_EXTENSIONS,
+    ExpectedContentType.AUDIO: CFG.NETWORK.AUDIO_EXTENSIONS,
+    ExpectedContentType.FONT: CFG.NETWORK.FONT_EXTENSIONS,
+    ExpectedContentType.APPLICATION: CFG.NETWORK.APPLICATION_EXTENSIONS,
+    ExpectedContentType.ARCHIVE: CFG.NETWORK.ARCHIVE_EXTENSIONS,
+    ExpectedContentType.TEXT: CFG.NETWORK.TEXT_EXTENSIONS,
+}
+
+
+class _TrieNode:
+    __slots__ = ("mask", "children")
+
+    def __init__(self) -> None:
+        self.mask = 0
+        self.children: Dict[str, "_TrieNode"] = {}
+
+
+@hot_path
+class HandlerIndex:
+    """
+    Precompiled matching structure over a fixed list of handlers.
+
+    Every handler owns one bit; each filter (URL prefix, watcher, method,
+    resource type, content type) is turned into bitmasks once, so matching a
+    request is a trie walk plus a few dict lookups and integer ANDs,
+    independent of the number of handlers. Results agree with
+    Handler.should_route / Handler.should_capture.
+    """
+
+    def __init__(self, handlers: List[Handler], base_url: str):
+        self.handlers = tuple(handlers)
+        self.base_url = base_url
+        self._base_parsed = urlparse(base_url)
+        self.all_mask = (1 << len(self.handlers)) - 1
+        self.bits: Dict[str, int] = {}
+
+        self._trie = _TrieNode()
+        self._any_method = 0
+        self._by_method: Dict[str, int] = {}
+        self._watch_all = 0
+        self._watch_main = 0
+        self._watch_side = 0
+        self._any_content = 0
+        self._by_content: Dict[ExpectedContentType, int] = {}
+        # Execute.BLOCK handlers, matched before the request is sent
+        self.block_all = 0
+
+        for position, handler in enumerate(self.handlers):
+            bit = 1 << position
+            self.bits[handler.slug] = bit
+            if handler.execute.action == ExecuteAction.BLOCK:
+                self.block_all |= bit
+
+            node = self._trie
+            for char in handler.startswith_url or "":
+                node = node.children.setdefault(char, _TrieNode())
+            node.mask |= bit
+
+            if handler.method == HttpMethod.ANY:
+                self._any_method |= bit
+            else:
+                self._by_method[handler.method.value] = self._by_method.get(handler.method.value, 0) | bit
+
+            if handler.watcher == WatcherType.MAIN:
+                self._watch_main |= bit
+            elif handler.watcher == WatcherType.SIDE:
+                self._watch_side |= bit
+            else:
+                self._watch_all |= bit
+
+            if handler.expected_content == ExpectedContentType.ANY:
+                self._any_content |= bit
+            else:
+                self._by_content[handler.expected_content] = self._by_content.get(handler.expected_content, 0) | bit
+
+        # Lazily filled caches, keyed by the raw strings seen on the wire
+        self._content_cache: Dict[str, int] = {}
+        self._resource_cache: Dict[str, int] = {}
+        self._predicted_cache: Dict[tuple, int] = {}
+        self._base_cache: Dict[str, tuple] = {}
+
+    def _parse_base(self, base_url: Optional[str]):
+        """Parsed base URL, either the index default or a per-page one (context-wide interception)"""
+        if base_url is None:
+            return self._base_parsed
+        parsed = self._base_cache.get(base_url)
+        if parsed is None:
+            if len(self._base_cache) >= CFG.PARAMETERS.BASE_URL_CACHE_SIZE:
+                self._base_cache.clear()
+            parsed = self._base_cache[base_url] = urlparse(base_url)
+        return parsed
+
+    def url_mask(self, full_url: str, base_url: Optional[str] = None) -> int:
+        """Handlers whose startswith_url and watcher accept an unquoted URL"""
+        mask = self._trie.mask
+        node = self._trie
+        for char in full_url:
+            node = node.children.get(char)
+            if node is None:
+                break
+            mask |= node.mask
+        if not mask:
+            return 0
+
+        watch = self._watch_all
+        if self._watch_main or self._watch_side:
+            base_parsed = self._parse_base(base_url)
+            parsed = urlparse(full_url)
+            is_main = (
+                base_parsed.scheme == parsed.scheme and
+                base_parsed.netloc == parsed.netloc and
+                (parsed.path in ['', '/'] or parsed.path == base_parsed.path)
+            )
+            watch |= self._watch_main if is_main else self._watch_side
+        return mask & watch
+
+    def method_mask(self, method: str) -> int:
+        """Handlers accepting an HTTP method"""
+        return self._any_method | self._by_method.get(method, 0)
+
+    def resource_mask(self, resource_type: str) -> int:
+        """Handlers whose expected content a Playwright resource type can still produce"""
+        mask = self._resource_cache.get(resource_type)
+        if mask is None:
+            possible = CFG.NETWORK.RESOURCE_TYPE_CONTENT.get(resource_type)
+            if possible is None:
+                mask = self.all_mask
+            else:
+                mask = self._any_content
+                for expected, expected_mask in self._by_content.items():
+                    if expected.name in possible:
+                        mask |= expected_mask
+            self._resource_cache[resource_type] = mask
+        return mask
+
+    def content_mask(self, content_type: str) -> int:
+        """Handlers accepting a raw Content-Type header value"""
+        mask = self._content_cache.get(content_type)
+        if mask is None:
+            ctype = parse_content_type(content_type)["content_type"]
+            mask = self._any_content
+            for expected, expected_mask in self._by_content.items():
+                if ctype in _CONTENT_TABLES[expected]:
+                    mask |= expected_mask
+            self._content_cache[content_type] = mask
+        return mask
+
+    def route_mask(
+        self,
+        full_url: str,
+        method: str,
+        resource_type: str,
+        base_url: Optional[str] = None,
+        within: Optional[int] = None,
+    ) -> int:
+        """Pre-response match, see Handler.should_route"""
+        mask = self.method_mask(method) & self.resource_mask(resource_type)
+        if within is not None:
+            mask &= within
+        return mask and mask & self.url_mask(full_url, base_url)
+
+    def capture_mask(
+        self,
+        full_url: str,
+        method: str,
+        content_type: str,
+        within: Optional[int] = None,
+        base_url: Optional[str] = None,
+    ) -> int:
+        """Response match, see Handler.should_capture"""
+        mask = self.method_mask(method) & self.content_mask(content_type)
+        if within is not None:
+            mask &= within
+        return mask and mask & self.url_mask(full_url, base_url)
+
+    def block_mask(
+        self,
+        full_url: str,
+        method: str,
+        resource_type: str,
+        base_url: Optional[str] = None,
+    ) -> int:
+        """Execute.BLOCK handlers that abort a request, see Handler.should_block"""
+        mask = self.block_all and self.block_all & self.method_mask(method)
+        if not mask:
+            return 0
+        predicted = predict_content(full_url, resource_type)
+        content = self._predicted_cache.get(predicted)
+        if content is None:
+            content = self._any_content
+            for expected, expected_mask in self._by_content.items():
+                if expected.name in predicted:
+                    content |= expected_mask
+            self._predicted_cache[predicted] = content
+        mask &= content
+        return mask and mask & self.url_mask(full_url, base_url)
+
+    def select(self, mask: int) -> List[Handler]:
+        """Handlers for the set bits of mask, in registration order"""
+        selected = []
+        while mask:
+            low = mask & -mask
+            selected.append(self.handlers[low.bit_length() - 1])
+            mask ^= low
+        return selected
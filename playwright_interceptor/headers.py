@@ -0,0 +1,133 @@
+from collections.abc import Mapping, MutableMapping
+from beartype.typing import Iterable, Iterator, List, Optional, Tuple, Union
+from . import config as CFG
+from .typecheck import hot_path
+
+
+@hot_path
+class Headers(MutableMapping):
+    """
+    Case-insensitive multi-dict of HTTP headers.
+
+    Each name is lowercased once, when it is set, and maps to the spelling
+    it was set with and a tuple of its values, so lookups are a single dict
+    access. Reading a name joins its values the way Playwright does (", ",
+    newlines for set-cookie); get_all() returns them separately.
+
+    copy() does not copy anything: copies share storage until one of them
+    is written to, and only then does the writer take its own table.
+    """
+
+    __slots__ = ("_fields", "_shared")
+
+    def __init__(self, headers: Union[Mapping, Iterable[Tuple[str, str]], None] = None):
+        self._fields: dict = {}
+        self._shared = False
+        if headers is None:
+            return
+        if isinstance(headers, Headers):
+            self._fields = headers._fields
+            self._shared = headers._shared = True
+            return
+        if isinstance(headers, Mapping):
+            items = headers.items()
+        else:
+            items = headers
+        for name, value in items:
+            lower = name.lower()
+            if lower in CFG.PARAMETERS.NEWLINE_JOINED_HEADERS and "\n" in value:
+                # Playwright's dict form of repeated set-cookie
+                for part in value.split("\n"):
+                    self.add(name, part)
+            else:
+                self.add(name, value)
+
+    @classmethod
+    def from_array(cls, array: Iterable[dict]) -> "Headers":
+        """Builds headers from Playwright's headers_array ([{"name": ..., "value": ...}])"""
+        return cls((header["name"], header["value"]) for header in array)
+
+    def _own(self) -> None:
+        """Takes a private copy of the table before the first write to a shared one"""
+        if self._shared:
+            self._fields = dict(self._fields)
+            self._shared = False
+
+    def copy(self) -> "Headers":
+        clone = Headers.__new__(Headers)
+        clone._fields = self._fields
+        clone._shared = self._shared = True
+        return clone
+
+    __copy__ = copy
+
+    # Mapping interface
+
+    def __getitem__(self, name: str) -> str:
+        values = self._fields[name.lower()][1]
+        if len(values) == 1:
+            return values[0]
+        separator = "\n" if name.lower() in CFG.PARAMETERS.NEWLINE_JOINED_HEADERS else ", "
+        return separator.join(values)
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        if name.lower() in self._fields:
+            return self[name]
+        return default
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, str) and name.lower() in self._fields
+
+    def __iter__(self) -> Iterator[str]:
+        return (field[0] for field in self._fields.values())
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __setitem__(self, name: str, value: str) -> None:
+        """Replaces every value of name"""
+        self._own()
+        self._fields[name.lower()] = (name, (value,))
+
+    def __delitem__(self, name: str) -> None:
+        self._own()
+        del self._fields[name.lower()]
+
+    # Multiple values
+
+    def get_all(self, name: str) -> List[str]:
+        field = self._fields.get(name.lower())
+        return list(field[1]) if field is not None else []
+
+    def add(self, name: str, value: str) -> None:
+        """Appends a value, keeping those already set for name"""
+        self._own()
+        lower = name.lower()
+        field = self._fields.get(lower)
+        self._fields[lower] = (name, (value,)) if field is None else (field[0], field[1] + (value,))
+
+    def multi_items(self) -> List[Tuple[str, str]]:
+        """(name, value) for every value, in insertion order of names"""
+        return [(name, value) for name, values in self._fields.values() for value in values]
+
+    def __repr__(self) -> str:
+        return f"Headers({dict(self.items())!r})"
+
+
+def header_value(headers: Mapping, name: str, default: Optional[str] = None) -> Optional[str]:
+    """Case-insensitive lookup in Headers or in any plain mapping"""
+    if isinstance(headers, Headers):
+        return headers.get(name, default)
+    lower = name.lower()
+    for key, value in headers.items():
+        if key.lower() == lower:
+            return value
+    return default
+
+
+def response_headers(response) -> Headers:
+    """Headers of a Playwright APIResponse (kept multi-valued) or of a stored response"""
+    array = getattr(response, "headers_array", None)
+    if isinstance(array, list):
+        return Headers.from_array(array)
+    return Headers(response.headers)
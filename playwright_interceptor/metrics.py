@@ -0,0 +1,168 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from beartype.typing import Dict, List, Optional
+from . import config as CFG
+
+
+class RequestTimings:
+    """
+    Monotonic timings of one routed request, in seconds.
+
+    `started` is the time.perf_counter() value at route entry; every other
+    field is the duration of one stage of handle_route. Modifier times are
+    per handler slug. Stages the request did not go through stay None/empty.
+    """
+
+    __slots__ = ("started", "request_modify", "fetch", "body", "response_modify", "fulfill", "finished")
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.request_modify: Dict[str, float] = {}
+        self.fetch: Optional[float] = None
+        self.body: Optional[float] = None
+        self.response_modify: Dict[str, float] = {}
+        self.fulfill: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def total(self) -> Optional[float]:
+        """Time from route entry to the end of fulfill"""
+        return self.finished - self.started if self.finished is not None else None
+
+    @property
+    def overhead(self) -> Optional[float]:
+        """Time spent in the interceptor itself, i.e. total minus the upstream fetch"""
+        if self.finished is None:
+            return None
+        return self.total - (self.fetch or 0.0)
+
+    def as_dict(self) -> dict:
+        return {
+            "request_modify": dict(self.request_modify),
+            "fetch": self.fetch,
+            "body": self.body,
+            "response_modify": dict(self.response_modify),
+            "fulfill": self.fulfill,
+            "total": self.total,
+        }
+
+    def __repr__(self) -> str:
+        parts = ", ".join(f"{k}={v}" for k, v in self.as_dict().items() if v not in (None, {}))
+        return f"RequestTimings({parts})"
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds"""
+
+    __slots__ = ("bounds", "buckets", "count", "sum", "min", "max")
+
+    def __init__(self, bounds=CFG.PARAMETERS.METRICS_BUCKETS):
+        self.bounds = bounds
+        # Last bucket collects everything above the largest bound
+        self.buckets: List[int] = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile, capped by the observed max"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for position, amount in enumerate(self.buckets):
+            seen += amount
+            if seen >= rank and amount:
+                bound = self.bounds[position] if position < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+        }
+
+    def __repr__(self) -> str:
+        return f"Histogram(count={self.count}, p50={self.percentile(0.5)}, p99={self.percentile(0.99)})"
+
+
+class InterceptorMetrics:
+    """
+    Counters and histograms of a NetworkInterceptor's routing pipeline.
+
+    Accumulated across every execute()/stream() of the interceptor until
+    reset(). `passed_through` requests went on untouched, `fetched_for_storage`
+    ones no handler wanted were still fetched for the cache or the archive.
+    Byte counters cover bodies that pass through Python: `bytes_in`
+    are bodies read from fetched responses, `bytes_out` are bodies sent in
+    route.fulfill(); responses fulfilled by reference count in neither.
+    `blocked_bytes` is an estimate of what requests aborted by Execute.BLOCK
+    would have transferred (see NETWORK.BLOCKED_BYTES_ESTIMATE).
+    `compressed_in`/`compressed_out` are captured bodies held compressed
+    under a CompressionPolicy, before and after compression.
+    """
+
+    COUNTERS = (
+        "routed", "passed_through", "fetched_for_storage", "captured", "rejected", "fulfilled", "coalesced",
+        "blocked", "bytes_in", "bytes_out", "blocked_bytes", "compressed_in", "compressed_out",
+    )
+    STAGES = ("fetch", "body", "fulfill", "total", "overhead")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.stages: Dict[str, Histogram] = {name: Histogram() for name in self.STAGES}
+        self.request_modify: Dict[str, Histogram] = defaultdict(Histogram)
+        self.response_modify: Dict[str, Histogram] = defaultdict(Histogram)
+
+    def observe(self, timings: RequestTimings) -> None:
+        """Adds the stage durations of a finished request"""
+        for name in self.STAGES:
+            value = getattr(timings, name)
+            if value is not None:
+                self.stages[name].observe(value)
+        for slug, value in timings.request_modify.items():
+            self.request_modify[slug].observe(value)
+        for slug, value in timings.response_modify.items():
+            self.response_modify[slug].observe(value)
+
+    def slowest_modifiers(self, limit: int = 5) -> List[tuple]:
+        """(kind, slug, total seconds) of the modifiers that took the most time"""
+        totals = [("request", slug, h.sum) for slug, h in self.request_modify.items()]
+        totals += [("response", slug, h.sum) for slug, h in self.response_modify.items()]
+        return sorted(totals, key=lambda item: item[2], reverse=True)[:limit]
+
+    def as_dict(self) -> dict:
+        return {
+            "counters": {name: getattr(self, name) for name in self.COUNTERS},
+            "stages": {name: histogram.as_dict() for name, histogram in self.stages.items()},
+            "request_modify": {slug: histogram.as_dict() for slug, histogram in self.request_modify.items()},
+            "response_modify": {slug: histogram.as_dict() for slug, histogram in self.response_modify.items()},
+        }
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{name}={getattr(self, name)}" for name in self.COUNTERS)
+        return f"InterceptorMetrics({counters})"
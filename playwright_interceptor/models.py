@@ -1,11 +1,16 @@
+import copy
 import urllib.parse
-from beartype import beartype
-from beartype.typing import Union, Optional, Dict
+from .typecheck import hot_path
+from beartype.typing import Any, Union, Optional, Dict
 from .tools import parse_content_type
 from enum import Enum
 from io import BytesIO
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from . import config as CFG
+from .metrics import RequestTimings
+from .spool import MemoryReader, SpooledBody
+from .compression import CompressionPolicy, decompress_body
+from .headers import Headers, header_value
 from enum import auto
 
 
@@ -39,56 +44,202 @@ class HttpMethod(Enum):
     ANY = None  # Special method for capturing any requests
 
 
-@beartype
+@hot_path
 @dataclass(frozen=False)
 class Response:
     """Class for representing API response"""
     
     status: int
-    request_headers: dict
-    response_headers: dict
-    content: bytes = b""
+    # Plain dicts are converted to Headers (case-insensitive, copy-on-write)
+    request_headers: Union[dict, Headers]
+    response_headers: Union[dict, Headers]
+    # bytes, or a read-only memoryview over a spooled file (see SpoolPolicy)
+    content: Union[bytes, memoryview] = b""
     duration: float = 0.0
     url: Optional[str] = None
+    # Playwright page the request came from
+    page: Any = field(default=None, repr=False, compare=False)
+    # Monotonic per-stage timings of the request (duration is time since execute() started)
+    timings: Optional[RequestTimings] = field(default=None, repr=False, compare=False)
+    # Values selected by Execute(extract=...), {path: [values]}; content is empty unless keep_body
+    extracted: Optional[Dict[str, list]] = field(default=None, repr=False)
+    # Memoized content_parse() result and the (content, content-type) it was built from
+    _parsed: Union[dict, list, str, BytesIO, MemoryReader, None] = field(default=None, init=False, repr=False, compare=False)
+    _parsed_from: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    # Body as received from upstream, to tell whether modifiers replaced it
+    _fetched: Union[bytes, memoryview, None] = field(default=None, init=False, repr=False, compare=False)
+    # File backing a spooled body
+    _spool: Optional[SpooledBody] = field(default=None, init=False, repr=False, compare=False)
+    # (codec, compressed body, size) while the body is held compressed (see CompressionPolicy)
+    _packed: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._fetched = self.content
+        if not isinstance(self.request_headers, Headers):
+            self.request_headers = Headers(self.request_headers)
+        if not isinstance(self.response_headers, Headers):
+            self.response_headers = Headers(self.response_headers)
+
+    # `content` is a property over _content (see below the class): a body held
+    # compressed has _content None until it is first read
+    def _get_content(self) -> Union[bytes, memoryview]:
+        content = self._content
+        if content is None:
+            codec, blob, _ = self._packed
+            content = decompress_body(codec, blob)
+            if self._fetched is self._packed:
+                self._fetched = content
+            self._content = content
+            self._packed = None
+        return content
+
+    def _set_content(self, value: Union[bytes, memoryview]) -> None:
+        self._content = value
+        self._packed = None
+
+    def compress(self, policy: CompressionPolicy) -> bool:
+        """
+        Holds the body compressed until `content` is next read.
+
+        Returns whether it did: spooled bodies, bodies below the policy
+        threshold and bodies that do not shrink are left as they are. The
+        content_parse() cache is dropped along with the plain body.
+        """
+        content = self._content
+        if content is None or isinstance(content, memoryview) or not policy.accepts(len(content)):
+            return False
+        blob = policy.compress(content)
+        if blob is None:
+            return False
+        packed = (policy.codec, blob, len(content))
+        # The fetched body is only kept for the content_replaced identity check
+        self._fetched = packed if self._fetched is content else None
+        self._content = None
+        self._packed = packed
+        self._parsed = None
+        self._parsed_from = None
+        return True
+
+    @property
+    def compressed(self) -> bool:
+        """Whether the body is currently held compressed"""
+        return self._content is None
+
+    @property
+    def content_size(self) -> int:
+        """Body size in bytes, without decompressing it"""
+        return self._packed[2] if self._content is None else len(self._content)
+
+    def __getstate__(self) -> dict:
+        # The Playwright page and the parse cache stay in the process that owns them;
+        # content and _fetched share one bytes object, which pickle keeps shared
+        state = self.__dict__.copy()
+        state["page"] = None
+        state["_parsed"] = None
+        state["_parsed_from"] = None
+        spool = self._spool
+        if spool is not None:
+            # A spooled body is mapped again from its file on the other side, not copied
+            for name in ("_content", "_fetched"):
+                if state[name] is spool.view:
+                    state[name] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        spool = state.get("_spool")
+        if spool is not None:
+            for name in ("_content", "_fetched"):
+                if state[name] is None:
+                    state[name] = spool.view
+        self.__dict__.update(state)
+
+    # copy/deepcopy would otherwise go through __getstate__ and lose the page
+    def __copy__(self) -> "Response":
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+    def __deepcopy__(self, memo: dict) -> "Response":
+        clone = object.__new__(type(self))
+        memo[id(self)] = clone
+        state = self.__dict__
+        if isinstance(self._parsed, (BytesIO, MemoryReader)):
+            # A file object is not copied, the clone opens its own on next parse
+            state = {**state, "_parsed": None, "_parsed_from": None}
+        for name, value in state.items():
+            # The page and a spooled body (read-only, mapped from its file) are shared
+            if name in ("page", "_spool") or isinstance(value, memoryview):
+                clone.__dict__[name] = value
+            else:
+                clone.__dict__[name] = copy.deepcopy(value, memo)
+        return clone
+
+    @property
+    def body_path(self) -> Optional[str]:
+        """File holding the current content, if it is spooled"""
+        spool = self._spool
+        return spool.path if spool is not None and self.content is spool.view else None
+
+    @property
+    def content_replaced(self) -> bool:
+        """Whether content was reassigned since the body was received"""
+        if self._content is None:
+            # Held compressed: _fetched is the packed body unless it was replaced
+            return self._packed is not self._fetched
+        return self._content is not self._fetched
     
-    def content_parse(self) -> Union[dict, list, str, BytesIO]:
-        """Parses response content into Python-like format"""
+    def content_parse(self) -> Union[dict, list, str, BytesIO, MemoryReader]:
+        """
+        Parses response content into Python-like format.
+
+        The result is computed once and shared by every caller (e.g. all
+        sequential response_modify handlers); it is rebuilt only after
+        `content` or the content-type header is reassigned. Binary bodies
+        come as file objects; for a spooled body that is a reader over the
+        same mapping, not a copy.
+        """
         from .content_loader import parse_response_data
         
         if not self.content:
             return ""
         
         # Look for content-type regardless of case
-        content_type = ''
-        for key, value in self.response_headers.items():
-            if key.lower() == 'content-type':
-                content_type = value
-                break
-        else:
+        content_type = header_value(self.response_headers, 'content-type')
+        if content_type is None:
             raise ValueError("Content-Type header not found in response headers")
-                
-        return parse_response_data(self.content, content_type)
+
+        source = self._parsed_from
+        if source is None or source[0] is not self.content or source[1] != content_type:
+            self._parsed = parse_response_data(self.content, content_type)
+            self._parsed_from = (self.content, content_type)
+        elif isinstance(self._parsed, (BytesIO, MemoryReader)):
+            self._parsed.seek(0)
+        return self._parsed
     
     def __str__(self) -> str:
-        type_data = parse_content_type(self.response_headers.get('content-type', CFG.LOGS.UNKNOWN_HEADER_TYPE))
+        type_data = parse_content_type(header_value(self.response_headers, 'content-type', CFG.LOGS.UNKNOWN_HEADER_TYPE))
         content_type = type_data["content_type"]
-        content_size = f"{len(self.content)} bytes" if self.content else "0 bytes"
+        content_size = f"{self.content_size} bytes"
         
         url_info = f", url='{self.url}'" if self.url else ""
         return f"Response(status={self.status}, content_type='{content_type}', size={content_size}, duration={self.duration:.3f}s{url_info})"
     
     def __repr__(self) -> str:
         url_info = f", url='{self.url}'" if self.url else ""
-        content_size = len(self.content) if self.content else 0
-        return f"Response(status={self.status}, headers={len(self.response_headers)}, content_size={content_size}, duration={self.duration}{url_info})"
+        return f"Response(status={self.status}, headers={len(self.response_headers)}, content_size={self.content_size}, duration={self.duration}{url_info})"
+
+
+# The dataclass keeps `content` as an __init__ argument and a compared field,
+# reads and writes go through the property
+Response.content = property(Response._get_content, Response._set_content)
 
-@beartype
+@hot_path
 @dataclass(frozen=False)
 class Request:
     """Class for representing HTTP request with modification capability"""
     
     url: str
-    headers: Optional[Dict[str, str]] = None
+    headers: Optional[Union[Dict[str, str], Headers]] = None
     params: Optional[Dict[str, str]] = None
     body: Optional[Union[dict, str]] = None
     method: HttpMethod = HttpMethod.GET
@@ -97,7 +248,9 @@ class Request:
         """Initialization after dataclass creation"""
         # Initialize empty dictionaries if None
         if self.headers is None:
-            self.headers = {}
+            self.headers = Headers()
+        elif not isinstance(self.headers, Headers):
+            self.headers = Headers(self.headers)
         if self.params is None:
             self.params = {}
             
@@ -1,23 +1,82 @@
+import asyncio
 import logging
 import time
-from typing import List, Optional, Union
-from .handler import Handler
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from beartype import beartype
+from beartype.typing import AsyncIterator, List, Optional, Pattern, Tuple, Union
+from .handler import Handler, compile_route_pattern
+from .retention import RejectedRetention
+from .storage import ResponseCache
+from .archive import TrafficArchive
+from .metrics import InterceptorMetrics
+from .coalesce import CoalescePolicy, SingleFlight
+from .spool import SpoolPolicy
+from .compression import CompressionPolicy
 from .request_interceptor import MultiRequestInterceptor
-from .config import errors as ERR, logs as LOGS
+from .models import Response
+from playwright._impl._errors import TargetClosedError
+from .config import errors as ERR, logs as LOGS, parameters as PARAMS
 
 
 class NetworkInterceptor:
-    """Intercept and modify network requests for a Playwright page."""
+    """
+    Intercept and modify network requests for a Playwright page.
 
-    def __init__(self, page, *, logger: Optional[logging.Logger] = None) -> None:
+    Arguments of the public methods are type checked even in fast mode
+    (see typecheck.hot_path); the per-request path is not.
+    """
+
+    @beartype
+    def __init__(
+        self,
+        page,
+        *,
+        logger: Optional[logging.Logger] = None,
+        cache: Optional[ResponseCache] = None,
+        archive: Optional[TrafficArchive] = None,
+        executor: Optional[Executor] = None,
+        coalesce: CoalescePolicy = CoalescePolicy.SAFE(),
+        spool: SpoolPolicy = SpoolPolicy.OFF(),
+        compression: CompressionPolicy = CompressionPolicy.OFF(),
+    ) -> None:
         self.page = page
+        # Optional response cache; hits are fulfilled without touching the network
+        self.cache = cache
+        # Optional traffic archive: records every routed exchange or replays them offline
+        self.archive = archive
+        # Routing counters and stage histograms, accumulated across execute()/stream() calls
+        self.metrics = InterceptorMetrics()
+        # Default pool for synchronous modifiers, overridden by Execute(executor=...)
+        self.executor = executor
+        # Identical concurrent fetches share one upstream request
+        self.coalesce = coalesce
+        self._single_flight = SingleFlight()
+        # Large captured bodies are kept in memory-mapped temporary files
+        self.spool = spool
+        # Captured bodies waiting in execute() results are held compressed
+        self.compression = compression
+        # Object whose route()/unroute() installs the interception
+        self._router = page
         self._logger = logger or logging.getLogger(self.__class__.__name__)
 
-    async def execute(
-        self,
-        handlers: Union[Handler, List[Handler]],
-        timeout: float = 10.0,
-    ):
+        # Persistent session state: one installed route, swappable interceptor
+        self._session_pattern: Optional[Union[str, Pattern]] = None
+        self._armed: Optional[MultiRequestInterceptor] = None
+
+    def _base_url(self) -> str:
+        """Base URL for MAIN/SIDE watchers, fixed when interception starts"""
+        return self.page.url
+
+    def _request_base_url(self, request) -> Optional[str]:
+        """Per-request base URL, None to use the one from _base_url()"""
+        return None
+
+    def _request_page(self, request):
+        """Page a routed request belongs to"""
+        return self.page
+
+    def _prepare_handlers(self, handlers: Union[Handler, List[Handler]]) -> List[Handler]:
         if isinstance(handlers, Handler):
             handlers = [handlers]
 
@@ -31,15 +90,163 @@ class NetworkInterceptor:
                 else:
                     seen.add(slug)
             raise ValueError(ERR.DUPLICATE_HANDLER_SLUGS.format(duplicate_slugs=duplicate_slugs))
+        return handlers
 
-        start_time = time.time()
-        interceptor = MultiRequestInterceptor(self, handlers, self.page.url, start_time)
+    @asynccontextmanager
+    @beartype
+    async def session(self, pattern: Union[str, Pattern] = PARAMS.ROUTE_ALL):
+        """
+        Keeps one route installed for the whole block.
+
+        Inside a session execute() and stream() do not route/unroute; they arm
+        their MultiRequestInterceptor on the installed route with a single
+        assignment, so starting a new capture costs no driver round trip.
+        Requests arriving while nothing is armed are passed through.
+        """
+        if self._session_pattern is not None:
+            raise RuntimeError(ERR.SESSION_ALREADY_OPEN)
 
+        await self._router.route(pattern, self._dispatch)
+        self._session_pattern = pattern
         try:
-            await self.page.route("**/*", interceptor.handle_route)
-            return await interceptor.wait_for_results(timeout)
+            yield self
         finally:
+            self._session_pattern = None
+            self._armed = None
             try:
-                await self.page.unroute("**/*", interceptor.handle_route)
+                await self._router.unroute(pattern, self._dispatch)
             except Exception as e:
                 self._logger.warning(LOGS.UNROUTE_CLEANUP_ERROR_DIRECT_FETCH.format(error=e))
+
+    async def _dispatch(self, route) -> None:
+        """Session route handler, forwards to the currently armed interceptor"""
+        interceptor = self._armed
+        if interceptor is not None:
+            await interceptor.handle_route(route)
+            return
+        try:
+            await route.continue_()
+        except TargetClosedError:
+            self._logger.info(LOGS.TARGET_CLOSED_ERROR.format(url=route.request.url))
+
+    @asynccontextmanager
+    async def _attached(self, interceptor: MultiRequestInterceptor, handlers: List[Handler]):
+        """Connects interceptor to the page: armed on the session route or routed on its own"""
+        if self._session_pattern is not None:
+            if self._armed is not None:
+                raise RuntimeError(ERR.SESSION_BUSY)
+            self._armed = interceptor
+            try:
+                yield
+            finally:
+                if self._armed is interceptor:
+                    self._armed = None
+                await self._save_archive()
+            return
+
+        # Requests outside every handler's URL prefix are not routed to Python at all,
+        # unless the cache or the archive has to see them
+        if self.cache is None and self.archive is None:
+            pattern = compile_route_pattern(handlers)
+        else:
+            pattern = PARAMS.ROUTE_ALL
+        await self._router.route(pattern, interceptor.handle_route)
+        try:
+            yield
+        finally:
+            try:
+                await self._router.unroute(pattern, interceptor.handle_route)
+            except Exception as e:
+                self._logger.warning(LOGS.UNROUTE_CLEANUP_ERROR_DIRECT_FETCH.format(error=e))
+            await self._save_archive()
+
+    async def _save_archive(self) -> None:
+        if self.archive is not None and self.archive.recording:
+            await asyncio.get_running_loop().run_in_executor(self.archive.io_executor, self.archive.save)
+
+    @beartype
+    async def execute(
+        self,
+        handlers: Union[Handler, List[Handler]],
+        timeout: float = 10.0,
+        rejected: RejectedRetention = RejectedRetention.LAST(),
+    ):
+        handlers = self._prepare_handlers(handlers)
+
+        start_time = time.time()
+        interceptor = MultiRequestInterceptor(self, handlers, self._base_url(), start_time, rejected)
+
+        async with self._attached(interceptor, handlers):
+            return await interceptor.wait_for_results(timeout)
+
+    @beartype
+    async def stream(
+        self,
+        handlers: Union[Handler, List[Handler]],
+        timeout: Optional[float] = 10.0,
+        rejected: RejectedRetention = RejectedRetention.OFF(),
+        queue_size: int = PARAMS.DEFAULT_STREAM_QUEUE_SIZE,
+    ) -> AsyncIterator[Tuple[str, Response]]:
+        """
+        Yields (handler_slug, Response) as soon as each response is captured.
+
+        Captured responses are not accumulated: they pass through a bounded
+        queue, and while it is full the intercepted request waits for the
+        consumer. Iteration ends when every handler reaches its limits or
+        after `timeout` seconds (`None` for no deadline).
+        """
+        handlers = self._prepare_handlers(handlers)
+
+        start_time = time.time()
+        interceptor = MultiRequestInterceptor(
+            self, handlers, self._base_url(), start_time, rejected, sink=asyncio.Queue(maxsize=queue_size)
+        )
+
+        async with self._attached(interceptor, handlers):
+            async for captured in interceptor.iter_results(timeout):
+                yield captured
+
+
+class ContextInterceptor(NetworkInterceptor):
+    """
+    Intercept and modify network requests for every page of a BrowserContext.
+
+    One route on the context serves all pages, so handler matching, limits
+    and counters are shared; captured responses carry their `page`
+    (see HandlerSearchSuccess.by_page). MAIN/SIDE watchers compare against
+    the URL of the page each request belongs to.
+    """
+
+    @beartype
+    def __init__(
+        self,
+        context,
+        *,
+        logger: Optional[logging.Logger] = None,
+        cache: Optional[ResponseCache] = None,
+        archive: Optional[TrafficArchive] = None,
+        executor: Optional[Executor] = None,
+        coalesce: CoalescePolicy = CoalescePolicy.SAFE(),
+        spool: SpoolPolicy = SpoolPolicy.OFF(),
+        compression: CompressionPolicy = CompressionPolicy.OFF(),
+    ) -> None:
+        super().__init__(
+            None, logger=logger, cache=cache, archive=archive, executor=executor, coalesce=coalesce, spool=spool,
+            compression=compression,
+        )
+        self.context = context
+        self._router = context
+
+    def _base_url(self) -> str:
+        return ""
+
+    def _request_base_url(self, request) -> Optional[str]:
+        page = self._request_page(request)
+        return page.url if page is not None else ""
+
+    def _request_page(self, request):
+        try:
+            return request.frame.page
+        except Exception:
+            # Service worker requests have no frame
+            return None
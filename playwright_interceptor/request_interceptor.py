@@ -1,45 +1,82 @@
 import asyncio
 import time
-from beartype import beartype
-from beartype.typing import Union, List, Dict
-from .content_loader import parse_response_data
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor
+from .typecheck import hot_path
+from beartype.typing import AsyncIterator, Union, List, Dict, Mapping, Optional, Tuple
 from . import config as CFG
 from .models import Response, Request, HttpMethod
 from .handler import Handler, HandlerSearchFailed, HandlerSearchSuccess
+from .handler_index import HandlerIndex
 from .execute import ExecuteAction
+from .extract import Extract
+from .headers import Headers, response_headers
+from .metrics import RequestTimings
+from .retention import RejectedLog, RejectedRetention
+from .storage import StoredResponse, read_response
+from .spool import spool_body
+from .tools import parse_content_type, predict_content
 from playwright._impl._errors import TargetClosedError
 
 
-@beartype
-class MockResponse:
-    def __init__(self, status, headers, url, method):
-        self.status = status
-        self.headers = headers
-        self.url = url
-        self.request = type('MockRequest', (), {'method': method})()
+class _BudgetExceeded(Exception):
+    """A modifier ran past its Execute.modify_timeout"""
 
 
-@beartype
+@hot_path
 class MultiRequestInterceptor:
     """Class for intercepting HTTP requests with multiple handlers support"""
     
-    def __init__(self, api, handlers: List[Handler], base_url: str, start_time: float):
+    def __init__(
+        self,
+        api,
+        handlers: List[Handler],
+        base_url: str,
+        start_time: float,
+        rejected: RejectedRetention = RejectedRetention.LAST(),
+        sink: Optional[asyncio.Queue] = None,
+    ):
         self.api = api
         self.handlers = handlers
         self.base_url = base_url
         self.start_time = start_time
-        self.rejected_responses = []
+        self.index = HandlerIndex(handlers, base_url)
+        self.rejected = RejectedLog(rejected)
         self.loop = asyncio.get_running_loop()
         
         # Dictionary for storing results of each handler (using slug as key)
         self.handler_results: Dict[str, List[Response]] = {handler.slug: [] for handler in handlers}
+        self.handler_captures: Dict[str, int] = {handler.slug: 0 for handler in handlers}
         self.handler_errors: Dict[str, HandlerSearchFailed] = {}
         self.handler_modifications: Dict[str, int] = {handler.slug: 0 for handler in handlers}
+        # Quota slots claimed by in-flight requests, not yet committed to the counters above
+        self.reserved_captures: Dict[str, int] = {handler.slug: 0 for handler in handlers}
+        self.reserved_modifications: Dict[str, int] = {handler.slug: 0 for handler in handlers}
+        # Modifier budget breaches and handlers tripped to pass-through by them
+        self.handler_timeouts: Dict[str, int] = {handler.slug: 0 for handler in handlers}
+        self.tripped: set = set()
+        # Requests aborted by Execute.BLOCK handlers
+        self.handler_blocks: Dict[str, int] = {handler.slug: 0 for handler in handlers}
+
+        # Incremental completion state, updated only when a handler's quota changes:
+        # bits of handlers that can still take a request, and handlers not yet complete
+        self.live_mask = self.index.all_mask
+        self.pending = len(handlers)
+        self._completed: set = set()
+        for handler in handlers:
+            self._refresh(handler)
         
         # Future for completion
         self.completion_future = self.loop.create_future()
         self.timeout_task = None
 
+        # Streaming mode: captured responses go to the sink instead of handler_results
+        self.sink = sink
+        self.sink_closed = asyncio.Event()
+
+        # Без хендлеров захвата и модификации ждать нечего: только BLOCK завершается сразу
+        self._check_completion()
+
     def _response_to_body(self, response: Response) -> Union[str, bytes]:
         """Converts Response object back to body for Playwright"""
         if not response.content:
@@ -49,6 +86,8 @@ class MultiRequestInterceptor:
     
     async def handle_route(self, route):
         """Route handler for intercepting requests"""
+        timings = RequestTimings()
+        metrics = self.api.metrics
         request = route.request
         
         # Add explicit logging for each request
@@ -60,21 +99,68 @@ class MultiRequestInterceptor:
             # Continue request processing without interception
             await route.continue_()
             return
+
+        metrics.routed += 1
         
-        # Check if there are handlers with request_modify
+        # Pre-response decision: only handlers that can still match this request
+        # are worth a Python-side fetch, everything else stays in the browser
+        page_base_url = self.api._request_base_url(request)
+        full_url = urllib.parse.unquote(request.url)
+
+        # Блокировка: запрос обрывается до любого обращения к сети
+        block_mask = self.index.block_mask(full_url, request.method, request.resource_type, page_base_url)
+        if block_mask:
+            await self._block(route, block_mask, full_url)
+            return
+
+        candidate_mask = self.index.route_mask(
+            full_url, request.method, request.resource_type, page_base_url,
+            within=self.live_mask,
+        )
+        candidates = self.index.select(candidate_mask)
+        if not candidates:
+            try:
+                if self.api.archive is not None or (self.api.cache is not None and self.api.cache.accepts(request.method)):
+                    # Никто не перехватывает, но ответ нужно записать или взять из архива/кэша
+                    metrics.fetched_for_storage += 1
+                    try:
+                        fetch_started = time.perf_counter()
+                        response = await self._fetch(route, {})
+                        timings.fetch = time.perf_counter() - fetch_started
+                    except TargetClosedError:
+                        raise
+                    except Exception as e:
+                        self.api._logger.warning(f"Failed to execute request: {e}")
+                        metrics.passed_through += 1
+                        await route.continue_()
+                        return
+                    if response is None:
+                        await route.abort()
+                    else:
+                        await self._fulfill_unmodified(route, response, timings=timings)
+                        self._finish(timings)
+                    return
+
+                metrics.passed_through += 1
+                self.api._logger.debug(CFG.LOGS.PASS_THROUGH.format(
+                    method=request.method, url=request.url, resource_type=request.resource_type
+                ))
+                await route.continue_()
+            except TargetClosedError:
+                self.api._logger.info(CFG.LOGS.TARGET_CLOSED_ERROR.format(url=request.url))
+            return
+
+        # Check if there are handlers with request_modify; each one claims
+        # a modification slot here, before any await
         request_modifying_handlers = []
-        for handler in self.handlers:
-            if handler.slug in self.handler_errors:
-                continue
-            
-            # Check if handler hasn't completed all necessary actions
+        for handler in candidates:
             if handler.execute.action in (ExecuteAction.MODIFY, ExecuteAction.ALL):
-                if handler.execute.request_modify is not None:
-                    if handler.execute.max_modifications is None or self.handler_modifications[handler.slug] < handler.execute.max_modifications:
-                        request_modifying_handlers.append(handler)
+                if handler.execute.request_modify is not None and self._claim_modification(handler):
+                    request_modifying_handlers.append(handler)
 
         # Apply request modifications if there are suitable handlers
         modified_request = None
+        request_headers = None
         if request_modifying_handlers:
             # Create Request object from original request
             try:
@@ -92,55 +178,63 @@ class MultiRequestInterceptor:
             if hasattr(request, 'post_data') and request.post_data:
                 body = request.post_data
             
+            # Заголовки собираются один раз; Request получает копию, которая
+            # копируется по-настоящему только при первой записи
+            request_headers = Headers(request.headers)
             modified_request = Request(
                 url=request.url,
-                headers=dict(request.headers) if request.headers else {},
+                headers=request_headers.copy(),
                 params=params,
                 body=body,
                 method=method
             )
             
             # Apply modifications from all suitable handlers SEQUENTIALLY
-            for handler in request_modifying_handlers:
-                if handler.execute.request_modify is not None:
-                    try:
-                        if asyncio.iscoroutinefunction(handler.execute.request_modify):
-                            modified_request = await handler.execute.request_modify(modified_request)
-                        else:
-                            modified_request = handler.execute.request_modify(modified_request)
-                        
-                        if isinstance(modified_request, Request):
-                            self.handler_modifications[handler.slug] += 1
-                            self.api._logger.debug(f"Request modified by handler {handler.slug}: {modified_request.real_url}")
-                        else:
-                            self.api._logger.warning(f"Handler {handler.slug} request_modify returned non-Request object")
-                            modified_request = None
-                            break
-                    except Exception as e:
-                        self.api._logger.warning(f"Request modification failed for handler {handler.slug}: {e}")
-                        modified_request = None
-                        break
+            pending = list(request_modifying_handlers)
+            while pending:
+                handler = pending.pop(0)
+                modify_started = time.perf_counter()
+                try:
+                    modified_request = await self._call_modifier(handler, handler.execute.request_modify, modified_request)
+                    timings.request_modify[handler.slug] = time.perf_counter() - modify_started
+                except _BudgetExceeded:
+                    # Запрос остается таким, каким был до этого модификатора
+                    timings.request_modify[handler.slug] = time.perf_counter() - modify_started
+                    self._release_modification(handler)
+                    continue
+                except Exception as e:
+                    self.api._logger.warning(f"Request modification failed for handler {handler.slug}: {e}")
+                    modified_request = None
+                    self._release_modification(handler)
+                    break
+
+                if isinstance(modified_request, Request):
+                    self._commit_modification(handler)
+                    self.api._logger.debug(f"Request modified by handler {handler.slug}: {modified_request.real_url}")
+                else:
+                    self.api._logger.warning(f"Handler {handler.slug} request_modify returned non-Request object")
+                    modified_request = None
+                    self._release_modification(handler)
+                    break
+
+            # Слоты модификаторов, до которых очередь не дошла, освобождаем
+            for handler in pending:
+                self._release_modification(handler)
 
         response_time = time.time()
 
         # Выполняем запрос (оригинальный или модифицированный)
+        fetch_args = {}
+        if modified_request is not None:
+            fetch_args = dict(
+                url=modified_request.real_url,
+                method=modified_request.method.value,
+                headers=modified_request.headers,
+                post_data=modified_request.body if isinstance(modified_request.body, str) else None,
+            )
+        fetch_started = time.perf_counter()
         try:
-            if modified_request is not None:
-                # Формируем новые параметры для запроса
-                new_headers = modified_request.headers
-                new_url = modified_request.real_url
-                new_method = modified_request.method.value
-                
-                # Выполняем модифицированный запрос
-                response = await route.fetch(
-                    url=new_url,
-                    method=new_method,
-                    headers=new_headers,
-                    post_data=modified_request.body if isinstance(modified_request.body, str) else None
-                )
-            else:
-                # Выполняем оригинальный запрос
-                response = await route.fetch()
+            response = await self._fetch(route, fetch_args)
         except TargetClosedError:
             self.api._logger.info(CFG.LOGS.TARGET_CLOSED_ERROR.format(url=request.url))
             return
@@ -148,117 +242,492 @@ class MultiRequestInterceptor:
             self.api._logger.warning(f"Failed to execute request: {e}")
             # Fallback к оригинальному запросу
             try:
-                response = await route.fetch()
+                response = await self._fetch(route, {})
             except TargetClosedError:
                 self.api._logger.info(CFG.LOGS.TARGET_CLOSED_ERROR.format(url=request.url))
                 return
 
-        # Создаем мок-объект для проверки хандлеров
-        mock_response = MockResponse(response.status, response.headers, response.url, request.method)
+        timings.fetch = time.perf_counter() - fetch_started
 
-        # Сначала определяем какие хендлеры должны захватить этот ответ
-        capturing_handlers = []
-        for handler in self.handlers:
-            if handler.slug in self.handler_errors:
-                continue  # Пропускаем хандлеры, которые уже завершились с ошибкой
-
-            # Проверяем, не завершил ли хандлер все необходимые действия
-            done_return = True
-            done_modify = True
-            if handler.execute.action in (ExecuteAction.RETURN, ExecuteAction.ALL):
-                if handler.execute.max_responses is None or len(self.handler_results[handler.slug]) < handler.execute.max_responses:
-                    done_return = False
-            if handler.execute.action in (ExecuteAction.MODIFY, ExecuteAction.ALL):
-                if handler.execute.max_modifications is None or self.handler_modifications[handler.slug] < handler.execute.max_modifications:
-                    done_modify = False
+        if response is None:
+            # Воспроизведение архива: запроса нет в записи, в сеть не идем
+            await route.abort()
+            return
 
-            if done_return and done_modify:
-                continue  # Хендлер завершил все действия
-                
-            if handler.should_capture(mock_response, self.base_url):
-                capturing_handlers.append(handler)
+        # Сначала определяем какие хендлеры должны захватить этот ответ
+        headers = response_headers(response)
+        response_content_type = headers.get("content-type", "")
+        capture_mask = self.index.capture_mask(
+            urllib.parse.unquote(response.url), request.method, response_content_type,
+            within=candidate_mask, base_url=page_base_url
+        )
+        # Слоты захвата и модификации ответа занимаются синхронно, до чтения тела:
+        # если квоты уже разобраны другими запросами, тело не читается вовсе
+        returning, modifying = [], []
+        for handler in candidates:
+            if not capture_mask & self.index.bits[handler.slug]:
+                self.api._logger.debug(CFG.LOGS.HANDLER_REJECTED.format(handler_type=handler.expected_content, url=response.url, content_type=response_content_type or CFG.PARAMETERS.DEFAULT_CONTENT_TYPE))
+                continue
+            claimed = False
+            if handler.execute.action in (ExecuteAction.RETURN, ExecuteAction.ALL) and self._claim_capture(handler):
+                returning.append(handler)
+                claimed = True
+            if (
+                handler.execute.action in (ExecuteAction.MODIFY, ExecuteAction.ALL)
+                and handler.execute.response_modify is not None
+                and self._claim_modification(handler)
+            ):
+                modifying.append(handler)
+                claimed = True
+            if claimed:
                 self.api._logger.debug(CFG.LOGS.HANDLER_WILL_CAPTURE.format(handler_type=handler.expected_content, url=response.url))
-            else:
-                self.api._logger.debug(CFG.LOGS.HANDLER_REJECTED.format(handler_type=handler.expected_content, url=response.url, content_type=response.headers.get('content-type', CFG.PARAMETERS.DEFAULT_CONTENT_TYPE)))
         
         # Если есть хандлеры для захвата, обрабатываем ответ один раз
         modified_response = None
-        if capturing_handlers:
-            modified_response = await self._handle_captured_response(capturing_handlers, response, request, response_time)
+        if returning or modifying:
+            metrics.captured += 1
+            modified_response = await self._handle_captured_response(
+                returning, modifying, response, request, response_time, timings,
+                headers=headers, request_headers=request_headers,
+            )
+        elif capture_mask:
+            # Ответ подходит, но квоты хендлеров уже заняты: не захват и не отказ
+            pass
         else:
-            self._handle_rejected_response(response, request, response_time)
+            metrics.rejected += 1
+            self._handle_rejected_response(response, response_content_type, response_time)
             self.api._logger.debug(CFG.LOGS.ALL_HANDLERS_REJECTED.format(url=response.url))
 
         # Проверяем, завершены ли все хандлеры
         self._check_completion()
         
         # Возвращаем модифицированный ответ, если есть, иначе оригинальный
-        if modified_response is not None:
+        fulfill_started = time.perf_counter()
+        if modified_response is not None and modified_response.content_replaced:
             # Преобразуем модифицированный Response обратно в формат Playwright
+            body = self._response_to_body(modified_response)
             await route.fulfill(
                 status=modified_response.status,
                 headers=modified_response.response_headers,
-                body=self._response_to_body(modified_response)
+                body=body
+            )
+            metrics.bytes_out += len(body)
+            timings.fulfill = time.perf_counter() - fulfill_started
+        elif modified_response is not None:
+            # Тело не менялось: драйвер уже хранит его, передаем только статус и заголовки
+            await self._fulfill_unmodified(
+                route, response, status=modified_response.status, headers=modified_response.response_headers,
+                timings=timings,
             )
         else:
             # Возвращаем оригинальный ответ
-            await route.fulfill(response=response)
+            await self._fulfill_unmodified(route, response, timings=timings)
+        self._finish(timings)
+
+    async def _block(self, route, block_mask: int, full_url: str) -> None:
+        """Aborts a request matched by Execute.BLOCK handlers and counts what it would have cost"""
+        request = route.request
+        handlers = self.index.select(block_mask)
+        for handler in handlers:
+            self.handler_blocks[handler.slug] += 1
+
+        predicted = predict_content(full_url, request.resource_type)
+        metrics = self.api.metrics
+        metrics.blocked += 1
+        metrics.blocked_bytes += CFG.NETWORK.BLOCKED_BYTES_ESTIMATE.get(
+            predicted[0] if predicted else "", CFG.NETWORK.BLOCKED_BYTES_DEFAULT
+        )
+        self.api._logger.debug(CFG.LOGS.REQUEST_BLOCKED.format(
+            method=request.method, url=request.url, resource_type=request.resource_type,
+            slugs=[handler.slug for handler in handlers],
+        ))
+        try:
+            await route.abort(CFG.PARAMETERS.BLOCK_ERROR_CODE)
+        except TargetClosedError:
+            self.api._logger.info(CFG.LOGS.TARGET_CLOSED_ERROR.format(url=request.url))
+        self._check_completion()
+
+    def _finish(self, timings: RequestTimings) -> None:
+        """Closes the timings of a fulfilled request and adds them to the interceptor metrics"""
+        timings.finished = time.perf_counter()
+        self.api.metrics.fulfilled += 1
+        self.api.metrics.observe(timings)
+
+    async def _fetch(self, route, fetch_args: dict):
+        """
+        Fetches the request: from the archive when replaying, otherwise
+        upstream through the response cache, recording the result when
+        the archive is recording. Returns None for a request missing from
+        a replayed archive.
+        """
+        request = route.request
+        method = fetch_args.get("method", request.method)
+        url = fetch_args.get("url", request.url)
+        body = fetch_args["post_data"] if "post_data" in fetch_args else request.post_data_buffer
+
+        archive = self.api.archive
+        if archive is not None and archive.replaying:
+            response = await self._on_disk(archive.io_executor, archive.lookup, method, url, body)
+            if response is None:
+                self.api._logger.debug(CFG.LOGS.ARCHIVE_MISS.format(method=method, url=url))
+            return response
+
+        response = await self._fetch_shared(route, fetch_args, method, url, body)
+        if archive is not None:
+            response = await self._read(response)
+            await self._on_disk(
+                archive.io_executor, archive.record,
+                method, url, body, response.status, response.headers, await response.body(),
+            )
+        return response
+
+    async def _on_disk(self, executor, call, *args):
+        """Runs a cache/archive call that may do file I/O on its own thread, not on the event loop"""
+        if executor is None:
+            return call(*args)
+        return await self.loop.run_in_executor(executor, call, *args)
+
+    async def _read(self, response) -> StoredResponse:
+        """Reads a fetched body once; every later consumer gets it from the returned StoredResponse"""
+        if isinstance(response, StoredResponse):
+            return response
+        stored = await read_response(response)
+        self.api.metrics.bytes_in += len(await stored.body())
+        return stored
+
+    async def _fetch_shared(self, route, fetch_args: dict, method: str, url: str, body):
+        """Fetches upstream, joining an identical in-flight fetch when the coalesce policy allows it"""
+        policy = self.api.coalesce
+        if not policy.accepts(method):
+            return await self._fetch_upstream(route, fetch_args, method, url, body)
+
+        headers = fetch_args.get("headers") or route.request.headers
+        response, joined = await self.api._single_flight.fetch(
+            policy.key(method, url, body, headers),
+            lambda: self._fetch_upstream(route, fetch_args, method, url, body),
+            self._read,
+        )
+        if joined:
+            self.api.metrics.coalesced += 1
+        return response
+
+    async def _fetch_upstream(self, route, fetch_args: dict, method: str, url: str, body):
+        """Fetches the request upstream, through the response cache when one is configured"""
+        cache = self.api.cache
+        request = route.request
+        if cache is None or not cache.accepts(method):
+            return await route.fetch(**fetch_args)
+
+        key = cache.key(method, url, body)
+        entry = await self._on_disk(cache.io_executor, cache.lookup, key)
+        if entry is not None and entry.is_fresh():
+            cache.stats.hits += 1
+            return entry.to_response()
+
+        conditional = entry.conditional_headers() if entry is not None else {}
+        if conditional:
+            headers = dict(fetch_args.get("headers") or request.headers)
+            headers.update(conditional)
+            response = await route.fetch(**{**fetch_args, "headers": headers})
+            if response.status == 304:
+                await self._on_disk(cache.io_executor, cache.revalidate, key, entry, response.headers)
+                return entry.to_response()
+        else:
+            response = await route.fetch(**fetch_args)
+
+        cache.stats.misses += 1
+        if cache.storable(response.status, response.headers):
+            response = await self._read(response)
+            await self._on_disk(cache.io_executor, cache.store, key, url, response.status, response.headers, await response.body())
+        return response
+
+    async def _fulfill_unmodified(
+        self,
+        route,
+        response,
+        status: Optional[int] = None,
+        headers: Optional[Mapping] = None,
+        timings: Optional[RequestTimings] = None,
+    ):
+        """Fulfills route with the fetched body, without sending it back from Python when possible"""
+        fulfill_started = time.perf_counter()
+        if isinstance(response, StoredResponse) and response.origin is not None:
+            # Тело уже прочитано, но драйвер все еще хранит его: отдаем по ссылке
+            await route.fulfill(response=response.origin, status=status, headers=headers)
+        elif isinstance(response, StoredResponse):
+            body = await response.body()
+            await route.fulfill(
+                status=status if status is not None else response.status,
+                headers=headers if headers is not None else response.headers,
+                body=body,
+            )
+            self.api.metrics.bytes_out += len(body)
+        else:
+            await route.fulfill(response=response, status=status, headers=headers)
+        if timings is not None:
+            timings.fulfill = time.perf_counter() - fulfill_started
     
-    async def _handle_captured_response(self, handlers: List[Handler], response, request, response_time: float) -> Union[Response, None]:
-        """Processes captured response for multiple handlers and returns modified response"""
+    async def _call_modifier(self, handler: Handler, modifier, value):
+        """
+        Calls a request/response modifier. Coroutine functions are awaited on
+        the loop; sync ones run in the handler's (or the interceptor's)
+        executor when one is set, so other requests keep flowing meanwhile.
+
+        With Execute.modify_timeout the modifier works on a copy and raises
+        _BudgetExceeded when it runs out of time: awaited calls are
+        cancelled, sync calls on the loop are discarded after the fact.
+        """
+        budget = handler.execute.modify_timeout
+        if budget is not None:
+            # Модификатор получает копию, чтобы после отмены оригинал остался нетронутым
+            value = self._modifier_copy(value)
+
+        executor = handler.execute.executor if handler.execute.executor is not None else self.api.executor
+        call_in_process = False
+        if asyncio.iscoroutinefunction(modifier):
+            call = modifier(value)
+        elif executor is None:
+            started = time.perf_counter()
+            result = modifier(value)
+            if budget is not None and time.perf_counter() - started > budget:
+                self._budget_breached(handler, modifier, value)
+            return result
+        else:
+            call = self.loop.run_in_executor(executor, modifier, value)
+            call_in_process = isinstance(executor, ProcessPoolExecutor)
+
+        try:
+            result = await (asyncio.wait_for(call, budget) if budget is not None else call)
+        except asyncio.TimeoutError:
+            self._budget_breached(handler, modifier, value)
+        if call_in_process and isinstance(result, Response) and isinstance(value, Response):
+            # Ответ вернулся копией из другого процесса: если тело не менялось,
+            # возвращаем исходный объект, чтобы не отправлять его обратно в браузер
+            if result.content == value.content:
+                result.content = value.content
+                result._spool = value._spool
+            result._fetched = value._fetched
+            result.page = value.page
+        return result
+
+    @staticmethod
+    def _modifier_copy(value):
+        """Shallow copy of a Request/Response with its own header and param dicts and no parse memo"""
+        clone = object.__new__(type(value))
+        clone.__dict__.update(value.__dict__)
+        if isinstance(value, Response):
+            clone.request_headers = value.request_headers.copy()
+            clone.response_headers = value.response_headers.copy()
+            # Разобранное тело изменяемо: копия разбирает его заново
+            clone._parsed = None
+            clone._parsed_from = None
+        elif isinstance(value, Request):
+            clone.headers = value.headers.copy() if value.headers is not None else None
+            clone.params = dict(value.params) if value.params is not None else None
+        return clone
+
+    def _budget_breached(self, handler: Handler, modifier, value) -> None:
+        """Counts a budget breach, trips the handler after max_timeouts of them and raises _BudgetExceeded"""
+        slug = handler.slug
+        self.handler_timeouts[slug] += 1
+        count = self.handler_timeouts[slug]
+        self.api._logger.warning(CFG.LOGS.MODIFIER_TIMEOUT.format(
+            slug=slug,
+            kind="request" if isinstance(value, Request) else "response",
+            budget=handler.execute.modify_timeout,
+            count=count,
+            max_timeouts=handler.execute.max_timeouts,
+        ))
+        if count >= handler.execute.max_timeouts and slug not in self.tripped:
+            self.tripped.add(slug)
+            self._refresh(handler)
+            self.api._logger.warning(CFG.LOGS.HANDLER_TRIPPED.format(slug=slug, count=count))
+        raise _BudgetExceeded(slug)
+
+    def _handler_done(self, handler: Handler) -> bool:
+        """Checks whether handler has failed, was tripped or has every quota slot committed or claimed"""
+        return not self.live_mask & self.index.bits[handler.slug]
+
+    def _refresh(self, handler: Handler) -> None:
+        """
+        Recomputes one handler's state after its quota changed: its bit in
+        live_mask (a slot is still free) and whether it completed (every
+        limit committed, or the handler failed/was tripped). Execute.BLOCK
+        handlers are never live and never hold completion open.
+        """
+        slug = handler.slug
+        execute = handler.execute
+        available = False
+        complete = True
+        if slug not in self.handler_errors and slug not in self.tripped:
+            if execute.action in (ExecuteAction.RETURN, ExecuteAction.ALL):
+                limit = execute.max_responses
+                if limit is None or self.handler_captures[slug] + self.reserved_captures[slug] < limit:
+                    available = True
+                if limit is None or self.handler_captures[slug] < limit:
+                    complete = False
+            if execute.action in (ExecuteAction.MODIFY, ExecuteAction.ALL):
+                limit = execute.max_modifications
+                if limit is None or self.handler_modifications[slug] + self.reserved_modifications[slug] < limit:
+                    available = True
+                if limit is None or self.handler_modifications[slug] < limit:
+                    complete = False
+
+        bit = self.index.bits[slug]
+        self.live_mask = self.live_mask | bit if available else self.live_mask & ~bit
+        if complete and slug not in self._completed:
+            self._completed.add(slug)
+            self.pending -= 1
+
+    # Quota slots are claimed synchronously, so concurrent requests cannot overshoot the limits
+
+    def _claim_capture(self, handler: Handler) -> bool:
+        slug, limit = handler.slug, handler.execute.max_responses
+        if limit is not None and self.handler_captures[slug] + self.reserved_captures[slug] >= limit:
+            return False
+        self.reserved_captures[slug] += 1
+        if limit is not None:
+            self._refresh(handler)
+        return True
+
+    def _claim_modification(self, handler: Handler) -> bool:
+        slug, limit = handler.slug, handler.execute.max_modifications
+        if limit is not None and self.handler_modifications[slug] + self.reserved_modifications[slug] >= limit:
+            return False
+        self.reserved_modifications[slug] += 1
+        if limit is not None:
+            self._refresh(handler)
+        return True
+
+    def _release_capture(self, handler: Handler) -> None:
+        self.reserved_captures[handler.slug] -= 1
+        self._refresh(handler)
+
+    def _release_modification(self, handler: Handler) -> None:
+        self.reserved_modifications[handler.slug] -= 1
+        self._refresh(handler)
+
+    def _commit_capture(self, handler: Handler) -> None:
+        self.reserved_captures[handler.slug] -= 1
+        self.handler_captures[handler.slug] += 1
+        self._refresh(handler)
+
+    def _commit_modification(self, handler: Handler) -> None:
+        self.reserved_modifications[handler.slug] -= 1
+        self.handler_modifications[handler.slug] += 1
+        self._refresh(handler)
+
+    async def _handle_captured_response(
+        self,
+        returning: List[Handler],
+        modifying: List[Handler],
+        response,
+        request,
+        response_time: float,
+        timings: Optional[RequestTimings] = None,
+        headers: Optional[Headers] = None,
+        request_headers: Optional[Headers] = None,
+    ) -> Union[Response, None]:
+        """
+        Processes captured response for multiple handlers and returns modified response.
+
+        `returning` handlers hold a claimed capture slot, `modifying` ones a
+        claimed modification slot; every claim is committed or released here.
+        """
+        timings = timings if timings is not None else RequestTimings()
+        handlers = [handler for handler in self.handlers if handler in returning or handler in modifying]
+        pending_modify = list(modifying)
+        pending_return = list(returning)
         try:
             # Получаем тело ответа ТОЛЬКО ОДИН РАЗ
-            raw_data = await response.body()
+            body_started = time.perf_counter()
+            fetched = await self._read(response)
+            raw_data = await fetched.body()
+            timings.body = time.perf_counter() - body_started
+
+            # Большие тела уходят во временный файл и читаются через mmap
+            spooled = None
+            if self.api.spool.accepts(len(raw_data)):
+                spooled = await self.loop.run_in_executor(None, spool_body, raw_data, self.api.spool.directory)
+                raw_data = spooled.view
 
-            content_type = response.headers.get("content-type", "").lower()
-            parsed_data = parse_response_data(raw_data, content_type)
-            
             # Создаем Response объект 
             result = Response(
                 status=response.status,
-                request_headers=request.headers,
-                response_headers=response.headers,
-                content=raw_data,  # Сохраняем как bytes
+                request_headers=request_headers if request_headers is not None else Headers(request.headers),
+                response_headers=headers if headers is not None else response_headers(response),
+                content=raw_data,  # Сохраняем как bytes (или memoryview над файлом)
                 duration=response_time - self.start_time,
-                url=response.url
+                url=response.url,
+                page=self.api._request_page(request),
+                timings=timings,
             )
+            result._spool = spooled
 
             # Применяем response_modify ПОСЛЕДОВАТЕЛЬНО от всех хандлеров
             modified_result: Response = result
-            for handler in handlers:
-                if handler.execute.action in (ExecuteAction.MODIFY, ExecuteAction.ALL):
-                    if handler.execute.max_modifications is None or self.handler_modifications[handler.slug] < handler.execute.max_modifications:
-                        if handler.execute.response_modify is not None:
-                            try:
-                                if asyncio.iscoroutinefunction(handler.execute.response_modify):
-                                    modification_result = await handler.execute.response_modify(modified_result)
-                                else:
-                                    modification_result = handler.execute.response_modify(modified_result)
-                                
-                                if isinstance(modification_result, Response):
-                                    modified_result = modification_result
-                                    self.handler_modifications[handler.slug] += 1
-                                    self.api._logger.debug(f"Response modified by handler {handler.slug}")
-                                else:
-                                    # Если функция вернула что-то другое, используем предыдущий результат
-                                    self.api._logger.warning(f"Handler {handler.slug} response_modify returned non-Response object")
-                            except Exception as e:
-                                self.api._logger.warning(f"Response modification failed for handler {handler.slug}: {e}")
-                                # Продолжаем с предыдущим результатом
+            while pending_modify:
+                handler = pending_modify.pop(0)
+                modify_started = time.perf_counter()
+                try:
+                    modification_result = await self._call_modifier(handler, handler.execute.response_modify, modified_result)
+                    timings.response_modify[handler.slug] = time.perf_counter() - modify_started
+                except _BudgetExceeded:
+                    # Ответ остается таким, каким был до этого модификатора
+                    timings.response_modify[handler.slug] = time.perf_counter() - modify_started
+                    self._release_modification(handler)
+                    continue
+                except Exception as e:
+                    self.api._logger.warning(f"Response modification failed for handler {handler.slug}: {e}")
+                    # Продолжаем с предыдущим результатом
+                    self._release_modification(handler)
+                    continue
+
+                if isinstance(modification_result, Response):
+                    if modification_result is not modified_result:
+                        # Новый объект: сравниваем его тело с полученным от сервера
+                        modification_result._fetched = modified_result._fetched
+                        modification_result.timings = timings
+                    modified_result = modification_result
+                    self._commit_modification(handler)
+                    self.api._logger.debug(f"Response modified by handler {handler.slug}")
+                else:
+                    # Если функция вернула что-то другое, используем предыдущий результат
+                    self.api._logger.warning(f"Handler {handler.slug} response_modify returned non-Response object")
+                    self._release_modification(handler)
 
             # Сохраняем результаты для хандлеров, которые нуждаются в RETURN
-            for handler in handlers:
-                if handler.execute.action in (ExecuteAction.RETURN, ExecuteAction.ALL):
-                    self.handler_results[handler.slug].append(modified_result)
-                    max_resp_text = handler.execute.max_responses or CFG.LOGS.UNLIMITED_SIZE
-                    self.api._logger.info(
-                        CFG.LOGS.HANDLER_CAPTURED_RESPONSE.format(
-                            handler_type=handler.expected_content,
-                            url=response.url,
-                            current_count=len(self.handler_results[handler.slug]),
-                            max_responses=max_resp_text,
-                        )
+            extracted: Dict[Extract, Response] = {}
+            compressed: Dict[int, Response] = {}
+            while pending_return:
+                handler = pending_return[0]
+                captured = modified_result
+                extract = handler.execute.extract
+                if extract is not None:
+                    # Одинаковая выборка для нескольких хендлеров строится один раз
+                    if extract not in extracted:
+                        extracted[extract] = await self._extract(extract, modified_result)
+                    captured = extracted[extract]
+                if self.sink is None and self.api.compression.codec is not None:
+                    # До конца execute() результаты лежат сжатыми; один раз на объект
+                    if id(captured) not in compressed:
+                        compressed[id(captured)] = await self._compress(captured)
+                    captured = compressed[id(captured)]
+                pending_return.pop(0)
+                self._commit_capture(handler)
+                if self.sink is None:
+                    self.handler_results[handler.slug].append(captured)
+                max_resp_text = handler.execute.max_responses or CFG.LOGS.UNLIMITED_SIZE
+                self.api._logger.info(
+                    CFG.LOGS.HANDLER_CAPTURED_RESPONSE.format(
+                        handler_type=handler.expected_content,
+                        url=response.url,
+                        current_count=self.handler_captures[handler.slug],
+                        max_responses=max_resp_text,
                     )
+                )
+                if self.sink is not None:
+                    await self._deliver(handler.slug, captured)
 
             # ВАЖНО: Возвращаем модифицированный ответ
             return modified_result
@@ -273,53 +742,115 @@ class MultiRequestInterceptor:
             ))
             current_time = time.time()
             for handler in handlers:
-                self.handler_errors[handler.slug] = HandlerSearchFailed(
-                    rejected_responses=self.rejected_responses,
-                    duration=current_time - self.start_time,
-                    handler_slug=handler.slug,
-                )
+                self.handler_errors[handler.slug] = self._search_failed(handler, current_time - self.start_time)
+                self._refresh(handler)
+            # Незакоммиченные слоты этого запроса освобождаем
+            for handler in pending_return:
+                self._release_capture(handler)
+            for handler in pending_modify:
+                self._release_modification(handler)
             self._check_completion()
             return None
 
-    def _handle_rejected_response(self, response, request, response_time: float):
+    async def _extract(self, extract: Extract, response: Response) -> Response:
+        """Captured copy of response holding only what extract selects; the response itself on failure"""
+        try:
+            if self.api.executor is not None:
+                body = response.content
+                if isinstance(body, memoryview) and isinstance(self.api.executor, ProcessPoolExecutor):
+                    # memoryview does not pickle
+                    body = body.tobytes()
+                values = await self.loop.run_in_executor(self.api.executor, extract.apply, body)
+            else:
+                values = extract.apply(response.content)
+        except Exception as e:
+            self.api._logger.warning(CFG.LOGS.EXTRACT_FAILED.format(url=response.url, error=e))
+            return response
+
+        captured = Response(
+            status=response.status,
+            request_headers=response.request_headers,
+            response_headers=response.response_headers,
+            content=response.content if extract.keep_body else b"",
+            duration=response.duration,
+            url=response.url,
+            page=response.page,
+            timings=response.timings,
+            extracted=values,
+        )
+        if extract.keep_body:
+            captured._spool = response._spool
+        return captured
+
+    async def _compress(self, response: Response) -> Response:
+        """Copy of response holding its body compressed; the response itself if that does not pay off"""
+        policy = self.api.compression
+        if isinstance(response.content, memoryview) or not policy.accepts(len(response.content)):
+            return response
+        # The copy goes to results, the original is still fulfilled with the plain body
+        stored = object.__new__(Response)
+        stored.__dict__.update(response.__dict__)
+        # zlib and lzma release the GIL, so this runs beside the event loop
+        if not await self.loop.run_in_executor(None, stored.compress, policy):
+            return response
+        self.api.metrics.compressed_in += stored.content_size
+        self.api.metrics.compressed_out += len(stored._packed[1])
+        return stored
+
+    async def _deliver(self, slug: str, response: Response) -> None:
+        """Puts captured response into the stream sink, waiting while it is full (backpressure)"""
+        if self.sink_closed.is_set():
+            return
+        if not self.sink.full():
+            self.sink.put_nowait((slug, response))
+            return
+
+        put_task = asyncio.ensure_future(self.sink.put((slug, response)))
+        closed_task = asyncio.ensure_future(self.sink_closed.wait())
+        await asyncio.wait([put_task, closed_task], return_when=asyncio.FIRST_COMPLETED)
+        for task in (put_task, closed_task):
+            if not task.done():
+                task.cancel()
+
+    def _handle_rejected_response(self, response, content_type: str, response_time: float):
         """Processes rejected response"""
         # Сохраняем отклоненные ответы для анализа
-        duration = response_time - self.start_time
-        self.rejected_responses.append(Response(
+        self.rejected.add(
             status=response.status,
-            request_headers=request.headers,
-            response_headers=response.headers,
-            content=b"",  # Пустое содержимое для отклоненных ответов
+            url=response.url,
+            content_type=parse_content_type(content_type)["content_type"],
+            duration=response_time - self.start_time,
+        )
+
+    def _search_failed(self, handler: Handler, duration: float) -> HandlerSearchFailed:
+        """Builds failure result with a snapshot of retained rejected responses"""
+        return HandlerSearchFailed(
+            rejected_responses=self.rejected.records(),
             duration=duration,
-            url=response.url
-        ))
+            handler_slug=handler.slug,
+            rejected_count=self.rejected.count,
+            rejected_summary=self.rejected.summary(),
+            modify_timeouts=self.handler_timeouts[handler.slug],
+            tripped=handler.slug in self.tripped,
+        )
+
+    def _search_success(self, handler: Handler, duration: float) -> HandlerSearchSuccess:
+        return HandlerSearchSuccess(
+            responses=self.handler_results[handler.slug],
+            duration=duration,
+            handler_slug=handler.slug,
+            modify_timeouts=self.handler_timeouts[handler.slug],
+            tripped=handler.slug in self.tripped,
+            blocked=self.handler_blocks[handler.slug],
+        )
     
     def _check_completion(self):
-        """Checks if all handlers are completed"""
+        """Completes the search once every handler is complete (pending counter is kept by _refresh)"""
         if self.completion_future.done():
             return
-            
-        # Проверяем каждый хандлер
-        all_completed = True
-        for handler in self.handlers:
-            if handler.slug in self.handler_errors:
-                continue  # Уже завершен с ошибкой
-
-            done_return = True
-            done_modify = True
-            if handler.execute.action in (ExecuteAction.RETURN, ExecuteAction.ALL):
-                if handler.execute.max_responses is None or len(self.handler_results[handler.slug]) < handler.execute.max_responses:
-                    done_return = False
-            if handler.execute.action in (ExecuteAction.MODIFY, ExecuteAction.ALL):
-                if handler.execute.max_modifications is None or self.handler_modifications[handler.slug] < handler.execute.max_modifications:
-                    done_modify = False
 
-            if not (done_return and done_modify):
-                all_completed = False
-                break
-        
         # Если все хандлеры достигли своих лимитов, завершаем работу
-        if all_completed:
+        if self.pending == 0:
             self.api._logger.info(CFG.LOGS.ALL_HANDLERS_COMPLETED)
             self._complete_all_handlers()
     
@@ -335,24 +866,15 @@ class MultiRequestInterceptor:
         for handler in self.handlers:
             if handler.slug in self.handler_errors:
                 result.append(self.handler_errors[handler.slug])
-            elif self.handler_results[handler.slug] or (
+            elif self.handler_captures[handler.slug] or handler.execute.action == ExecuteAction.BLOCK or (
                 handler.execute.action == ExecuteAction.MODIFY and self.handler_modifications[handler.slug] > 0
             ):
                 duration = current_time - self.start_time
-                result.append(HandlerSearchSuccess(
-                    responses=self.handler_results[handler.slug],
-                    duration=duration,
-                    handler_slug=handler.slug
-                ))
+                result.append(self._search_success(handler, duration))
             else:
                 # Хандлер не получил ни одного ответа
                 duration = current_time - self.start_time
-                error = HandlerSearchFailed(
-                    rejected_responses=self.rejected_responses,
-                    duration=duration,
-                    handler_slug=handler.slug
-                )
-                result.append(error)
+                result.append(self._search_failed(handler, duration))
         
         self.completion_future.set_result(result)
     
@@ -379,24 +901,38 @@ class MultiRequestInterceptor:
             # Формируем результат с тем, что успели получить
             result = []
             for handler in self.handlers:
-                if self.handler_results[handler.slug] or (
+                if self.handler_captures[handler.slug] or handler.execute.action == ExecuteAction.BLOCK or (
                     handler.execute.action == ExecuteAction.MODIFY and self.handler_modifications[handler.slug] > 0
                 ):
-                    result.append(
-                        HandlerSearchSuccess(
-                            responses=self.handler_results[handler.slug],
-                            duration=duration,
-                            handler_slug=handler.slug,
-                        )
-                    )
+                    result.append(self._search_success(handler, duration))
                 else:
-                    result.append(
-                        HandlerSearchFailed(
-                            rejected_responses=self.rejected_responses,
-                            duration=duration,
-                            handler_slug=handler.slug,
-                        )
-                    )
+                    result.append(self._search_failed(handler, duration))
 
             return result
 
+    async def iter_results(self, timeout: Optional[float]) -> AsyncIterator[Tuple[str, Response]]:
+        """Yields (handler_slug, Response) from the sink until all handlers complete or timeout"""
+        self.timeout_task = asyncio.create_task(asyncio.sleep(timeout)) if timeout is not None else self.loop.create_future()
+        try:
+            while True:
+                get_task = asyncio.ensure_future(self.sink.get())
+                done, _pending = await asyncio.wait(
+                    [get_task, self.completion_future, self.timeout_task],
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if get_task in done:
+                    yield get_task.result()
+                    continue
+
+                get_task.cancel()
+                if self.timeout_task in done:
+                    duration = time.time() - self.start_time
+                    self.api._logger.warning(CFG.LOGS.TIMEOUT_REACHED.format(base_url=self.base_url, duration=duration))
+                break
+
+            # Отдаем то, что успело попасть в очередь
+            while not self.sink.empty():
+                yield self.sink.get_nowait()
+        finally:
+            self.timeout_task.cancel()
+            self.sink_closed.set()
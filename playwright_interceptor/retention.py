@@ -0,0 +1,109 @@
+from collections import Counter, deque
+from dataclasses import dataclass
+from enum import Enum, auto
+from urllib.parse import urlsplit
+from beartype import beartype
+from beartype.typing import List, Optional
+from . import config as CFG
+
+
+class RetentionMode(Enum):
+    """How rejected responses are kept during execute()."""
+
+    OFF = auto()
+    LAST = auto()
+    SUMMARY = auto()
+
+
+@beartype
+@dataclass(frozen=True)
+class RejectedRetention:
+    """Retention policy for responses that no handler captured"""
+
+    mode: RetentionMode
+    limit: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.mode == RetentionMode.LAST:
+            if self.limit is None or self.limit < 1:
+                raise ValueError("LAST retention requires a positive limit")
+        elif self.limit is not None:
+            raise ValueError(f"{self.mode.name} retention does not take a limit")
+
+    # Convenient constructors
+    @classmethod
+    def OFF(cls) -> "RejectedRetention":
+        return cls(mode=RetentionMode.OFF)
+
+    @classmethod
+    def LAST(cls, limit: int = CFG.PARAMETERS.DEFAULT_REJECTED_LIMIT) -> "RejectedRetention":
+        return cls(mode=RetentionMode.LAST, limit=limit)
+
+    @classmethod
+    def SUMMARY(cls) -> "RejectedRetention":
+        return cls(mode=RetentionMode.SUMMARY)
+
+
+class RejectedResponse:
+    """Compact record of a response that no handler captured"""
+
+    __slots__ = ("status", "url", "content_type", "duration")
+
+    def __init__(self, status: int, url: str, content_type: str, duration: float):
+        self.status = status
+        self.url = url
+        self.content_type = content_type
+        self.duration = duration
+
+    def __repr__(self) -> str:
+        return f"RejectedResponse(status={self.status}, content_type='{self.content_type}', duration={self.duration:.3f}, url='{self.url}')"
+
+
+class RejectedSummary:
+    """Aggregated counters of rejected responses"""
+
+    __slots__ = ("by_content_type", "by_host", "by_status")
+
+    def __init__(self) -> None:
+        self.by_content_type: Counter = Counter()
+        self.by_host: Counter = Counter()
+        self.by_status: Counter = Counter()
+
+    def copy(self) -> "RejectedSummary":
+        summary = RejectedSummary()
+        summary.by_content_type = self.by_content_type.copy()
+        summary.by_host = self.by_host.copy()
+        summary.by_status = self.by_status.copy()
+        return summary
+
+    def __repr__(self) -> str:
+        return f"RejectedSummary(content_types={dict(self.by_content_type)}, hosts={dict(self.by_host)}, statuses={dict(self.by_status)})"
+
+
+class RejectedLog:
+    """Storage for rejected responses that applies a RejectedRetention policy"""
+
+    __slots__ = ("retention", "count", "_records", "_summary")
+
+    def __init__(self, retention: RejectedRetention):
+        self.retention = retention
+        self.count = 0
+        self._records = deque(maxlen=retention.limit) if retention.mode == RetentionMode.LAST else None
+        self._summary = RejectedSummary() if retention.mode == RetentionMode.SUMMARY else None
+
+    def add(self, status: int, url: str, content_type: str, duration: float) -> None:
+        self.count += 1
+        if self._records is not None:
+            self._records.append(RejectedResponse(status, url, content_type, duration))
+        elif self._summary is not None:
+            self._summary.by_content_type[content_type or CFG.LOGS.UNKNOWN_HEADER_TYPE] += 1
+            self._summary.by_host[urlsplit(url).hostname or CFG.LOGS.UNKNOWN_HEADER_TYPE] += 1
+            self._summary.by_status[status] += 1
+
+    def records(self) -> List[RejectedResponse]:
+        """Snapshot of the retained records"""
+        return list(self._records) if self._records is not None else []
+
+    def summary(self) -> Optional[RejectedSummary]:
+        """Snapshot of the aggregated counters, if collected"""
+        return self._summary.copy() if self._summary is not None else None
@@ -0,0 +1,177 @@
+import atexit
+import io
+import logging
+import mmap
+import os
+import tempfile
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from beartype import beartype
+from beartype.typing import Optional, Union
+from . import config as CFG
+from .typecheck import hot_path
+
+
+@beartype
+@dataclass(frozen=True)
+class SpoolPolicy:
+    """
+    Which captured bodies are kept on disk instead of in memory.
+
+    Bodies of at least `threshold` bytes are written to a temporary file in
+    `directory` (the system temp dir by default) and exposed as a read-only
+    memoryview over a memory map of it, so their pages belong to the page
+    cache rather than to the process heap.
+    """
+
+    threshold: Optional[int] = None
+    directory: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.threshold is not None and self.threshold < 1:
+            raise ValueError(CFG.ERRORS.SPOOL_THRESHOLD_INVALID.format(threshold=self.threshold))
+
+    # Convenient constructors
+    @classmethod
+    def OFF(cls) -> "SpoolPolicy":
+        return cls()
+
+    @classmethod
+    def ABOVE(
+        cls,
+        threshold: int = CFG.PARAMETERS.SPOOL_THRESHOLD,
+        directory: Optional[Union[str, Path]] = None,
+    ) -> "SpoolPolicy":
+        return cls(threshold=threshold, directory=str(directory) if directory is not None else None)
+
+    @hot_path
+    def accepts(self, size: int) -> bool:
+        return self.threshold is not None and size >= self.threshold
+
+
+_logger = logging.getLogger(__name__)
+
+# Spool files whose removal failed, retried on every later release and at exit:
+# Windows refuses to delete a file while a mapping of it is still open
+_pending_unlink: set = set()
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as error:
+        if path not in _pending_unlink:
+            _logger.debug(CFG.LOGS.SPOOL_UNLINK_DEFERRED.format(path=path, error=error))
+            _pending_unlink.add(path)
+        return
+    _pending_unlink.discard(path)
+
+
+def _retry_pending() -> None:
+    for path in list(_pending_unlink):
+        _unlink(path)
+
+
+atexit.register(_retry_pending)
+
+
+def _release(mapping: mmap.mmap, path: Optional[str]) -> None:
+    """Closes a spool's mapping (unless views of it are still alive) and removes its file"""
+    try:
+        mapping.close()
+    except BufferError:
+        # Someone still holds a view; the mapping goes away with the last of them,
+        # and where the file cannot be removed before that, a later release retries
+        pass
+    if path is not None:
+        _unlink(path)
+    _retry_pending()
+
+
+class SpooledBody:
+    """
+    Body kept in a file and read through a read-only memory map.
+
+    `view` is a memoryview over the whole mapping. The temporary file of an
+    owning spool is removed once the spool is garbage collected; views taken
+    from it stay valid until they are released. Pickling reopens the same
+    file by path instead of copying the body.
+    """
+
+    __slots__ = ("path", "view", "__weakref__")
+
+    def __init__(self, path: str, owner: bool = False):
+        self.path = path
+        with open(path, "rb") as handle:
+            mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(mapping)
+        weakref.finalize(self, _release, mapping, path if owner else None)
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def __reduce__(self):
+        return SpooledBody, (self.path,)
+
+    def reader(self) -> "MemoryReader":
+        return MemoryReader(self.view)
+
+
+@beartype
+def spool_body(data: bytes, directory: Optional[str] = None) -> SpooledBody:
+    """Writes data to a new temporary file and maps it"""
+    _retry_pending()
+    descriptor, path = tempfile.mkstemp(prefix=CFG.PARAMETERS.SPOOL_PREFIX, dir=directory)
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(data)
+        return SpooledBody(path, owner=True)
+    except BaseException:
+        _unlink(path)
+        raise
+
+
+class MemoryReader(io.RawIOBase):
+    """Seekable read-only file object over a memoryview, reading without an upfront copy"""
+
+    def __init__(self, view: memoryview):
+        super().__init__()
+        self._view = view
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._position:self._position + len(buffer)]
+        size = len(chunk)
+        buffer[:size] = chunk
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if position < 0:
+            raise ValueError(f"negative seek position {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def getbuffer(self) -> memoryview:
+        """The underlying view, like BytesIO.getbuffer()"""
+        return self._view
@@ -0,0 +1,403 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from beartype import beartype
+from beartype.typing import Dict, Iterable, Optional, Union
+from . import config as CFG
+from .typecheck import hot_path
+from .models import HttpMethod
+
+
+class StoredResponse:
+    """
+    Response kept by the interceptor, usable wherever a Playwright APIResponse is expected.
+
+    `origin` is the APIResponse the body was read from, if any: the route can
+    still be fulfilled with it by reference, and its headers stay multi-valued.
+    """
+
+    __slots__ = ("url", "status", "headers", "_body", "origin")
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes, origin=None):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self._body = body
+        self.origin = origin
+
+    @property
+    def headers_array(self):
+        return self.origin.headers_array if self.origin is not None else None
+
+    async def body(self) -> bytes:
+        return self._body
+
+
+async def read_response(response) -> StoredResponse:
+    """Reads the body of a fetched response once; a StoredResponse is returned as it is"""
+    if isinstance(response, StoredResponse):
+        return response
+    return StoredResponse(response.url, response.status, response.headers, await response.body(), origin=response)
+
+
+class CacheEntry:
+    """Cached response with its freshness and validators"""
+
+    __slots__ = ("url", "status", "headers", "body", "stored_at", "expires_at", "etag", "last_modified")
+
+    def __init__(
+        self,
+        url: str,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes,
+        stored_at: float,
+        expires_at: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for a conditional revalidation request, empty if there are no validators"""
+        headers = {}
+        if self.etag is not None:
+            headers["if-none-match"] = self.etag
+        if self.last_modified is not None:
+            headers["if-modified-since"] = self.last_modified
+        return headers
+
+    def to_response(self) -> StoredResponse:
+        return StoredResponse(self.url, self.status, dict(self.headers), self.body)
+
+    def metadata(self) -> dict:
+        return {
+            "url": self.url,
+            "status": self.status,
+            "headers": self.headers,
+            "stored_at": self.stored_at,
+            "expires_at": self.expires_at,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+
+class CacheStats:
+    """Counters of ResponseCache activity"""
+
+    __slots__ = ("hits", "misses", "revalidated", "stores", "evictions", "disk_hits", "disk_evictions")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stores = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_evictions = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"CacheStats({', '.join(f'{k}={v}' for k, v in self.as_dict().items())})"
+
+
+def request_key(method: str, url: str, body: Union[str, bytes, None] = None) -> str:
+    """Stable key of a request: method, URL and a hash of the body"""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    body_hash = hashlib.sha256(body).hexdigest() if body else ""
+    return hashlib.sha256(f"{method}\n{url}\n{body_hash}".encode("utf-8")).hexdigest()
+
+
+def replayable_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """
+    Headers safe to fulfill a stored body with.
+
+    Playwright hands out decoded bodies, so framing headers of the original
+    transfer (Content-Encoding, Content-Length) no longer describe them.
+    """
+    return {
+        key: value for key, value in headers.items()
+        if key.lower() not in CFG.PARAMETERS.DECODED_BODY_HEADERS
+    }
+
+
+def _lower_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {key.lower(): value for key, value in headers.items()}
+
+
+def _cache_control(value: str) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, argument = part.partition("=")
+        directives[name.strip().lower()] = argument.strip().strip('"') if argument else None
+    return directives
+
+
+@beartype
+class ResponseCache:
+    """
+    Two-tier HTTP response cache for NetworkInterceptor.
+
+    Entries live in a memory LRU bounded by entry count and bytes; entries
+    evicted from memory are demoted to an optional on-disk tier bounded by
+    bytes. Freshness follows Cache-Control (max-age, no-store, no-cache) and
+    Expires; stale entries with an ETag or Last-Modified are revalidated with
+    a conditional request. Keys are method, URL and a hash of the request body.
+
+    With a disk tier, NetworkInterceptor runs lookup/store/revalidate on
+    `io_executor`, a single thread, so file I/O stays off the event loop and
+    the cache is never used from two threads at once.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CFG.PARAMETERS.CACHE_MAX_ENTRIES,
+        max_bytes: int = CFG.PARAMETERS.CACHE_MAX_BYTES,
+        directory: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = CFG.PARAMETERS.CACHE_MAX_DISK_BYTES,
+        methods: Iterable[HttpMethod] = (HttpMethod.GET, HttpMethod.HEAD),
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.methods = frozenset(method.value for method in methods)
+        self.stats = CacheStats()
+
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._memory_bytes = 0
+
+        self.directory = Path(directory) if directory is not None else None
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index()
+
+    @property
+    def io_executor(self) -> Optional[ThreadPoolExecutor]:
+        """Thread for calls that may touch the disk tier, None for a memory-only cache"""
+        if self.directory is not None and self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=CFG.PARAMETERS.CACHE_IO_THREAD)
+        return self._io_executor
+
+    # Keys and policy
+
+    @hot_path
+    def accepts(self, method: str) -> bool:
+        return method in self.methods
+
+    @staticmethod
+    @hot_path
+    def key(method: str, url: str, body: Union[str, bytes, None] = None) -> str:
+        return request_key(method, url, body)
+
+    def _expiry(self, status: int, headers: Dict[str, str], now: float) -> Optional[float]:
+        """Expiry time for a response, or None if it must not be stored"""
+        if status not in CFG.PARAMETERS.CACHEABLE_STATUSES:
+            return None
+        vary = headers.get("vary", "").strip().lower()
+        if vary and vary != "accept-encoding":
+            return None
+
+        directives = _cache_control(headers.get("cache-control", ""))
+        if "no-store" in directives:
+            return None
+        has_validators = "etag" in headers or "last-modified" in headers
+        if "no-cache" in directives:
+            return now if has_validators else None
+
+        max_age = directives.get("max-age")
+        if max_age is not None:
+            try:
+                return now + max(0, int(max_age))
+            except ValueError:
+                return now if has_validators else None
+        if "expires" in headers:
+            try:
+                return parsedate_to_datetime(headers["expires"]).timestamp()
+            except (TypeError, ValueError):
+                return now if has_validators else None
+        # No explicit freshness: keep only what can be revalidated
+        return now if has_validators else None
+
+    # Lookup and storage
+
+    @hot_path
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Returns entry (fresh or stale) from memory or disk, promoting disk hits"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            self.stats.disk_hits += 1
+            self._put_memory(key, entry)
+        return entry
+
+    @hot_path
+    def store(self, key: str, url: str, status: int, headers: Dict[str, str], body: bytes) -> bool:
+        """Stores a response if its headers allow it, returns whether it was stored"""
+        now = time.time()
+        lowered = _lower_headers(headers)
+        expires_at = self._expiry(status, lowered, now)
+        if expires_at is None:
+            return False
+
+        entry = CacheEntry(
+            url=url,
+            status=status,
+            headers=replayable_headers(headers),
+            body=body,
+            stored_at=now,
+            expires_at=expires_at,
+            etag=lowered.get("etag"),
+            last_modified=lowered.get("last-modified"),
+        )
+        self.stats.stores += 1
+        if key in self._disk:
+            # The disk copy holds an older body for this key
+            self._remove_disk(key)
+        self._put_memory(key, entry)
+        return True
+
+    @hot_path
+    def storable(self, status: int, headers: Dict[str, str]) -> bool:
+        """Whether a response would be stored, checked before reading its body"""
+        return self._expiry(status, _lower_headers(headers), time.time()) is not None
+
+    @hot_path
+    def revalidate(self, key: str, entry: CacheEntry, headers: Dict[str, str]) -> None:
+        """Refreshes entry headers and freshness after a 304 Not Modified"""
+        now = time.time()
+        # Headers sent with the 304 replace the stored ones of the same name
+        updated = replayable_headers(headers)
+        replaced = _lower_headers(updated)
+        entry.headers = {
+            **{key: value for key, value in entry.headers.items() if key.lower() not in replaced},
+            **updated,
+        }
+        merged = _lower_headers(entry.headers)
+        expires_at = self._expiry(entry.status, merged, now)
+        entry.stored_at = now
+        entry.expires_at = expires_at if expires_at is not None else now
+        entry.etag = merged.get("etag", entry.etag)
+        entry.last_modified = merged.get("last-modified", entry.last_modified)
+        self.stats.revalidated += 1
+        if key in self._disk:
+            self._write_disk(key, entry)
+
+    def clear(self) -> None:
+        for key in list(self._disk):
+            self._remove_disk(key)
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._memory) + sum(1 for key in self._disk if key not in self._memory)
+
+    # Memory tier
+
+    def _put_memory(self, key: str, entry: CacheEntry) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.size
+
+        if entry.size > self.max_bytes:
+            # Too large for memory, goes to disk directly
+            self._write_disk(key, entry)
+            return
+
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            old_key, old_entry = self._memory.popitem(last=False)
+            self._memory_bytes -= old_entry.size
+            self.stats.evictions += 1
+            self._write_disk(old_key, old_entry)
+
+    # Disk tier
+
+    def _paths(self, key: str):
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def _load_disk_index(self) -> None:
+        entries = []
+        for meta_path in self.directory.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            if body_path.exists():
+                stat = body_path.stat()
+                entries.append((stat.st_mtime, meta_path.stem, stat.st_size))
+        for _mtime, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _write_disk(self, key: str, entry: CacheEntry) -> None:
+        if self.directory is None or entry.size > self.max_disk_bytes:
+            return
+        meta_path, body_path = self._paths(key)
+        if key not in self._disk:
+            for path, data in ((body_path, entry.body), (meta_path, json.dumps(entry.metadata()).encode("utf-8"))):
+                tmp_path = path.with_suffix(path.suffix + ".tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+            self._disk[key] = entry.size
+            self._disk_bytes += entry.size
+        else:
+            # Body is content-stable per key, only metadata changes
+            meta_path.write_text(json.dumps(entry.metadata()), encoding="utf-8")
+            self._disk.move_to_end(key)
+
+        while self._disk_bytes > self.max_disk_bytes:
+            old_key = next(iter(self._disk))
+            self._remove_disk(old_key)
+            self.stats.disk_evictions += 1
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        if key not in self._disk:
+            return None
+        meta_path, body_path = self._paths(key)
+        try:
+            metadata = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            self._remove_disk(key)
+            return None
+        self._disk.move_to_end(key)
+        return CacheEntry(body=body, **metadata)
+
+    def _remove_disk(self, key: str) -> None:
+        size = self._disk.pop(key, 0)
+        self._disk_bytes -= size
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
@@ -1,7 +1,29 @@
-from beartype import beartype
+from urllib.parse import urlsplit
+from .typecheck import hot_path
+from . import config as CFG
 
 
-@beartype
+# URL extension -> ExpectedContentType name, from the content-type tables
+_EXTENSION_CONTENT = {
+    extension: name
+    for name, table in (
+        ('JSON', CFG.NETWORK.JSON_EXTENSIONS),
+        ('JS', CFG.NETWORK.JS_EXTENSIONS),
+        ('CSS', CFG.NETWORK.CSS_EXTENSIONS),
+        ('IMAGE', CFG.NETWORK.IMAGE_EXTENSIONS),
+        ('VIDEO', CFG.NETWORK.VIDEO_EXTENSIONS),
+        ('AUDIO', CFG.NETWORK.AUDIO_EXTENSIONS),
+        ('FONT', CFG.NETWORK.FONT_EXTENSIONS),
+        ('APPLICATION', CFG.NETWORK.APPLICATION_EXTENSIONS),
+        ('ARCHIVE', CFG.NETWORK.ARCHIVE_EXTENSIONS),
+        ('TEXT', CFG.NETWORK.TEXT_EXTENSIONS),
+    )
+    for extension in table.values()
+}
+_EXTENSION_CONTENT.update(CFG.NETWORK.URL_EXTENSION_ALIASES)
+
+
+@hot_path
 def parse_content_type(content_type: str) -> dict[str, str]:
     """
     Parses Content-Type string and returns dictionary with main type and parameters.
@@ -45,3 +67,26 @@ def parse_content_type(content_type: str) -> dict[str, str]:
     
     return result
 
+
+
+@hot_path
+def predict_content(url: str, resource_type: str) -> tuple[str, ...]:
+    """
+    Predicts the content of a request before it is sent.
+
+    Args:
+        url: Request URL
+        resource_type: Playwright resource type of the request
+
+    Returns:
+        ExpectedContentType names the response will almost certainly have:
+        the one of a known URL extension, otherwise the ones of the resource
+        type, otherwise an empty tuple (anything is possible)
+    """
+    path = urlsplit(url).path
+    segment = path.rsplit('/', 1)[-1]
+    if '.' in segment:
+        name = _EXTENSION_CONTENT.get('.' + segment.rsplit('.', 1)[-1].lower())
+        if name is not None:
+            return (name,)
+    return CFG.NETWORK.RESOURCE_TYPE_BLOCK_CONTENT.get(resource_type, ())
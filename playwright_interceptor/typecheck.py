@@ -0,0 +1,24 @@
+import os
+import typing
+from beartype import beartype
+from . import config as CFG
+
+
+# Read once at import: set PLAYWRIGHT_INTERCEPTOR_FAST=1 before importing the package
+FAST_MODE = os.environ.get(CFG.PARAMETERS.FAST_MODE_ENV, "").strip().lower() in CFG.PARAMETERS.FAST_MODE_VALUES
+
+
+def hot_path(obj):
+    """
+    @beartype for classes and functions that run for every routed request.
+
+    In fast mode they are left unchecked: classes and functions are returned
+    as they are, and methods are marked no_type_check so that the @beartype
+    of their (public API) class skips them. Construction of Handler, Execute
+    and the policies, and the execute()/stream() arguments, stay checked.
+    """
+    if not FAST_MODE:
+        return beartype(obj)
+    if isinstance(obj, type):
+        return obj
+    return typing.no_type_check(obj)
@@ -109,6 +109,19 @@ class TestCSRFRemoval:
         assert isinstance(result, str)  # Should return as string
         assert result == input_data
     
+    def test_large_prefixed_payload(self):
+        """Test large body behind known and unknown prefixes"""
+        payload = {"items": [{"id": i, "price": i * 1.5} for i in range(20000)]}
+        body = json.dumps(payload)
+        for prefix in (")]}'\n", "while(1);", "{x" * 1000):
+            assert parse_response_data(prefix + body, "application/json") == payload
+
+    def test_deeply_nested_prefixed_body(self):
+        """Test that nesting beyond the recursion limit falls back to text"""
+        for input_data in ("x" + "[" * 3000, ")]}'\n" + "[" * 3000, "[" * 3000):
+            assert parse_response_data(input_data, "application/json") == input_data
+            assert parse_response_data(input_data.encode(), "application/json") == input_data
+
     def test_no_json_found(self):
         """Test when JSON is not found in response"""
         input_data = 'just some text without json'
@@ -0,0 +1,98 @@
+"""
+Tests for single-flight coalescing of identical concurrent fetches
+"""
+import asyncio
+from playwright_interceptor import CoalescePolicy, HttpMethod
+from playwright_interceptor.coalesce import SingleFlight
+
+
+class _Upstream:
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise ConnectionError("upstream down")
+        return _APIResponse()
+
+
+class _APIResponse:
+    url = "https://a.test/config"
+    status = 200
+    headers = {"content-type": "application/json", "content-encoding": "gzip"}
+
+    async def body(self):
+        return b'{"a": 1}'
+
+
+def test_policy_key_and_methods():
+    policy = CoalescePolicy.SAFE()
+    assert policy.accepts("GET") and policy.accepts("HEAD")
+    assert not policy.accepts("POST")
+    assert not CoalescePolicy.OFF().accepts("GET")
+    assert CoalescePolicy(methods=frozenset({HttpMethod.POST})).accepts("POST")
+
+    key = policy.key("GET", "https://a.test/", None, {"Accept": "*/*"})
+    assert key == policy.key("GET", "https://a.test/", None, {"Accept": "text/html"})
+    assert key != policy.key("GET", "https://a.test/", None, {"Range": "bytes=0-99"})
+    assert key != policy.key("GET", "https://a.test/", None, {"Authorization": "Bearer x"})
+
+
+def test_concurrent_fetches_share_one_request():
+    async def scenario():
+        flight, upstream = SingleFlight(), _Upstream()
+        results = await asyncio.gather(*(flight.fetch("k", upstream.fetch) for _ in range(4)))
+        return flight, upstream, results
+
+    flight, upstream, results = asyncio.run(scenario())
+    assert upstream.calls == 1
+    assert sum(joined for _response, joined in results) == 3 and len(flight) == 0
+
+    (leader, joined), *followers = results
+    # The leader gets the body it read for the followers, still tied to its own response
+    assert not joined and isinstance(leader.origin, _APIResponse)
+    assert asyncio.run(leader.body()) == b'{"a": 1}'
+    for shared, joined in followers:
+        assert joined
+        assert asyncio.run(shared.body()) == b'{"a": 1}'
+        assert shared.headers == {"content-type": "application/json"}
+
+
+def test_failed_fetch_reaches_followers():
+    async def scenario():
+        flight, upstream = SingleFlight(), _Upstream(fail=True)
+        return await asyncio.gather(*(flight.fetch("k", upstream.fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_sequential_fetches_are_not_coalesced():
+    async def scenario():
+        flight, upstream = SingleFlight(), _Upstream()
+        await flight.fetch("k", upstream.fetch)
+        await flight.fetch("k", upstream.fetch)
+        return upstream
+
+    assert asyncio.run(scenario()).calls == 2
+
+
+def test_cancelled_leader_lets_followers_fetch():
+    async def scenario():
+        flight, upstream = SingleFlight(), _Upstream()
+        leader = asyncio.create_task(flight.fetch("k", upstream.fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.fetch("k", upstream.fetch)) for _ in range(2)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.wait_for(asyncio.gather(*followers), 1.0)
+        return leader, upstream, results
+
+    leader, upstream, results = asyncio.run(scenario())
+    assert leader.cancelled()
+    # One follower became the new leader, the other joined it
+    assert upstream.calls == 2
+    assert sorted(joined for _response, joined in results) == [False, True]
@@ -0,0 +1,73 @@
+"""
+Tests for holding captured bodies compressed in memory
+"""
+import json
+import os
+import pickle
+import pytest
+from playwright_interceptor import CompressionPolicy, Response
+
+
+BODY = json.dumps({"items": [{"id": i, "name": "Product name", "price": 9.99} for i in range(500)]}).encode()
+
+
+def _response(content: bytes = BODY) -> Response:
+    return Response(
+        status=200,
+        request_headers={},
+        response_headers={"Content-Type": "application/json"},
+        content=content,
+    )
+
+
+@pytest.mark.parametrize("policy", [CompressionPolicy.ZLIB(), CompressionPolicy.LZMA()])
+def test_body_decompressed_once_on_first_access(policy):
+    response = _response()
+    assert response.compress(policy)
+    assert response.compressed and not response.content_replaced
+    assert response.content_size == len(BODY)
+    assert len(response._packed[1]) * 5 < len(BODY)
+
+    parsed = response.content_parse()
+    assert len(parsed["items"]) == 500
+    assert not response.compressed and not response.content_replaced
+    # Decompressed body is cached
+    assert response.content is response.content
+    assert response.content_parse() is parsed
+
+
+def test_replaced_body_stays_replaced():
+    response = _response()
+    response.content = BODY.replace(b"Product", b"Item")
+    assert response.compress(CompressionPolicy.ZLIB())
+    assert response.content_replaced
+    assert b"Item" in response.content and response.content_replaced
+
+
+def test_compressed_body_pickles_compressed():
+    response = _response()
+    response.compress(CompressionPolicy.ZLIB(level=9))
+    assert len(pickle.dumps(response)) < len(BODY)
+
+    copy = pickle.loads(pickle.dumps(response))
+    assert copy.compressed and not copy.content_replaced
+    assert copy.content == BODY and not copy.content_replaced
+
+
+def test_bodies_left_plain():
+    # Below the threshold, incompressible, or compression off
+    assert not _response(b'{"a": 1}').compress(CompressionPolicy.ZLIB())
+    noise = _response(os.urandom(64 * 1024))
+    assert not noise.compress(CompressionPolicy.ZLIB()) and not noise.compressed
+    assert not _response().compress(CompressionPolicy.OFF())
+
+
+def test_compression_policy_validation():
+    assert CompressionPolicy.ZLIB(threshold=10).accepts(10)
+    assert not CompressionPolicy.OFF().accepts(10 ** 9)
+    with pytest.raises(ValueError, match="codec"):
+        CompressionPolicy(codec="brotli")
+    with pytest.raises(ValueError, match="between 0 and 9"):
+        CompressionPolicy.LZMA(level=10)
+    with pytest.raises(ValueError, match="negative"):
+        CompressionPolicy.ZLIB(threshold=-1)
@@ -0,0 +1,73 @@
+"""
+Tests for partial JSON extraction of captured bodies
+"""
+import json
+import pytest
+from playwright_interceptor import Execute, ExecuteAction, Extract
+from playwright_interceptor import extract as extract_module
+
+
+DOCUMENT = {
+    "items": [{"id": i, "price": i * 1.5, "tags": ["new", {"rank": i}]} for i in range(3)],
+    "meta": {"total": 3, "page": {"number": 1}},
+}
+PATHS = (
+    "$.items[*].price",
+    "$.items[1]",
+    "$.meta.*",
+    "$['meta'].page.number",
+    "$.items[*].tags[1].rank",
+    "$.missing",
+)
+
+
+def test_extract_selects_values_in_document_order():
+    body = (")]}'\n" + json.dumps(DOCUMENT)).encode()
+    extracted = Extract.PATHS(*PATHS).apply(body)
+
+    assert extracted["$.items[*].price"] == [0.0, 1.5, 3.0]
+    assert extracted["$.items[1]"] == [DOCUMENT["items"][1]]
+    assert extracted["$.meta.*"] == [3, {"number": 1}]
+    assert extracted["$['meta'].page.number"] == [1]
+    assert extracted["$.items[*].tags[1].rank"] == [0, 1, 2]
+    assert extracted["$.missing"] == []
+
+
+def test_streaming_and_whole_parse_agree(monkeypatch):
+    """ijson is optional: without it the same selection comes from a full parse"""
+    body = json.dumps(DOCUMENT).encode() + b"\n<!-- trailing -->"
+    extract = Extract.PATHS(*PATHS, "$")
+    streamed = extract.apply(body)
+
+    prefixed = [
+        # Non-ASCII prefix: byte and character offsets differ
+        "🔒SECURITY🔒".encode() + json.dumps(DOCUMENT).encode(),
+        b"while(1);" + json.dumps(DOCUMENT).encode(),
+        # A stray brace before the document
+        b"{x" + json.dumps(DOCUMENT).encode(),
+    ]
+    for prefixed_body in prefixed:
+        assert extract.apply(prefixed_body) == streamed
+
+    monkeypatch.setattr(extract_module, "ijson", None)
+    assert extract.apply(body) == streamed
+    for prefixed_body in prefixed:
+        assert extract.apply(prefixed_body) == streamed
+    with pytest.raises(ValueError, match="not a JSON document"):
+        extract.apply(b"no json here")
+
+
+def test_extract_validation():
+    for path in ("items", "$..items", "$.items[", "$[name]"):
+        with pytest.raises(ValueError, match="Invalid JSON path"):
+            Extract.PATHS(path)
+    with pytest.raises(ValueError, match="at least one path"):
+        Extract.PATHS()
+
+    extract = Extract.PATHS("$.items[*].id")
+    assert Execute.RETURN(5, extract=extract).extract is extract
+    assert Execute.ALL(response_modify=lambda r: r, extract=extract).extract is extract
+    with pytest.raises(ValueError, match="extract"):
+        Execute(action=ExecuteAction.MODIFY, response_modify=lambda r: r, max_modifications=1, extract=extract)
+    with pytest.raises(ValueError, match="extract"):
+        Execute(action=ExecuteAction.BLOCK, extract=extract)
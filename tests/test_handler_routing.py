@@ -0,0 +1,122 @@
+"""
+Tests for compiling handler filters into route patterns and the handler index
+"""
+import itertools
+import re
+import urllib.parse
+from types import SimpleNamespace
+import pytest
+from playwright_interceptor import Handler, ExpectedContentType, HttpMethod, Execute
+from playwright_interceptor.handler import compile_route_pattern
+from playwright_interceptor.handler_index import HandlerIndex
+
+
+def test_global_route_when_any_handler_has_no_prefix():
+    handlers = [
+        Handler.ALL(startswith_url="https://api.example.com", slug="api"),
+        Handler.ALL(slug="all"),
+    ]
+    assert compile_route_pattern(handlers) == "**/*"
+
+
+def test_prefixes_compile_into_single_regex():
+    handlers = [
+        Handler.ALL(startswith_url="https://api.example.com/v1", slug="v1"),
+        Handler.ALL(startswith_url="https://api.example.com", slug="api"),
+        Handler.ALL(startswith_url="https://static.example.com/data", slug="data"),
+    ]
+    pattern = compile_route_pattern(handlers)
+    assert isinstance(pattern, re.Pattern)
+
+    assert pattern.search("https://api.example.com/v2/items")
+    assert pattern.search("https://static.example.com/data/1.json")
+    assert not pattern.search("https://static.example.com/img.png")
+    assert not pattern.search("https://cdn.example.com/api.example.com")
+
+
+def test_prefix_matches_percent_encoded_urls():
+    """Handlers compare against the unquoted URL, so routing must too"""
+    prefix = "https://example.com/каталог"
+    pattern = compile_route_pattern([Handler.ALL(startswith_url=prefix)])
+
+    encoded = "https://example.com/" + urllib.parse.quote("каталог") + "/1"
+    assert pattern.search(encoded)
+    assert not pattern.search("https://example.com/catalog")
+
+
+
+BASE_URL = "https://shop.example.com/catalog"
+
+INDEX_HANDLERS = [
+    Handler.ALL(slug="any"),
+    Handler.ALL(expected_content=ExpectedContentType.JSON, startswith_url="https://api.example.com", slug="api_json"),
+    Handler.ALL(expected_content=ExpectedContentType.JSON, startswith_url="https://api.example.com/v2", method=HttpMethod.POST, slug="api_v2_post"),
+    Handler.MAIN(slug="main"),
+    Handler.SIDE(expected_content=ExpectedContentType.IMAGE, slug="side_images"),
+    Handler.ALL(expected_content=ExpectedContentType.CSS, method=HttpMethod.GET, slug="css"),
+    Handler.NONE(slug="none"),
+]
+
+URLS = [
+    "https://shop.example.com/catalog",
+    "https://shop.example.com/",
+    "https://shop.example.com/img/logo.png",
+    "https://api.example.com/v1/items",
+    "https://api.example.com/v2/cart",
+    "https://%61pi.example.com/v2/cart",
+]
+METHODS = ["GET", "POST"]
+CONTENT_TYPES = ["application/json; charset=utf-8", "text/html", "image/png", "text/css", ""]
+RESOURCE_TYPES = ["document", "image", "stylesheet", "fetch"]
+
+
+def _expected(mask_handlers):
+    return [handler.slug for handler in mask_handlers]
+
+
+def test_index_route_mask_agrees_with_should_route():
+    index = HandlerIndex(INDEX_HANDLERS, BASE_URL)
+    for url, method, resource_type in itertools.product(URLS, METHODS, RESOURCE_TYPES):
+        request = SimpleNamespace(url=url, method=method, resource_type=resource_type)
+        mask = index.route_mask(urllib.parse.unquote(url), method, resource_type)
+        expected = [h.slug for h in INDEX_HANDLERS if h.should_route(request, BASE_URL)]
+        assert _expected(index.select(mask)) == expected, (url, method, resource_type)
+
+
+def test_index_capture_mask_agrees_with_should_capture():
+    index = HandlerIndex(INDEX_HANDLERS, BASE_URL)
+    for url, method, content_type in itertools.product(URLS, METHODS, CONTENT_TYPES):
+        response = SimpleNamespace(
+            url=url,
+            headers={"content-type": content_type},
+            request=SimpleNamespace(method=method),
+        )
+        mask = index.capture_mask(urllib.parse.unquote(url), method, content_type)
+        expected = [h.slug for h in INDEX_HANDLERS if h.should_capture(response, BASE_URL)]
+        assert _expected(index.select(mask)) == expected, (url, method, content_type)
+
+
+BLOCK_HANDLERS = [
+    Handler.ALL(expected_content=ExpectedContentType.IMAGE, execute=Execute.BLOCK(), slug="images"),
+    Handler.SIDE(expected_content=ExpectedContentType.CSS, method=HttpMethod.GET, execute=Execute.BLOCK(), slug="side_css"),
+    Handler.ALL(startswith_url="https://api.example.com/v2", execute=Execute.BLOCK(), slug="v2"),
+    Handler.ALL(expected_content=ExpectedContentType.JSON, startswith_url="https://api.example.com", slug="api_json"),
+]
+
+
+def test_index_block_mask_agrees_with_should_block():
+    """Blocking needs certain content: URL extension first, then resource type"""
+    index = HandlerIndex(BLOCK_HANDLERS, BASE_URL)
+    for url, method, resource_type in itertools.product(URLS, METHODS, RESOURCE_TYPES):
+        request = SimpleNamespace(url=url, method=method, resource_type=resource_type)
+        mask = index.block_mask(urllib.parse.unquote(url), method, resource_type)
+        expected = [h.slug for h in BLOCK_HANDLERS if h.should_block(request, BASE_URL)]
+        assert _expected(index.select(mask)) == expected, (url, method, resource_type)
+
+    assert _expected(index.select(index.block_mask("https://shop.example.com/img/logo.png", "GET", "fetch"))) == ["images"]
+    assert index.block_mask("https://shop.example.com/api/items", "GET", "fetch") == 0
+    assert index.route_mask("https://api.example.com/v2/cart", "GET", "fetch", within=0) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
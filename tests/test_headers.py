@@ -0,0 +1,68 @@
+"""
+Tests for the case-insensitive, copy-on-write Headers container
+"""
+import copy
+import pickle
+from playwright_interceptor import Headers, Request, Response
+
+
+def test_case_insensitive_multi_values():
+    headers = Headers.from_array([
+        {"name": "Content-Type", "value": "application/json"},
+        {"name": "Set-Cookie", "value": "a=1"},
+        {"name": "set-cookie", "value": "b=2"},
+        {"name": "Vary", "value": "Accept"},
+        {"name": "vary", "value": "Origin"},
+    ])
+    assert len(headers) == 3
+    assert list(headers) == ["Content-Type", "Set-Cookie", "Vary"]
+    assert headers["CONTENT-TYPE"] == "application/json" and "content-type" in headers
+    assert headers.get_all("set-cookie") == ["a=1", "b=2"]
+    # Joined the way Playwright joins them
+    assert headers["Set-Cookie"] == "a=1\nb=2" and headers["vary"] == "Accept, Origin"
+    assert headers.get("missing") is None and headers.get_all("missing") == []
+
+    headers["VARY"] = "*"
+    headers.add("set-cookie", "c=3")
+    del headers["content-type"]
+    assert dict(headers) == {"Set-Cookie": "a=1\nb=2\nc=3", "VARY": "*"}
+    assert headers.multi_items() == [("Set-Cookie", "a=1"), ("Set-Cookie", "b=2"), ("Set-Cookie", "c=3"), ("VARY", "*")]
+
+
+def test_playwright_dict_form_keeps_cookies_apart():
+    headers = Headers({"set-cookie": "a=1\nb=2", "accept": "*/*"})
+    assert headers.get_all("Set-Cookie") == ["a=1", "b=2"]
+    assert headers == {"set-cookie": "a=1\nb=2", "accept": "*/*"}
+
+
+def test_copy_on_write():
+    original = Headers({"Accept": "*/*"})
+    clone = original.copy()
+    assert clone._fields is original._fields
+
+    clone["X-Token"] = "t"
+    assert "x-token" not in original and clone["x-token"] == "t"
+    original["Accept"] = "text/html"
+    assert clone["accept"] == "*/*"
+
+    shallow = copy.copy(clone)
+    shallow.add("accept", "text/html")
+    assert clone.get_all("accept") == ["*/*"]
+
+    restored = pickle.loads(pickle.dumps(clone))
+    assert restored == clone and isinstance(restored, Headers)
+
+
+def test_models_hold_headers():
+    response = Response(status=200, request_headers={}, response_headers={"CONTENT-TYPE": "application/json"}, content=b'{"a": 1}')
+    assert isinstance(response.response_headers, Headers)
+    assert response.content_parse() == {"a": 1}
+    assert "content_type='application/json'" in str(response)
+
+    # A plain dict assigned later still works
+    response.response_headers = {"Content-Type": "text/plain"}
+    assert response.content_parse() == '{"a": 1}'
+
+    request = Request(url="https://example.com", headers={"Authorization": "Bearer token"})
+    assert request.headers["authorization"] == "Bearer token"
+    assert isinstance(Request(url="https://example.com").headers, Headers)
@@ -0,0 +1,57 @@
+"""
+Tests for request timings and interceptor metrics
+"""
+from playwright_interceptor import Histogram, InterceptorMetrics, RequestTimings, Response
+
+
+def test_histogram_percentiles():
+    histogram = Histogram(bounds=(0.001, 0.01, 0.1))
+    for value in [0.0005] * 98 + [0.05, 2.0]:
+        histogram.observe(value)
+
+    assert histogram.count == 100
+    assert histogram.percentile(0.5) == 0.001
+    assert histogram.percentile(0.99) == 0.1
+    assert histogram.percentile(1.0) == 2.0
+    assert histogram.max == 2.0
+    assert Histogram().percentile(0.5) is None
+
+
+def test_timings_total_and_overhead():
+    timings = RequestTimings(started=10.0)
+    timings.fetch = 0.25
+    timings.response_modify["slug"] = 0.05
+    assert timings.total is None
+
+    timings.finished = 10.5
+    assert timings.total == 0.5
+    assert timings.overhead == 0.25
+
+
+def test_metrics_aggregate_per_slug():
+    metrics = InterceptorMetrics()
+    for modify in (0.01, 0.02):
+        timings = RequestTimings(started=0.0)
+        timings.fetch = 0.1
+        timings.request_modify["auth"] = 0.001
+        timings.response_modify["rewrite"] = modify
+        timings.finished = 0.2
+        metrics.observe(timings)
+
+    assert metrics.stages["fetch"].count == 2
+    assert metrics.stages["body"].count == 0
+    assert metrics.response_modify["rewrite"].count == 2
+    assert metrics.slowest_modifiers(1) == [("response", "rewrite", 0.01 + 0.02)]
+
+    metrics.routed += 1
+    metrics.reset()
+    assert metrics.routed == 0
+    assert not metrics.response_modify
+
+
+def test_response_keeps_timings():
+    timings = RequestTimings()
+    response = Response(status=200, request_headers={}, response_headers={}, timings=timings)
+    assert response.timings is timings
+    # Тайминги не участвуют в сравнении ответов
+    assert response == Response(status=200, request_headers={}, response_headers={})
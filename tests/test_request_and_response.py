@@ -2,7 +2,8 @@
 Demonstration test for new request_modify and response_modify functionality
 """
 import pytest
-from playwright_interceptor import Execute, Request, Response, HttpMethod, ExecuteAction
+from playwright_interceptor import Execute, Request, Response, HttpMethod, ExecuteAction, RejectedRetention
+from playwright_interceptor.retention import RejectedLog
 
 
 def test_execute_modify_with_request_and_response():
@@ -106,5 +107,177 @@ def test_execute_validation():
         Execute(action=ExecuteAction.RETURN, response_modify=lambda x: x, max_responses=1)
 
 
+
+def test_response_content_parse_is_memoized():
+    """content_parse() is computed once and rebuilt only after content/content-type change"""
+    response = Response(
+        status=200,
+        request_headers={},
+        response_headers={"Content-Type": "application/json"},
+        content=b'{"items": [1, 2]}',
+    )
+
+    parsed = response.content_parse()
+    assert parsed is response.content_parse()
+
+    # Modifiers share the same parsed object
+    parsed["_seen"] = True
+    assert response.content_parse()["_seen"] is True
+
+    response.content = b'[1, 2, 3]'
+    assert response.content_parse() == [1, 2, 3]
+
+    response.response_headers["Content-Type"] = "text/plain"
+    assert response.content_parse() == "[1, 2, 3]"
+
+
+
+def test_response_content_replaced():
+    """Only reassigning content marks the body as replaced"""
+    response = Response(
+        status=200,
+        request_headers={},
+        response_headers={"content-type": "application/json"},
+        content=b'{"a": 1}',
+    )
+    response.response_headers["X-Modified"] = "true"
+    response.status = 201
+    assert not response.content_replaced
+
+    response.content = b'{"a": 2}'
+    assert response.content_replaced
+
+
+def test_rejected_log_retention():
+    """Rejected responses are bounded or aggregated according to the policy"""
+    last = RejectedLog(RejectedRetention.LAST(2))
+    summary = RejectedLog(RejectedRetention.SUMMARY())
+    off = RejectedLog(RejectedRetention.OFF())
+    for i in range(5):
+        for log in (last, summary, off):
+            log.add(status=200, url=f"https://cdn.example.com/{i}.png", content_type="image/png", duration=0.1)
+
+    assert [record.url for record in last.records()] == [
+        "https://cdn.example.com/3.png",
+        "https://cdn.example.com/4.png",
+    ]
+    assert summary.records() == []
+    assert summary.summary().by_host["cdn.example.com"] == 5
+    assert summary.summary().by_content_type["image/png"] == 5
+    assert off.records() == [] and off.summary() is None
+    assert last.count == summary.count == off.count == 5
+
+    with pytest.raises(ValueError, match="positive limit"):
+        RejectedRetention.LAST(0)
+
+
+def test_response_pickles_for_process_executor():
+    """Pickling drops the page and parse cache but keeps the body identity"""
+    import pickle
+    from concurrent.futures import ThreadPoolExecutor
+
+    response = Response(
+        status=200,
+        request_headers={},
+        response_headers={"Content-Type": "application/json"},
+        content=b'{"a": 1}',
+        page=object(),
+    )
+    response.content_parse()
+
+    copy = pickle.loads(pickle.dumps(response))
+    assert copy.page is None and copy._parsed is None
+    assert not copy.content_replaced
+    assert copy.content_parse() == {"a": 1}
+
+    executor = ThreadPoolExecutor(1)
+    try:
+        execute = Execute.MODIFY(response_modify=lambda r: r, executor=executor)
+        assert execute.executor is executor
+        with pytest.raises(ValueError, match="executor"):
+            Execute(action=ExecuteAction.RETURN, executor=executor)
+    finally:
+        executor.shutdown()
+
+
+def test_response_copies_keep_page_and_parse():
+    """copy/deepcopy are not pickling: the page and parsed body survive"""
+    import copy
+
+    page = object()
+    response = Response(
+        status=200,
+        request_headers={},
+        response_headers={"Content-Type": "application/json"},
+        content=b'{"a": [1]}',
+        page=page,
+    )
+    parsed = response.content_parse()
+
+    shallow = copy.copy(response)
+    assert shallow.page is page and shallow.content_parse() is parsed
+    shallow.response_headers = {"Content-Type": "text/plain"}
+    assert response.response_headers["content-type"] == "application/json"
+
+    deep = copy.deepcopy(response)
+    assert deep.page is page and not deep.content_replaced
+    assert deep.content_parse() == parsed and deep.content_parse() is not parsed
+    deep.response_headers["X-Copy"] = "1"
+    assert "x-copy" not in response.response_headers
+
+
+def test_execute_modify_timeout_validation():
+    """Modifier budgets are positive and only apply to modifying actions"""
+    execute = Execute.ALL(response_modify=lambda r: r, modify_timeout=0.5, max_timeouts=2)
+    assert execute.modify_timeout == 0.5 and execute.max_timeouts == 2
+
+    with pytest.raises(ValueError, match="positive"):
+        Execute.MODIFY(response_modify=lambda r: r, modify_timeout=0.0)
+    with pytest.raises(ValueError, match="max_timeouts"):
+        Execute.MODIFY(response_modify=lambda r: r, modify_timeout=0.5, max_timeouts=0)
+    with pytest.raises(ValueError, match="modify_timeout"):
+        Execute(action=ExecuteAction.RETURN, modify_timeout=0.5)
+
+
+def test_execute_block_validation():
+    """BLOCK takes no modifiers or limits"""
+    assert Execute.BLOCK().action == ExecuteAction.BLOCK
+    with pytest.raises(ValueError, match="BLOCK action"):
+        Execute(action=ExecuteAction.BLOCK, response_modify=lambda r: r)
+    with pytest.raises(ValueError, match="BLOCK action"):
+        Execute(action=ExecuteAction.BLOCK, max_responses=1)
+
+
+def test_quota_slots_are_claimed_before_work():
+    """Claimed slots count against limits until they are committed or released"""
+    import asyncio
+    from playwright_interceptor import Handler
+    from playwright_interceptor.request_interceptor import MultiRequestInterceptor
+
+    handler = Handler.ALL(execute=Execute.ALL(response_modify=lambda r: r, max_responses=2, max_modifications=1), slug="h")
+
+    async def scenario():
+        interceptor = MultiRequestInterceptor(None, [handler], "https://example.com/", 0.0)
+        assert interceptor._claim_capture(handler) and interceptor._claim_capture(handler)
+        assert not interceptor._claim_capture(handler)
+        assert interceptor._claim_modification(handler)
+        assert interceptor._handler_done(handler)
+
+        assert interceptor.live_mask == 0 and interceptor.pending == 1
+
+        interceptor._commit_capture(handler)
+        interceptor._release_capture(handler)  # second request released its slot
+        assert not interceptor._handler_done(handler)
+        assert interceptor.live_mask != 0
+        assert interceptor._claim_capture(handler)
+        assert interceptor.handler_captures["h"] == 1
+
+        interceptor._commit_capture(handler)
+        interceptor._commit_modification(handler)
+        assert interceptor.pending == 0
+
+    asyncio.run(scenario())
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
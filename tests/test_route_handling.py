@@ -0,0 +1,417 @@
+"""
+Tests for route handling against fake Playwright page, route and response objects
+"""
+import asyncio
+import re
+import threading
+from contextlib import aclosing
+import pytest
+from playwright._impl._helper import url_matches
+from playwright_interceptor import ContextInterceptor, Execute, Handler, NetworkInterceptor, ResponseCache, TrafficArchive
+from playwright_interceptor.config import errors as ERR
+
+
+API = "https://shop.test/api/items"
+JSON = {"content-type": "application/json", "cache-control": "max-age=60"}
+
+
+class _APIResponse:
+    def __init__(self, url: str, status: int, headers: dict, body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.headers_array = [{"name": name, "value": value} for name, value in headers.items()]
+        self._body = body
+        self.body_calls = 0
+
+    async def body(self) -> bytes:
+        self.body_calls += 1
+        await asyncio.sleep(0)
+        return self._body
+
+
+class _Request:
+    def __init__(self, url: str, page, method: str = "GET", resource_type: str = "fetch"):
+        self.url = url
+        self.method = method
+        self.resource_type = resource_type
+        self.headers = {"accept": "*/*"}
+        self.post_data = None
+        self.post_data_buffer = None
+        self._page = page
+
+    @property
+    def frame(self):
+        if self._page is None:
+            raise RuntimeError("Service Worker requests do not have an associated frame")
+        return type("_Frame", (), {"page": self._page})()
+
+
+class _Route:
+    def __init__(self, request: _Request, server: dict):
+        self.request = request
+        self.server = server
+        self.outcome = None
+        self.fetched = []
+
+    async def fetch(self, **kwargs) -> _APIResponse:
+        await asyncio.sleep(0.01)
+        status, headers, body = self.server.get(self.request.url, (404, {"content-type": "text/plain"}, b""))
+        response = _APIResponse(self.request.url, status, dict(headers), body)
+        self.fetched.append(response)
+        return response
+
+    async def fulfill(self, **kwargs) -> None:
+        self.outcome = ("fulfill", kwargs)
+
+    async def continue_(self, **kwargs) -> None:
+        self.outcome = ("continue", kwargs)
+
+    async def abort(self, error_code=None) -> None:
+        self.outcome = ("abort", error_code)
+
+
+class _Router:
+    """Page or context: keeps installed routes and sends requests through them"""
+
+    def __init__(self, server: dict = None):
+        self.server = server if server is not None else {API: (200, JSON, b'{"items": [1, 2]}')}
+        self.routes = []
+        self.route_calls = 0
+        self.unroute_calls = 0
+
+    async def route(self, pattern, handler) -> None:
+        self.route_calls += 1
+        self.routes.append((pattern, handler))
+
+    async def unroute(self, pattern, handler=None) -> None:
+        self.unroute_calls += 1
+        self.routes = [route for route in self.routes if not (route[0] == pattern and handler in (None, route[1]))]
+
+    async def send(self, url: str, page) -> _Route:
+        """Sends a request through the last matching route, like the browser would"""
+        route = _Route(_Request(url, page), self.server)
+        for pattern, handler in reversed(self.routes):
+            if url_matches(None, url, pattern):
+                await handler(route)
+                return route
+        route.outcome = ("network", None)
+        return route
+
+
+class _Page(_Router):
+    def __init__(self, url: str = "https://shop.test/catalog", server: dict = None):
+        super().__init__(server)
+        self.url = url
+
+    async def request(self, url: str = API) -> _Route:
+        return await self.send(url, self)
+
+
+async def _captured(interceptor: NetworkInterceptor, page: _Page, handler: Handler, *urls: str):
+    task = asyncio.create_task(interceptor.execute(handler, timeout=1.0))
+    await asyncio.sleep(0.01)
+    routes = await asyncio.gather(*(page.request(url) for url in urls))
+    return routes, await task
+
+
+def test_body_is_read_once_for_cache_archive_and_capture(tmp_path):
+    async def scenario():
+        page = _Page()
+        interceptor = NetworkInterceptor(page, cache=ResponseCache(), archive=TrafficArchive.RECORD(str(tmp_path)))
+        routes, results = await _captured(interceptor, page, Handler.ALL(execute=Execute.RETURN(1)), API)
+        return interceptor, routes[0], results
+
+    interceptor, route, results = asyncio.run(scenario())
+    fetched = route.fetched[0]
+    assert fetched.body_calls == 1
+    assert results[0].responses[0].content_parse() == {"items": [1, 2]}
+    # The driver still holds the body, the route is fulfilled by reference
+    assert route.outcome[1]["response"] is fetched
+    assert interceptor.metrics.bytes_in == len(fetched._body) and interceptor.metrics.bytes_out == 0
+
+
+def test_coalesced_leader_reads_body_once():
+    async def scenario():
+        page = _Page()
+        interceptor = NetworkInterceptor(page)
+        routes, results = await _captured(interceptor, page, Handler.ALL(execute=Execute.RETURN(3)), API, API, API)
+        return interceptor, routes, results
+
+    interceptor, routes, results = asyncio.run(scenario())
+    leaders = [route for route in routes if route.fetched]
+    assert len(leaders) == 1 and leaders[0].fetched[0].body_calls == 1
+    assert interceptor.metrics.coalesced == 2
+    assert len(results[0].responses) == 3
+
+
+def test_disk_tier_and_archive_io_runs_off_the_loop(tmp_path, monkeypatch):
+    threads = []
+    for owner, name in ((ResponseCache, "_write_disk"), (ResponseCache, "_read_disk"), (TrafficArchive, "record")):
+        original = getattr(owner, name)
+
+        def spy(*args, _original=original, **kwargs):
+            threads.append(threading.current_thread())
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(owner, name, spy)
+
+    async def scenario():
+        page = _Page()
+        # max_bytes=1 sends every entry straight to disk
+        cache = ResponseCache(max_bytes=1, directory=str(tmp_path / "cache"))
+        interceptor = NetworkInterceptor(page, cache=cache, archive=TrafficArchive.RECORD(str(tmp_path / "archive")))
+        await _captured(interceptor, page, Handler.ALL(execute=Execute.RETURN(1)), API)
+        routes, results = await _captured(interceptor, page, Handler.ALL(execute=Execute.RETURN(1)), API)
+        return cache, routes[0], results
+
+    cache, route, results = asyncio.run(scenario())
+    assert cache.stats.disk_hits == 1 and not route.fetched
+    assert results[0].responses[0].content_parse() == {"items": [1, 2]}
+    assert len(threads) >= 3 and threading.main_thread() not in threads
+    assert (tmp_path / "archive" / "index.json").exists()
+
+
+def test_timed_out_modifier_does_not_touch_parsed_body():
+    def parse(response):
+        response.content_parse()
+        return response
+
+    async def slow_rewrite(response):
+        response.content_parse()["items"].append(3)
+        await asyncio.sleep(1.0)
+        return response
+
+    async def scenario():
+        page = _Page()
+        interceptor = NetworkInterceptor(page)
+        handlers = [
+            Handler.ALL(execute=Execute.MODIFY(response_modify=parse), slug="parse"),
+            Handler.ALL(execute=Execute.ALL(response_modify=slow_rewrite, modify_timeout=0.05), slug="slow"),
+        ]
+        task = asyncio.create_task(interceptor.execute(handlers, timeout=1.0))
+        await asyncio.sleep(0.01)
+        route = await page.request()
+        return route, await task
+
+    route, results = asyncio.run(scenario())
+    slow = {result.handler_slug: result for result in results}["slow"]
+    assert slow.modify_timeouts == 1
+    captured = slow.responses[0]
+    assert captured.content_parse() == {"items": [1, 2]}
+    assert route.outcome[1]["response"] is route.fetched[0]
+
+
+def test_stream_backpressure_holds_requests_until_consumed():
+    async def scenario():
+        page = _Page()
+        interceptor = NetworkInterceptor(page)
+        async with aclosing(interceptor.stream(Handler.ALL(execute=Execute.RETURN(None)), timeout=None, queue_size=1)) as captured:
+            first = asyncio.create_task(captured.__anext__())
+            await asyncio.sleep(0.01)
+            requests = [asyncio.create_task(page.request()) for _ in range(3)]
+            await asyncio.sleep(0.1)
+            # One response went to the waiting consumer, one fills the queue, the third request waits
+            assert first.done()
+            assert sum(request.done() for request in requests) == 2
+            await captured.__anext__()
+            await asyncio.sleep(0.05)
+            assert sum(request.done() for request in requests) == 3
+            await captured.__anext__()
+        return page
+
+    page = asyncio.run(scenario())
+    assert page.route_calls == page.unroute_calls == 1 and not page.routes
+
+
+def test_stream_unroutes_after_early_break():
+    async def scenario():
+        page = _Page()
+        interceptor = NetworkInterceptor(page)
+
+        async def browse():
+            await asyncio.sleep(0.01)
+            return await asyncio.gather(*(page.request() for _ in range(3)))
+
+        browsing = asyncio.create_task(browse())
+        async with aclosing(interceptor.stream(Handler.ALL(execute=Execute.RETURN(None)), timeout=None, queue_size=1)) as captured:
+            async for slug, response in captured:
+                break
+        # Closing the stream releases the request still waiting on the full queue
+        routes = await asyncio.wait_for(browsing, 1.0)
+        return page, slug, routes
+
+    page, slug, routes = asyncio.run(scenario())
+    assert slug and page.route_calls == page.unroute_calls == 1 and not page.routes
+    assert all(route.outcome[0] == "fulfill" for route in routes)
+
+
+CATALOG = "https://a.test/catalog"
+HOME = "https://b.test/home"
+
+
+def _context_server() -> dict:
+    html = {"content-type": "text/html"}
+    return {CATALOG: (200, html, b"<html>catalog</html>"), HOME: (200, html, b"<html>home</html>"), API: (200, JSON, b"{}")}
+
+
+def test_context_groups_captures_by_page():
+    async def scenario():
+        context = _Router(_context_server())
+        catalog, home = _Page(CATALOG), _Page(HOME)
+        interceptor = ContextInterceptor(context)
+        task = asyncio.create_task(interceptor.execute(Handler.ALL(execute=Execute.RETURN(3)), timeout=1.0))
+        await asyncio.sleep(0.01)
+        await asyncio.gather(context.send(API, catalog), context.send(API, home), context.send(API, home))
+        return catalog, home, await task
+
+    catalog, home, results = asyncio.run(scenario())
+    grouped = results[0].by_page()
+    assert set(grouped) == {catalog, home}
+    assert len(grouped[catalog]) == 1 and len(grouped[home]) == 2
+
+
+def test_context_main_and_side_follow_the_request_page():
+    async def scenario():
+        context = _Router(_context_server())
+        catalog, home = _Page(CATALOG), _Page(HOME)
+        interceptor = ContextInterceptor(context)
+        handlers = [
+            Handler.MAIN(execute=Execute.RETURN(None), slug="main"),
+            Handler.SIDE(execute=Execute.RETURN(None), slug="side"),
+        ]
+        task = asyncio.create_task(interceptor.execute(handlers, timeout=0.3))
+        await asyncio.sleep(0.01)
+        # The catalog document is MAIN for its own page and SIDE for the other one
+        await context.send(CATALOG, catalog)
+        await context.send(CATALOG, home)
+        await context.send(HOME, home)
+        return catalog, home, {result.handler_slug: result for result in await task}
+
+    catalog, home, results = asyncio.run(scenario())
+    assert [(response.url, response.page) for response in results["main"].responses] == [(CATALOG, catalog), (HOME, home)]
+    assert [(response.url, response.page) for response in results["side"].responses] == [(CATALOG, home)]
+
+
+def test_context_request_without_frame():
+    async def scenario():
+        context = _Router(_context_server())
+        interceptor = ContextInterceptor(context)
+        task = asyncio.create_task(interceptor.execute(Handler.ALL(execute=Execute.RETURN(1)), timeout=1.0))
+        await asyncio.sleep(0.01)
+        # Service worker requests have no frame and so no page
+        route = await context.send(API, None)
+        return route, await task
+
+    route, results = asyncio.run(scenario())
+    assert route.outcome[0] == "fulfill"
+    assert results[0].responses[0].page is None
+    assert results[0].by_page() == {None: results[0].responses}
+
+
+def test_session_routes_once_and_passes_idle_requests_through():
+    async def scenario():
+        page = _Page()
+        interceptor = NetworkInterceptor(page)
+        async with interceptor.session():
+            idle = await page.request()
+            counts = []
+            for _ in range(3):
+                _routes, results = await _captured(interceptor, page, Handler.ALL(execute=Execute.RETURN(1)), API)
+                counts.append(len(results[0].responses))
+            after = await page.request()
+        return page, idle, after, counts
+
+    page, idle, after, counts = asyncio.run(scenario())
+    assert counts == [1, 1, 1]
+    # Nothing armed: the request goes on untouched, with no Python-side fetch
+    assert idle.outcome == ("continue", {}) and not idle.fetched
+    assert after.outcome == ("continue", {}) and not after.fetched
+    assert page.route_calls == page.unroute_calls == 1 and not page.routes
+
+
+def test_session_already_open():
+    async def scenario():
+        page = _Page()
+        interceptor = NetworkInterceptor(page)
+        async with interceptor.session():
+            with pytest.raises(RuntimeError, match=re.escape(ERR.SESSION_ALREADY_OPEN)):
+                async with interceptor.session():
+                    pass
+        return page
+
+    page = asyncio.run(scenario())
+    assert page.route_calls == page.unroute_calls == 1
+
+
+def test_session_busy():
+    async def scenario():
+        page = _Page()
+        interceptor = NetworkInterceptor(page)
+        async with interceptor.session():
+            armed = asyncio.create_task(interceptor.execute(Handler.ALL(execute=Execute.RETURN(1)), timeout=1.0))
+            await asyncio.sleep(0.01)
+            with pytest.raises(RuntimeError, match=re.escape(ERR.SESSION_BUSY)):
+                await interceptor.execute(Handler.ALL(execute=Execute.RETURN(1)), timeout=1.0)
+            # The armed call is unaffected
+            await page.request()
+            return await armed
+
+    results = asyncio.run(scenario())
+    assert len(results[0].responses) == 1
+
+
+def test_requests_fetched_for_the_cache_are_not_passed_through():
+    other = "https://shop.test/other"
+
+    async def scenario():
+        plain, cached = _Page(), _Page()
+        results = []
+        for page, interceptor in ((plain, NetworkInterceptor(plain)), (cached, NetworkInterceptor(cached, cache=ResponseCache()))):
+            # The session routes everything, so the request reaches the interceptor
+            async with interceptor.session():
+                routes, _ = await _captured(interceptor, page, Handler.ALL(startswith_url=API, execute=Execute.RETURN(None)), other)
+            results.append((interceptor.metrics, routes[0]))
+        return results
+
+    (plain, plain_route), (cached, cached_route) = asyncio.run(scenario())
+    assert plain.passed_through == 1 and plain.fetched_for_storage == 0
+    assert plain_route.outcome[0] == "continue"
+    assert cached.passed_through == 0 and cached.fetched_for_storage == 1
+    assert cached_route.outcome[0] == "fulfill"
+
+
+def test_block_only_execute_does_not_wait_for_timeout():
+    async def scenario():
+        page = _Page()
+        interceptor = NetworkInterceptor(page)
+        started = asyncio.get_running_loop().time()
+        results = await interceptor.execute(Handler.ALL(execute=Execute.BLOCK(), slug="block"), timeout=5.0)
+        return asyncio.get_running_loop().time() - started, results
+
+    elapsed, results = asyncio.run(scenario())
+    assert elapsed < 1.0
+    assert [result.handler_slug for result in results] == ["block"] and results[0].blocked == 0
+
+
+def test_blocking_stops_with_the_capture():
+    image = "https://shop.test/logo.png"
+
+    async def scenario():
+        page = _Page()
+        interceptor = NetworkInterceptor(page)
+        handlers = [
+            Handler.ALL(startswith_url=API, execute=Execute.RETURN(1), slug="api"),
+            Handler.ALL(startswith_url=image, execute=Execute.BLOCK(), slug="block"),
+        ]
+        started = asyncio.get_running_loop().time()
+        task = asyncio.create_task(interceptor.execute(handlers, timeout=5.0))
+        await asyncio.sleep(0.01)
+        blocked = await page.request(image)
+        await page.request()
+        results = await task
+        return asyncio.get_running_loop().time() - started, blocked, results
+
+    elapsed, blocked, results = asyncio.run(scenario())
+    assert elapsed < 1.0 and blocked.outcome == ("abort", "blockedbyclient")
+    assert {result.handler_slug: result for result in results}["block"].blocked == 1
@@ -0,0 +1,99 @@
+"""
+Tests for spooling large captured bodies to memory-mapped files
+"""
+import gc
+import os
+import pickle
+import pytest
+from playwright_interceptor import Extract, Response, SpoolPolicy
+from playwright_interceptor.spool import MemoryReader, spool_body
+
+
+def _spooled_response(tmp_path, body: bytes, content_type: str) -> Response:
+    spooled = spool_body(body, str(tmp_path))
+    response = Response(
+        status=200,
+        request_headers={},
+        response_headers={"Content-Type": content_type},
+        content=spooled.view,
+    )
+    response._spool = spooled
+    return response
+
+
+def test_spooled_binary_body_parses_without_copy(tmp_path):
+    body = os.urandom(64 * 1024)
+    response = _spooled_response(tmp_path, body, "video/mp4")
+
+    assert isinstance(response.content, memoryview) and response.content.readonly
+    assert response.body_path is not None and open(response.body_path, "rb").read() == body
+
+    parsed = response.content_parse()
+    assert isinstance(parsed, MemoryReader) and parsed.name == "file.mp4"
+    assert parsed.getbuffer() is response.content
+    assert parsed.read(16) == body[:16]
+    assert parsed.seek(0, os.SEEK_END) == len(body)
+    # The memoized reader is rewound for the next caller
+    assert response.content_parse().read() == body
+
+    response.content = b"replaced"
+    assert response.body_path is None and response.content_replaced
+
+
+def test_spooled_json_and_pickle(tmp_path):
+    response = _spooled_response(tmp_path, b'{"items": [1, 2]}', "application/json")
+    assert response.content_parse() == {"items": [1, 2]}
+    assert Extract.PATHS("$.items[1]").apply(response.content) == {"$.items[1]": [2]}
+
+    # Pickling maps the same file again instead of copying the body
+    copy = pickle.loads(pickle.dumps(response))
+    assert isinstance(copy.content, memoryview)
+    assert copy.body_path == response.body_path
+    assert not copy.content_replaced
+
+
+def test_spool_file_removed_with_last_owner(tmp_path):
+    response = _spooled_response(tmp_path, b"x" * 1024, "application/octet-stream")
+    view = response.content
+    assert bytes(view[:3]) == b"xxx"
+    view.release()
+    del response, view
+    gc.collect()
+    assert os.listdir(tmp_path) == []
+
+
+def test_spool_removal_retried_while_file_is_busy(tmp_path, monkeypatch):
+    # Windows refuses to delete a file that is still mapped; emulate it on any OS
+    real_unlink = os.unlink
+    mapped = set()
+
+    def unlink(path):
+        if path in mapped:
+            raise PermissionError(13, "The process cannot access the file", path)
+        real_unlink(path)
+
+    monkeypatch.setattr(os, "unlink", unlink)
+    response = _spooled_response(tmp_path, b"x" * 1024, "application/octet-stream")
+    mapped.add(response.body_path)
+    view = response.content
+    del response
+    gc.collect()
+    # The view outlives the owner, and the file is kept until it can be removed
+    assert len(os.listdir(tmp_path)) == 1 and bytes(view[:3]) == b"xxx"
+
+    mapped.clear()
+    view.release()
+    # The next spool retries the removal
+    fresh = spool_body(b"y", str(tmp_path))
+    assert os.listdir(tmp_path) == [os.path.basename(fresh.path)]
+    del fresh
+    gc.collect()
+    assert os.listdir(tmp_path) == []
+
+
+def test_spool_policy():
+    assert not SpoolPolicy.OFF().accepts(10 ** 9)
+    policy = SpoolPolicy.ABOVE(1024)
+    assert policy.accepts(1024) and not policy.accepts(1023)
+    with pytest.raises(ValueError, match="positive"):
+        SpoolPolicy.ABOVE(0)
@@ -0,0 +1,143 @@
+"""
+Tests for the two-tier response cache and the traffic archive
+"""
+import asyncio
+import time
+import pytest
+from playwright_interceptor import ResponseCache, HttpMethod, TrafficArchive
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _store(cache, url, body=b"{}", **headers):
+    key = cache.key("GET", url)
+    return key, cache.store(key, url, 200, {**JSON_HEADERS, **headers}, body)
+
+
+def test_key_depends_on_method_url_and_body():
+    assert ResponseCache.key("GET", "https://a.test/") == ResponseCache.key("GET", "https://a.test/")
+    assert ResponseCache.key("GET", "https://a.test/") != ResponseCache.key("HEAD", "https://a.test/")
+    assert ResponseCache.key("POST", "https://a.test/", "x=1") == ResponseCache.key("POST", "https://a.test/", b"x=1")
+    assert ResponseCache.key("POST", "https://a.test/", "x=1") != ResponseCache.key("POST", "https://a.test/", "x=2")
+
+
+def test_freshness_rules():
+    cache = ResponseCache()
+    key, stored = _store(cache, "https://a.test/fresh", **{"Cache-Control": "public, max-age=60"})
+    assert stored and cache.lookup(key).is_fresh()
+
+    assert not _store(cache, "https://a.test/no-store", **{"Cache-Control": "no-store"})[1]
+    assert not _store(cache, "https://a.test/plain")[1]
+    assert not _store(cache, "https://a.test/vary", **{"Cache-Control": "max-age=60", "Vary": "Cookie"})[1]
+    assert not cache.storable(500, {"Cache-Control": "max-age=60"})
+
+    # Без явной свежести сохраняется только то, что можно перепроверить
+    key, stored = _store(cache, "https://a.test/etag", **{"ETag": '"v1"'})
+    entry = cache.lookup(key)
+    assert stored and not entry.is_fresh()
+    assert entry.conditional_headers() == {"if-none-match": '"v1"'}
+
+
+def test_revalidate_refreshes_entry():
+    cache = ResponseCache()
+    key, _ = _store(cache, "https://a.test/r", **{"Cache-Control": "no-cache", "ETag": '"v1"'})
+    entry = cache.lookup(key)
+    cache.revalidate(key, entry, {"Cache-Control": "max-age=60"})
+    assert entry.is_fresh()
+    assert cache.stats.revalidated == 1
+    # The 304 headers are kept, so the next expiry is judged on them too
+    assert entry.headers["Cache-Control"] == "max-age=60" and "cache-control" not in entry.headers
+    entry.expires_at = 0
+    cache.revalidate(key, entry, {"Date": "Mon, 12 Oct 2026 10:00:00 GMT"})
+    assert entry.is_fresh() and entry.headers["Date"] == "Mon, 12 Oct 2026 10:00:00 GMT"
+
+
+def test_revalidate_persists_disk_tier(tmp_path):
+    cache = ResponseCache(max_entries=1, directory=tmp_path)
+    key, _ = _store(cache, "https://a.test/r", **{"Cache-Control": "no-cache", "ETag": '"v1"'})
+    _store(cache, "https://a.test/other", **{"Cache-Control": "max-age=60"})
+    entry = cache.lookup(key)
+    cache.revalidate(key, entry, {"Cache-Control": "max-age=60", "ETag": '"v2"'})
+
+    reopened = ResponseCache(directory=tmp_path).lookup(key)
+    assert reopened.is_fresh() and reopened.etag == '"v2"'
+    assert reopened.headers["Cache-Control"] == "max-age=60"
+
+
+def test_memory_lru_is_bounded():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    keys = [_store(cache, f"https://a.test/{i}", b"1234", **{"Cache-Control": "max-age=60"})[0] for i in range(3)]
+    assert cache.lookup(keys[0]) is None
+    assert cache.lookup(keys[2]) is not None
+    assert cache.stats.evictions == 1
+
+    _store(cache, "https://a.test/big", b"x" * 11, **{"Cache-Control": "max-age=60"})
+    assert cache._memory_bytes <= 10
+
+
+def test_disk_tier_keeps_evicted_entries(tmp_path):
+    cache = ResponseCache(max_entries=1, directory=tmp_path)
+    first, _ = _store(cache, "https://a.test/1", b"one", **{"Cache-Control": "max-age=60"})
+    _store(cache, "https://a.test/2", b"two", **{"Cache-Control": "max-age=60"})
+
+    entry = cache.lookup(first)
+    assert entry is not None and entry.body == b"one"
+    assert cache.stats.disk_hits == 1
+
+    # Новый экземпляр подхватывает записи с диска
+    reopened = ResponseCache(directory=tmp_path)
+    assert reopened.lookup(first).body == b"one"
+
+
+def test_disk_tier_is_bounded(tmp_path):
+    cache = ResponseCache(max_entries=1, directory=tmp_path, max_disk_bytes=8)
+    for i in range(4):
+        _store(cache, f"https://a.test/{i}", b"12345", **{"Cache-Control": "max-age=60"})
+    assert cache._disk_bytes <= 8
+    assert cache.stats.disk_evictions >= 1
+
+
+def test_expired_entry_is_stale():
+    cache = ResponseCache()
+    key, _ = _store(cache, "https://a.test/e", **{"Cache-Control": "max-age=0", "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    entry = cache.lookup(key)
+    assert not entry.is_fresh(time.time() + 1)
+    assert entry.conditional_headers() == {"if-modified-since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+
+def test_methods_filter():
+    cache = ResponseCache(methods=[HttpMethod.GET])
+    assert cache.accepts("GET")
+    assert not cache.accepts("HEAD")
+    assert not cache.accepts("POST")
+
+
+def test_archive_round_trip(tmp_path):
+    archive = TrafficArchive.RECORD(tmp_path)
+    headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    archive.record("GET", "https://a.test/1", None, 200, headers, b'{"n":1}')
+    archive.record("GET", "https://a.test/1", None, 200, headers, b'{"n":2}')
+    archive.record("POST", "https://a.test/2", "q=1", 201, headers, b'{"n":1}')
+    archive.save()
+
+    # Одинаковые тела хранятся один раз
+    assert len(list((tmp_path / "blobs").iterdir())) == 2
+
+    replay = TrafficArchive.REPLAY(tmp_path)
+    bodies = [asyncio.run(replay.lookup("GET", "https://a.test/1").body()) for _ in range(3)]
+    assert bodies == [b'{"n":1}', b'{"n":2}', b'{"n":2}']
+
+    posted = replay.lookup("POST", "https://a.test/2", b"q=1")
+    assert posted.status == 201
+    assert posted.headers == {"Content-Type": "application/json"}
+    assert replay.lookup("POST", "https://a.test/2", b"q=2") is None
+    assert replay.missed == 1
+
+    replay.rewind()
+    assert asyncio.run(replay.lookup("GET", "https://a.test/1").body()) == b'{"n":1}'
+
+
+def test_archive_replay_requires_index(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        TrafficArchive.REPLAY(tmp_path)
@@ -0,0 +1,56 @@
+"""
+Tests for fast mode: type checks are dropped from the per-request path only
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import asyncio
+from types import SimpleNamespace
+from beartype.roar import BeartypeCallHintViolation
+from playwright_interceptor import Execute, Handler, NetworkInterceptor, Response
+from playwright_interceptor.tools import parse_content_type
+from playwright_interceptor.typecheck import FAST_MODE
+
+def raises(call):
+    try:
+        call()
+    except BeartypeCallHintViolation:
+        return True
+    return False
+
+handler = Handler.ALL()
+print(FAST_MODE)
+# Per-request path
+print(raises(lambda: Response(status="200", request_headers={}, response_headers={})))
+print(raises(lambda: parse_content_type(None)))
+print(raises(lambda: handler.should_route(SimpleNamespace(method="GET", resource_type="fetch", url="https://a.test/"), 1)))
+# API boundary
+print(raises(lambda: Handler.ALL(slug=1)))
+print(raises(lambda: Execute.RETURN("1")))
+print(raises(lambda: asyncio.run(NetworkInterceptor(None).execute(handler, timeout="1"))))
+"""
+
+
+def _probe(fast: bool) -> list:
+    env = dict(os.environ)
+    env.pop("PLAYWRIGHT_INTERCEPTOR_FAST", None)
+    if fast:
+        env["PLAYWRIGHT_INTERCEPTOR_FAST"] = "1"
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE], cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return output.split()
+
+
+def test_default_mode_checks_everything():
+    assert _probe(fast=False) == ["False", "True", "True", "True", "True", "True", "True"]
+
+
+def test_fast_mode_checks_only_api_boundaries():
+    assert _probe(fast=True) == ["True", "False", "False", "False", "True", "True", "True"]